@@ -0,0 +1,66 @@
+"""Throughput benchmark for batch extraction against a local mock LLM server.
+
+No API key or PDFs are needed: documents are synthetic and every LLM call is answered
+by ``FakeProvider`` after a configurable delay.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_batch --documents 10000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from team_template.src.batch import extract_many
+from team_template.src.cache import ResponseCache
+from team_template.src.extraction import EPDExtractor
+from team_template.src.fake_provider import FakeProvider
+from team_template.src.llm_client import DEFAULT_LIMITS, ProviderLimits
+
+
+def synthetic_parser(path: str):
+    """Cheap replacement for PDF parsing; picklable so it runs in the process pool."""
+    return f"Environmental Product Declaration {path}\nGWP 12.3 kg CO2 eq.", []
+
+
+async def run(args: argparse.Namespace, workdir: Path) -> None:
+    extractor = EPDExtractor(cache=ResponseCache(workdir / "cache.sqlite", ttl=0))
+    paths = [f"synthetic_{i:06d}.pdf" for i in range(args.documents)]
+    failures = 0
+    start = time.perf_counter()
+    async for result in extract_many(extractor, paths, concurrency=args.concurrency,
+                                     workers=args.workers, checkpoint=workdir / "run.jsonl",
+                                     parser=synthetic_parser):
+        failures += not result.ok
+    elapsed = time.perf_counter() - start
+    print(f"{args.documents} documents in {elapsed:.1f}s "
+          f"({args.documents / elapsed:.0f} docs/s, {failures} failures)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock model latency (s)")
+    parser.add_argument("--rate-limit-every", type=int, default=50)
+    args = parser.parse_args()
+
+    with FakeProvider(latency=args.latency, rate_limit_every=args.rate_limit_every) as server:
+        os.environ["ANTHROPIC_BASE_URL"] = server.url
+        os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+        # Only the mock's own 429s limit the run, not the client's account limits
+        DEFAULT_LIMITS["anthropic"] = ProviderLimits(requests_per_minute=0,
+                                                     input_tokens_per_minute=0,
+                                                     max_connections=args.concurrency)
+        with tempfile.TemporaryDirectory() as workdir:
+            asyncio.run(run(args, Path(workdir)))
+        print(f"mock server: {server.stats['requests']} requests, "
+              f"{server.stats['rate_limited']} rate limited")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Contribution analysis queries on the cube versus recomputing from processed dicts.
+
+Synthetic products (``--categories`` categories, ``--processes`` processes, four life
+cycle modules) are added to a ``ContributionCube`` one at a time; then the top-5
+contributors of random (product, category) pairs are queried from the cube and, for
+reference, recomputed from each product's processed dict as the charts did before.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_cube --products 5000 --queries 20000
+"""
+
+import argparse
+import random
+import time
+
+from team_template.src.cube import ContributionCube
+from team_template.src.visualization import contribution_values
+
+MODULES = ["A1-A3", "A4", "A5", "C1-C4"]
+
+
+def synthetic(products: int, categories: int, processes: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    names = [f"Category {c}" for c in range(categories)]
+    return {f"product-{i}": {"contributions": {
+        name: {f"Process {k}": rng.lognormvariate(0, 1.5) for k in range(processes)}
+        for name in names}} for i in range(products)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=15)
+    parser.add_argument("--queries", type=int, default=10000)
+    args = parser.parse_args()
+
+    data = synthetic(args.products, args.categories, args.processes)
+    cube = ContributionCube()
+    start = time.perf_counter()
+    for product, processed in data.items():
+        cube.add(product, ((category, process, MODULES[hash(process) % 4], value)
+                           for category, parts in processed["contributions"].items()
+                           for process, value in parts.items()))
+    build = time.perf_counter() - start
+    print(f"build: {args.products} products in {build:.2f}s "
+          f"({args.products / build:.0f} products/s), shape {cube.shape}, "
+          f"{cube.values.nbytes / 1e6:.0f} MB")
+
+    rng = random.Random(1)
+    queries = [(f"product-{rng.randrange(args.products)}",
+                f"Category {rng.randrange(args.categories)}") for _ in range(args.queries)]
+    start = time.perf_counter()
+    for product, category in queries:
+        cube.top_contributors(product, category, n=5)
+    cached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for product, category in queries:
+        parts = contribution_values(data[product], category)
+        sorted(parts.items(), key=lambda item: abs(item[1]), reverse=True)[:5]
+    raw = time.perf_counter() - start
+    print(f"top-5: cube {1e6 * cached / args.queries:.1f} us/query, "
+          f"from dicts {1e6 * raw / args.queries:.1f} us/query")
+
+    start = time.perf_counter()
+    for c in range(args.categories):
+        cube.slice(f"Category {c}")
+        cube.portfolio(f"Category {c}")
+    print(f"slice + portfolio over all products: "
+          f"{1e3 * (time.perf_counter() - start) / args.categories:.2f} ms/category")
+
+
+if __name__ == "__main__":
+    main()
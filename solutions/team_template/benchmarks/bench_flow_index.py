@@ -0,0 +1,53 @@
+"""Time flow lookups against a memory-mapped background dataset index.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_flow_index --datasets 5000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from team_template.src.embedding_index import BACKGROUND_DESCRIPTIONS, EmbeddingIndex
+
+REGIONS = ["GLO", "RER", "DE", "FR", "CN", "US", "RoW"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--datasets", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = list(BACKGROUND_DESCRIPTIONS)
+    names = list(BACKGROUND_DESCRIPTIONS) + [
+        f"{base[i]} {REGIONS[r]} variant {n}"
+        for n, (i, r) in enumerate(zip(rng.integers(len(base), size=args.datasets),
+                                       rng.integers(len(REGIONS), size=args.datasets)))]
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        EmbeddingIndex.build(names, BACKGROUND_DESCRIPTIONS).save(directory)
+        built = time.perf_counter() - start
+        index = EmbeddingIndex.load(directory)
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            index.search(["Slags"], k=3)
+        single = (time.perf_counter() - start) / 1000
+
+        queries = [base[i] for i in rng.integers(len(base), size=args.queries)]
+        start = time.perf_counter()
+        index.search(queries, k=3)
+        batch = time.perf_counter() - start
+
+    print(f"build + save: {built:6.2f}s for {len(names):,} datasets")
+    print(f"single query: {single * 1e3:6.3f} ms")
+    print(f"batch:        {batch:6.2f}s for {args.queries:,} queries")
+
+
+if __name__ == "__main__":
+    main()
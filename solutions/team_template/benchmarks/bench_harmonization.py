@@ -0,0 +1,57 @@
+"""Time batch name harmonisation on a synthetic set of spelling variants.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_harmonization --names 2000000 --distinct 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from team_template.src.harmonization import HarmonizationIndex
+from team_template.src.table_extraction import CATEGORY_SYNONYMS
+
+
+def variants(distinct: int, seed: int = 0) -> np.ndarray:
+    """Spellings of the known category names with case changes, typos and unit suffixes."""
+    rng = np.random.default_rng(seed)
+    known = [w for display, words in CATEGORY_SYNONYMS.values() for w in (display, *words)
+             if len(w) > 4]
+    names = set()
+    while len(names) < distinct:
+        name = known[rng.integers(len(known))]
+        if rng.random() < 0.5:
+            i = rng.integers(1, len(name) - 1)
+            name = name[:i] + name[i + 1:]  # drop a character
+        if rng.random() < 0.5:
+            name = name.upper() if rng.random() < 0.5 else name.title()
+        if rng.random() < 0.3:
+            name += f" ({rng.integers(1000)})"
+        names.add(name)
+    return np.array(sorted(names), dtype=object)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=2_000_000)
+    parser.add_argument("--distinct", type=int, default=20_000)
+    args = parser.parse_args()
+
+    pool = variants(args.distinct)
+    names = pool[np.random.default_rng(1).integers(len(pool), size=args.names)]
+    index = HarmonizationIndex.for_categories()
+
+    start = time.perf_counter()
+    result = index.resolve_many(names)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.names:,} names ({len(pool):,} distinct) in {elapsed:.2f}s "
+          f"= {args.names / elapsed * 60 / 1e6:.0f}M names/min")
+    shares = result["method"].value_counts(dropna=False, normalize=True)
+    print("resolved by:", ", ".join(f"{m if isinstance(m, str) else 'unresolved'} {s:.1%}"
+                                    for m, s in shares.items()))
+
+
+if __name__ == "__main__":
+    main()
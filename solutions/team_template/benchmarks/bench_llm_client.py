@@ -0,0 +1,91 @@
+"""Load test of the shared LLM client against a local fake provider.
+
+The same workload (``--requests`` prompts, a share of them duplicates, sent all at
+once) runs twice against ``FakeProvider``, which enforces its own requests-per-minute
+limit with HTTP 429:
+
+- ``naive``: a new SDK client per call with the SDK's default retries, as each
+  component used to do;
+- ``shared``: one :class:`LLMClient` with connection pooling, a token bucket matching
+  the provider's limit, jittered retries and deduplication of identical prompts.
+
+Reported per mode: wall time, connections opened, requests the provider saw and how
+many of them it rate limited, and prompts that failed after all retries.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_llm_client --requests 500 --rpm 3000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from team_template.src.fake_provider import FakeProvider
+from team_template.src.llm import _messages
+from team_template.src.llm_client import LLMClient, ProviderLimits
+
+MODEL = "claude-3-5-haiku-latest"
+
+
+def workload(requests: int, duplicates: float, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    distinct = max(1, int(requests * (1 - duplicates)))
+    return [f"Validate EPD {rng.randrange(distinct) if i >= distinct else i}"
+            for i in range(requests)]
+
+
+async def naive(prompts: list, url: str) -> int:
+    from anthropic import AsyncAnthropic
+
+    async def call(prompt: str) -> None:
+        async with AsyncAnthropic(base_url=url, max_retries=8) as client:
+            await client.messages.create(model=MODEL, max_tokens=256,
+                                         messages=_messages(prompt, MODEL))
+
+    results = await asyncio.gather(*(call(p) for p in prompts), return_exceptions=True)
+    return sum(isinstance(r, Exception) for r in results)
+
+
+async def shared(prompts: list, url: str, rpm: float, connections: int) -> LLMClient:
+    client = LLMClient(limits={"anthropic": ProviderLimits(
+        requests_per_minute=rpm, input_tokens_per_minute=0, max_connections=connections,
+        max_keepalive_connections=connections)}, base_urls={"anthropic": url})
+    await asyncio.gather(*(client.complete(p, MODEL, max_tokens=256) for p in prompts))
+    await client.aclose()
+    return client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--duplicates", type=float, default=0.2,
+                        help="share of prompts repeating an earlier one")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake model latency (s)")
+    parser.add_argument("--rpm", type=float, default=3000, help="provider requests per minute")
+    parser.add_argument("--connections", type=int, default=16)
+    args = parser.parse_args()
+
+    os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+    prompts = workload(args.requests, args.duplicates)
+    for mode in ("naive", "shared"):
+        with FakeProvider(latency=args.latency, requests_per_minute=args.rpm) as server:
+            start = time.perf_counter()
+            if mode == "naive":
+                failed = asyncio.run(naive(prompts, server.url))
+                extra = f", {failed} failed"
+            else:
+                client = asyncio.run(shared(prompts, server.url, args.rpm, args.connections))
+                extra = (f", {client.stats['failed']} failed, "
+                         f"{client.stats['deduplicated']} deduplicated, "
+                         f"{client.stats['retries']} retries")
+            elapsed = time.perf_counter() - start
+        print(f"{mode:>6}: {len(prompts)} prompts in {elapsed:.1f}s, "
+              f"{server.stats['connections']} connections, "
+              f"{server.stats['requests']} requests, "
+              f"{server.stats['rate_limited']} rate limited{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Throughput of bulk validation on a local model versus the hosted path.
+
+The same records are validated one request per record with ``LCAValidator``, twice:
+
+- ``hosted``: a hosted model name, answered by ``FakeProvider`` with a network-like
+  latency and a requests-per-minute limit;
+- ``local``: a ``local:`` model fed by the continuous batcher. With ``--gguf`` a real
+  quantized model runs through llama.cpp; otherwise a simulated CPU model stands in,
+  costing ``--batch-overhead`` seconds per forward pass plus ``--per-prompt`` seconds
+  per prompt in it.
+
+The simulated model assumes the prompts of a batch share one forward pass, so its
+speedup comes from that cost model. ``LlamaCppBackend`` decodes prompts one after
+another, so a ``--gguf`` run shows no batching gain, only the absence of network latency
+and rate limits.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_local_model --records 500
+    python -m team_template.benchmarks.bench_local_model --records 50 --gguf model.gguf
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from team_template.src.cache import ResponseCache
+from team_template.src.fake_provider import FakeProvider
+from team_template.src.llm_client import DEFAULT_LIMITS, ProviderLimits
+from team_template.src.local_model import LlamaCppBackend, LocalBackend, register_local_model
+from team_template.src.validation import LCAValidator
+
+VERDICT = json.dumps({"is_valid": True, "issues": [], "confidence": 0.9})
+
+
+class SimulatedBackend(LocalBackend):
+    """Sleeps like a CPU model whose forward pass is shared by the prompts of a batch."""
+
+    def __init__(self, batch_overhead: float, per_prompt: float, max_batch_size: int):
+        super().__init__()
+        self.batch_overhead = batch_overhead
+        self.per_prompt = per_prompt
+        self.max_batch_size = max_batch_size
+
+    def generate(self, prompts, max_tokens):
+        time.sleep(self.batch_overhead + self.per_prompt * len(prompts))
+        return [VERDICT] * len(prompts)
+
+
+async def validate_all(model: str, records: list, workdir: Path) -> float:
+    cache = ResponseCache(workdir / f"{model.replace(':', '_')}.sqlite", ttl=0)
+    validator = LCAValidator(model_name=model, cache=cache)
+    start = time.perf_counter()
+    await asyncio.gather(*(validator.validate_extraction(r) for r in records))
+    cache.close()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.8, help="hosted latency (s)")
+    parser.add_argument("--rpm", type=float, default=1000, help="hosted requests per minute")
+    parser.add_argument("--gguf", default=None, help="GGUF model for a real local run")
+    parser.add_argument("--batch-overhead", type=float, default=0.2)
+    parser.add_argument("--per-prompt", type=float, default=0.01)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    records = [{"impact_categories": [{"name": "GWP", "value": i, "unit": "kg CO2 eq."}]}
+               for i in range(args.records)]
+    backend = (LlamaCppBackend(args.gguf, max_batch_size=args.batch_size) if args.gguf
+               else SimulatedBackend(args.batch_overhead, args.per_prompt, args.batch_size))
+    local = register_local_model("bench", backend)
+    os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+    DEFAULT_LIMITS["anthropic"] = ProviderLimits(requests_per_minute=args.rpm,
+                                                 input_tokens_per_minute=0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with FakeProvider(response_text=VERDICT, latency=args.latency,
+                          requests_per_minute=args.rpm) as server:
+            os.environ["ANTHROPIC_BASE_URL"] = server.url
+            hosted = asyncio.run(validate_all("claude-3-5-haiku-latest", records,
+                                              Path(workdir)))
+        offline = asyncio.run(validate_all(local, records, Path(workdir)))
+
+    n = args.records
+    print(f"hosted: {n} records in {hosted:.1f}s ({n / hosted:.0f} records/s), "
+          f"{server.stats['requests']} requests, {server.stats['rate_limited']} rate limited")
+    print(f" local: {n} records in {offline:.1f}s ({n / offline:.0f} records/s)"
+          f"{'' if args.gguf else ' (simulated model)'}")
+    if args.gguf:
+        print("note: llama.cpp decodes the prompts of a batch sequentially; "
+              "batching adds no throughput")
+    else:
+        print(f"note: the simulated model shares one {args.batch_overhead}s forward pass "
+              f"per batch; a real backend gains only if it decodes batches together")
+
+
+if __name__ == "__main__":
+    main()
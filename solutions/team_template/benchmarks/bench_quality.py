@@ -0,0 +1,65 @@
+"""Time bulk rule-based quality checks against the per-EPD loop.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_quality --epds 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from team_template.src.validation import DataQualityChecker
+
+CATEGORIES = [("Global Warming Potential", "kg CO2 eq."),
+              ("Acidification Potential", "kg SO2 eq."),
+              ("Eutrophication Potential", "kg PO4 eq."),
+              ("Ozone Depletion", "kg CFC11 eq."),
+              ("Primary Energy", "MJ")]
+
+
+def synthetic_rows(epds: int, seed: int = 0) -> pd.DataFrame:
+    """Impact rows for ``epds`` EPDs; about 2% drop a category or use another unit."""
+    rng = np.random.default_rng(seed)
+    names, units = zip(*CATEGORIES)
+    table = pd.DataFrame({
+        "epd_id": np.repeat(np.arange(epds), len(CATEGORIES)),
+        "name": np.tile(names, epds),
+        "unit": np.tile(units, epds),
+        "value": rng.lognormal(0, 2, epds * len(CATEGORIES)),
+    })
+    table.loc[rng.random(len(table)) < 0.01, "unit"] = "g CO2 eq."
+    return table[rng.random(len(table)) > 0.01]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--epds", type=int, default=100_000)
+    parser.add_argument("--loop-epds", type=int, default=10_000,
+                        help="EPDs timed on the per-EPD path (extrapolated to --epds)")
+    args = parser.parse_args()
+
+    table = synthetic_rows(args.epds)
+    checker = DataQualityChecker()
+
+    start = time.perf_counter()
+    results = checker.check_quality_bulk(table)
+    bulk = time.perf_counter() - start
+
+    n = min(args.loop_epds, args.epds)
+    sample = table[table["epd_id"] < n]
+    records = [{"impact_categories": group[["name", "unit", "value"]].to_dict("records")}
+               for _, group in sample.groupby("epd_id")]
+    start = time.perf_counter()
+    for record in records:
+        checker.check_quality(record)
+    loop = (time.perf_counter() - start) * args.epds / n
+
+    flagged = sum(not r.is_valid for r in results.values())
+    print(f"bulk:    {bulk:7.2f}s for {args.epds:,} EPDs ({flagged:,} flagged for review)")
+    print(f"per-EPD: {loop:7.2f}s extrapolated ({loop / bulk:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Peak memory of streaming impact calculation as the inventory grows.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_streaming --rows 100000 1000000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from team_template.src.processing import LCAProcessor
+
+
+def write_files(root: Path, rows: int, datasets: int = 500) -> None:
+    rng = np.random.default_rng(0)
+    names = [f"Dataset {i}" for i in range(datasets)]
+    background = pd.DataFrame(rng.random((20, datasets)), columns=names)
+    background.insert(0, "Impact Category", [f"Category {i}" for i in range(20)])
+    background.insert(1, "Unit", "kg CO2-Eq")
+    background.to_csv(root / "background.csv", index=False)
+    with open(root / "inventory.csv", "w") as f:
+        f.write("Process,Input,Output,Unit,Amount per m2\n")
+        for start in range(0, rows, 100_000):
+            n = min(100_000, rows - start)
+            pd.DataFrame({"Process": "Process", "Input": rng.choice(names[:100], n),
+                          "Output": "", "Unit": "kg", "Amount per m2": rng.random(n)}
+                         ).to_csv(f, header=False, index=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    processor = LCAProcessor()
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write_files(root, rows)
+            size = (root / "inventory.csv").stat().st_size / 2**20
+            tracemalloc.start()
+            start = time.perf_counter()
+            processor.calculate_impacts_streaming(root / "inventory.csv", root / "background.csv",
+                                                  chunksize=args.chunksize)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"{rows:>10,} rows ({size:7.1f} MiB): {elapsed:6.2f}s, "
+              f"peak {peak / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare scalar and vectorized unit standardization.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_units --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from team_template.src.processing import LCAProcessor
+
+UNITS = ["g CO2 eq.", "kg CO2-Eq", "t CO2 eq.", "kg CO2 eq."]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=100_000,
+                        help="rows timed on the scalar path (extrapolated to --rows)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.random(args.rows))
+    units = pd.Series(rng.choice(UNITS, args.rows))
+    processor = LCAProcessor()
+
+    n = min(args.scalar_rows, args.rows)
+    start = time.perf_counter()
+    for value, unit in zip(values.iloc[:n], units.iloc[:n]):
+        processor.standardize_units(value, unit, "kg CO2 eq.")
+    scalar = (time.perf_counter() - start) * args.rows / n
+
+    start = time.perf_counter()
+    processor.standardize_units(values, units, "kg CO2 eq.")
+    vectorized = time.perf_counter() - start
+
+    print(f"scalar:     {scalar:8.3f}s for {args.rows} rows ({args.rows / scalar:,.0f} rows/s)")
+    print(f"vectorized: {vectorized:8.3f}s for {args.rows} rows "
+          f"({args.rows / vectorized:,.0f} rows/s, {scalar / vectorized:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
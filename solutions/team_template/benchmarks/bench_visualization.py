@@ -0,0 +1,84 @@
+"""Throughput of headless batch chart rendering, in charts per second per core.
+
+Synthetic EPDs (eight impact categories, each over four life cycle modules) are
+rendered as impact comparison and contribution charts with ``render_batch`` at each
+worker count, and once through pyplot with a new figure per chart, as the notebooks do,
+for reference.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.bench_visualization --charts 2000 --workers 1,2,4
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from team_template.src.visualization import (ChartJob, LCAVisualizer, render_batch)
+
+CATEGORIES = ["Global warming potential", "Ozone depletion potential",
+              "Acidification potential", "Eutrophication potential",
+              "Photochemical ozone creation potential", "Abiotic depletion potential",
+              "Water use", "Primary energy"]
+MODULES = ["A1-A3", "A4", "A5", "C1-C4"]
+
+
+def synthetic_epd(rng: random.Random) -> dict:
+    return {"impact_categories": [
+        {"name": name, "value": rng.lognormvariate(0, 2), "unit": "unit", "module": module}
+        for name in CATEGORIES for module in MODULES
+    ]}
+
+
+def jobs(n: int, fmt: str, outdir: Path) -> list:
+    rng = random.Random(0)
+    return [ChartJob("impact_comparison", epd, str(outdir / f"{i}_impacts.{fmt}"))
+            if i % 2 == 0 else
+            ChartJob("contribution", epd, str(outdir / f"{i}_gwp.{fmt}"),
+                     category=CATEGORIES[0])
+            for i, epd in ((i, synthetic_epd(rng)) for i in range(n))]
+
+
+def pyplot_baseline(batch: list) -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    for job in batch:
+        if job.kind == "contribution":
+            LCAVisualizer.plot_contribution_analysis(job.data, job.category)
+        else:
+            LCAVisualizer.plot_impact_comparison(job.data, CATEGORIES)
+        plt.savefig(job.path, dpi=job.dpi)
+        plt.close("all")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts", type=int, default=200)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}",
+                        help="comma-separated worker counts")
+    parser.add_argument("--format", default="png", help="png, svg, pdf, ...")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        batch = jobs(args.charts, args.format, Path(workdir))
+        start = time.perf_counter()
+        pyplot_baseline(batch)
+        elapsed = time.perf_counter() - start
+        print(f"  pyplot, 1 core: {args.charts / elapsed:6.1f} charts/s")
+        for workers in map(int, args.workers.split(",")):
+            start = time.perf_counter()
+            results = render_batch(batch, workers=workers)
+            elapsed = time.perf_counter() - start
+            failed = sum(not r.ok for r in results)
+            rate = args.charts / elapsed
+            print(f"batch, {workers:>2} workers: {rate:6.1f} charts/s, "
+                  f"{rate / workers:5.1f} per core, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""End-to-end benchmark suite on a synthetic EPD corpus, with stored results.
+
+Every stage of the workshop pipeline is timed on the same deterministic corpus from
+``tests.helpers.corpus``:
+
+- ``parse_pdf``: pdfplumber over generated PDFs (``--pdfs`` of them), and
+  ``parsed_store_hit``: the same documents served by the parsed-PDF store;
+- ``table_extraction``: the deterministic table reader over every EPD's impact table;
+- ``unit_standardization``: every declared value converted to its reference unit;
+- ``process_extraction``: harmonization and unit conversion of extraction results;
+- ``impacts_dict`` / ``impacts_matrix``: impacts of one inventory per EPD, with
+  ``LCAProcessor.calculate_impacts`` and in one batch with ``MatrixLCA``;
+- ``rule_validation``: the vectorized rule checks over every impact row;
+- ``llm_validation``: batched LLM validation against ``FakeProvider`` (``--latency``);
+- ``pipeline``: PDFs through extract -> process -> visualize -> validate, with the
+  table fast path and cold caches.
+
+Each case runs once to warm up, then ``--repeat`` times (fast cases are looped within
+each sample); the median and minimum are reported. Runs are appended to
+``history.jsonl`` in :data:`RESULTS_DIR` (or ``LCA_BENCHMARK_DIR``) together with the
+commit and the machine. Each case's minimum time, the estimate least disturbed by other
+load, is compared with the median of its minimums over the last ``--window`` earlier
+runs on the same machine with the same parameters (or only the runs of ``--baseline
+<commit>``). A case more than ``--threshold`` slower is flagged as a regression and
+makes the command exit with status 1, so it can gate CI.
+
+The corpus PDFs are written once per seed under :data:`RESULTS_DIR` and reused.
+
+Usage (from the ``solutions/`` directory):
+    python -m team_template.benchmarks.suite --corpus 2000 --pdfs 20
+    python -m team_template.benchmarks.suite --filter "validation|pipeline" --no-save
+    python -m team_template.benchmarks.suite --baseline 3c5b17b --threshold 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from team_template.src.artifacts import ParsedPDFStore, parse_pdf
+from team_template.src.cache import ResponseCache
+from team_template.src.extraction import EPDExtractor
+from team_template.src.fake_provider import FakeProvider
+from team_template.src.llm_client import DEFAULT_LIMITS, ProviderLimits
+from team_template.src.pipeline import CheckpointStore, Pipeline, default_stages
+from team_template.src.processing import ALLOCATION_TEMPLATE, BACKGROUND_TEMPLATE, LCAProcessor
+from team_template.src.table_extraction import SynonymIndex, TableExtractor
+from team_template.src.validation import (DataQualityChecker, LCAValidator,
+                                          flatten_impact_categories)
+from team_template.tests.helpers.corpus import REFERENCE_UNITS, generate_corpus, write_corpus
+from team_template.tests.helpers.mock_data import MockEPD
+
+RESULTS_DIR = Path(__file__).resolve().parents[1] / ".cache" / "benchmarks"
+DEFAULT_THRESHOLD = 0.25
+BASELINE_WINDOW = 5  # earlier runs the baseline is the median of
+MIN_SAMPLE_SECONDS = 0.05
+
+_RECORD_ID = re.compile(r"epd-\d{5}")
+
+
+@dataclass
+class Context:
+    """What the cases are set up from."""
+    epds: List[MockEPD]
+    pdfs: List[Path]
+    workdir: Path
+
+    def records(self) -> Dict[str, Dict]:
+        """Table extraction result of every EPD, by record ID."""
+        extractor = TableExtractor()
+        return {f"epd-{i:05d}": {"impact_categories":
+                                 extractor.extract(epd.tables).impact_categories}
+                for i, epd in enumerate(self.epds)}
+
+    def fresh_dir(self, name: str) -> Path:
+        """An empty directory, so caches start cold."""
+        return Path(tempfile.mkdtemp(prefix=f"{name}-", dir=self.workdir))
+
+
+# name -> setup(context) returning (the function to time, items it processes per call)
+Setup = Callable[[Context], Tuple[Callable[[], Any], int]]
+CASES: Dict[str, Setup] = {}
+
+
+def case(name: str) -> Callable[[Setup], Setup]:
+    """Register a benchmark case under ``name``."""
+    def register(setup: Setup) -> Setup:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("parse_pdf")
+def _parse_pdf(ctx: Context):
+    return lambda: [parse_pdf(path) for path in ctx.pdfs], len(ctx.pdfs)
+
+
+@case("parsed_store_hit")
+def _parsed_store_hit(ctx: Context):
+    store = ParsedPDFStore(ctx.fresh_dir("parsed"))
+    for path in ctx.pdfs:
+        store.load(path)
+    return lambda: [store.load(path).tables for path in ctx.pdfs], len(ctx.pdfs)
+
+
+@case("table_extraction")
+def _table_extraction(ctx: Context):
+    extractor = TableExtractor()
+    return lambda: [extractor.extract(epd.tables) for epd in ctx.epds], len(ctx.epds)
+
+
+@case("unit_standardization")
+def _unit_standardization(ctx: Context):
+    index = SynonymIndex()
+    entries = [c for record in ctx.records().values() for c in record["impact_categories"]]
+    values = pd.Series([c["value"] for c in entries], dtype=float)
+    units = pd.Series([c["unit"] for c in entries])
+    targets = pd.Series([REFERENCE_UNITS[index.lookup(c["name"])] for c in entries])
+    processor = LCAProcessor()
+    return lambda: processor.standardize_units(values, units, targets), len(entries)
+
+
+@case("process_extraction")
+def _process_extraction(ctx: Context):
+    records = list(ctx.records().values())
+    processor = LCAProcessor()
+    return lambda: [processor.process_extraction(r) for r in records], len(records)
+
+
+def _matrix_model(processor: LCAProcessor, seed: int = 0):
+    """Template model with every amount filled in and random characterization factors."""
+    rng = np.random.default_rng(seed)
+    allocation = pd.read_csv(ALLOCATION_TEMPLATE)
+    allocation["Amount per m2"] = allocation["Amount per m2"].fillna(1.0)
+    background = pd.read_csv(BACKGROUND_TEMPLATE)
+    flows = background.columns[2:]
+    background[flows] = rng.lognormal(0.0, 1.0, (len(background), len(flows)))
+    return processor.build_matrix_model(allocation, background), background
+
+
+@case("impacts_dict")
+def _impacts_dict(ctx: Context):
+    processor = LCAProcessor()
+    model, background = _matrix_model(processor)
+    factors = {flow: dict(zip(background["Impact Category"], background[flow]))
+               for flow in model.flows}
+    amounts = np.random.default_rng(1).lognormal(0.0, 0.5, (len(ctx.epds), len(model.flows)))
+    inventories = [dict(zip(model.flows, row)) for row in amounts]
+    return (lambda: [processor.calculate_impacts(inv, factors) for inv in inventories],
+            len(inventories))
+
+
+@case("impacts_matrix")
+def _impacts_matrix(ctx: Context):
+    model, _ = _matrix_model(LCAProcessor())
+    amounts = np.random.default_rng(1).lognormal(0.0, 0.5, (len(ctx.epds), len(model.flows)))
+    return lambda: model.impacts_for_inventories(amounts), len(amounts)
+
+
+@case("rule_validation")
+def _rule_validation(ctx: Context):
+    records = ctx.records()
+    checker = DataQualityChecker()
+    return (lambda: checker.check_quality_bulk(flatten_impact_categories(records)),
+            len(records))
+
+
+@case("llm_validation")
+def _llm_validation(ctx: Context):
+    records = ctx.records()
+
+    def run():
+        cache = ResponseCache(ctx.fresh_dir("validation") / "responses.sqlite", ttl=0)
+        validator = LCAValidator(cache=cache)
+        try:
+            return asyncio.run(validator.validate_extraction_batch(records))
+        finally:
+            cache.close()
+
+    return run, len(records)
+
+
+@case("pipeline")
+def _pipeline(ctx: Context):
+    def run():
+        root = ctx.fresh_dir("pipeline")
+        cache = ResponseCache(root / "responses.sqlite", ttl=0)
+        extractor = EPDExtractor(cache=cache, artifacts=ParsedPDFStore(root / "parsed"),
+                                 table_extractor=TableExtractor())
+        stages = default_stages(extractor=extractor, validator=LCAValidator(cache=cache))
+        try:
+            return Pipeline(stages, CheckpointStore(root / "checkpoints")).run(ctx.pdfs)
+        finally:
+            cache.close()
+
+    return run, len(ctx.pdfs)
+
+
+def verdicts(body: Dict) -> str:
+    """FakeProvider answer: a verdict per record of a batched prompt, else a single one."""
+    verdict = {"is_valid": True, "issues": [], "confidence": 0.9}
+    ids = list(dict.fromkeys(_RECORD_ID.findall(json.dumps(body))))
+    return json.dumps([dict(verdict, id=i) for i in ids] if ids else verdict)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> List[float]:
+    """Seconds per call in ``repeat`` samples, after one warm-up call.
+
+    Calls faster than :data:`MIN_SAMPLE_SECONDS` are looped within each sample, so
+    timer resolution does not turn into noise.
+    """
+    start = time.perf_counter()
+    func()
+    number = max(1, math.ceil(MIN_SAMPLE_SECONDS / max(time.perf_counter() - start, 1e-9)))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def load_history(path: Path) -> List[Dict]:
+    """Stored runs, oldest first; unreadable lines are skipped."""
+    if not path.exists():
+        return []
+    runs = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            runs.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return runs
+
+
+def find_baseline(history: List[Dict], run: Dict, commit: Optional[str] = None,
+                  window: int = BASELINE_WINDOW) -> List[Dict]:
+    """Latest stored runs comparable with ``run``, newest first: same machine and
+    parameters, and the given commit if any."""
+    runs = [previous for previous in reversed(history)
+            if previous.get("machine") == run["machine"]
+            and previous.get("params") == run["params"]
+            and (commit is None or str(previous.get("commit", "")).startswith(commit))]
+    return runs[:window]
+
+
+def baseline_results(runs: List[Dict]) -> Dict[str, Dict]:
+    """Per case, the median over ``runs`` of its minimum time.
+
+    A single earlier run that happened to be fast or slow would flag noise as a
+    change; the median over a few runs does not follow it.
+    """
+    mins: Dict[str, List[float]] = {}
+    for run in runs:
+        for name, result in run.get("results", {}).items():
+            if result.get("min"):
+                mins.setdefault(name, []).append(result["min"])
+    return {name: {"min": statistics.median(values)} for name, values in mins.items()}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Tuple[float, str]]:
+    """Minimum time of each case relative to the baseline and its verdict.
+
+    Returns:
+        ``{case: (ratio, verdict)}`` for the cases in both runs; the verdict is
+        ``"regression"`` if the case got more than ``threshold`` slower, ``"improved"``
+        if it got faster by the same factor, else ``""``
+    """
+    changes = {}
+    for name, result in results.items():
+        if name not in baseline or not baseline[name].get("min"):
+            continue
+        ratio = result["min"] / baseline[name]["min"]
+        verdict = ("regression" if ratio > 1 + threshold
+                   else "improved" if ratio < 1 / (1 + threshold) else "")
+        changes[name] = (ratio, verdict)
+    return changes
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=int, default=1000, help="synthetic EPDs")
+    parser.add_argument("--pdfs", type=int, default=20, help="of them rendered as PDFs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake LLM latency (s)")
+    parser.add_argument("--filter", default="", help="regex selecting the cases to run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown flagged as a regression (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=None, help="compare with this commit's runs")
+    parser.add_argument("--window", type=int, default=BASELINE_WINDOW,
+                        help="earlier runs the baseline is taken over")
+    parser.add_argument("--no-save", action="store_true", help="do not store this run")
+    args = parser.parse_args(argv)
+
+    results_dir = Path(os.getenv("LCA_BENCHMARK_DIR") or RESULTS_DIR)
+    names = [name for name in CASES if re.search(args.filter, name)]
+    epds = generate_corpus(args.corpus, seed=args.seed)
+    print(f"corpus: {len(epds)} EPDs, writing {args.pdfs} PDFs ...", flush=True)
+    pdfs = write_corpus(epds[:args.pdfs], results_dir / "corpus" / f"seed-{args.seed}")
+
+    os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+    DEFAULT_LIMITS["anthropic"] = ProviderLimits(requests_per_minute=0,
+                                                 input_tokens_per_minute=0)
+    results: Dict[str, Dict] = {}
+    with FakeProvider(latency=args.latency, respond=verdicts) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        os.environ["ANTHROPIC_BASE_URL"] = server.url
+        ctx = Context(epds, pdfs, Path(workdir))
+        for name in names:
+            func, items = CASES[name](ctx)
+            times = measure(func, args.repeat)
+            results[name] = {"items": items, "median": statistics.median(times),
+                             "min": min(times)}
+            print(f"  {name}: {results[name]['median']:.4f}s", flush=True)
+
+    run = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": _commit(),
+           "machine": {"node": platform.node(), "python": platform.python_version(),
+                       "cpus": os.cpu_count()},
+           "params": {k: getattr(args, k) for k in ("corpus", "pdfs", "seed", "latency")},
+           "results": results}
+    history_path = results_dir / "history.jsonl"
+    baseline = find_baseline(load_history(history_path), run, args.baseline, args.window)
+    changes = compare(results, baseline_results(baseline), args.threshold)
+
+    print(f"\n{'case':<22}{'items':>7}{'median s':>11}{'min s':>11}{'us/item':>11}"
+          f"{'vs base':>9}")
+    for name, result in results.items():
+        ratio, verdict = changes.get(name, (None, ""))
+        change = f"{ratio:8.2f}x" if ratio is not None else f"{'-':>9}"
+        print(f"{name:<22}{result['items']:>7}{result['median']:>11.4f}{result['min']:>11.4f}"
+              f"{1e6 * result['median'] / result['items']:>11.1f}{change} {verdict}")
+    if baseline:
+        print(f"\nbaseline: {len(baseline)} run(s), latest {baseline[0].get('commit') or '?'} "
+              f"at {baseline[0].get('timestamp')}")
+    else:
+        print("\nno comparable earlier run to compare with")
+
+    if not args.no_save:
+        results_dir.mkdir(parents=True, exist_ok=True)
+        with open(history_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+    regressions = [name for name, (_, verdict) in changes.items() if verdict == "regression"]
+    if regressions:
+        print(f"REGRESSIONS (> {args.threshold:.0%} slower): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+"""On-disk store of parsed PDF content.
+
+Parsing a multi-page EPD with pdfplumber takes seconds, so the page text and tables of
+every PDF are written once to an Arrow IPC file named after the SHA-256 of the PDF's
+bytes. Later reads memory-map that file instead of opening the PDF again, and a renamed
+or copied PDF still hits the same entry.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import pdfplumber
+import pyarrow as pa
+
+from . import telemetry
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "parsed_pdfs"
+
+Table = List[List[Optional[str]]]
+
+SCHEMA = pa.schema([
+    ("page", pa.int32()),
+    ("text", pa.large_string()),
+    ("tables", pa.list_(pa.list_(pa.list_(pa.string())))),
+])
+
+
+def parse_pdf(pdf_path: Union[str, Path]) -> Tuple[List[str], List[List[Table]]]:
+    """Parse text and tables of every page in a single pass over the PDF."""
+    texts, tables = [], []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+            tables.append(page.extract_tables())
+    return texts, tables
+
+
+def file_digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ParsedPDF:
+    """Page text and tables of one PDF, backed by a memory-mapped Arrow table."""
+    key: str
+    table: pa.Table
+
+    @property
+    def page_texts(self) -> List[str]:
+        return self.table.column("text").to_pylist()
+
+    @property
+    def text(self) -> str:
+        """Text of every page, separated by blank lines."""
+        return "\n\n".join(self.page_texts)
+
+    @property
+    def tables(self) -> List[Table]:
+        """Every table in the document, in page order."""
+        return [t for page in self.table.column("tables").to_pylist() for t in page]
+
+    @property
+    def num_pages(self) -> int:
+        return self.table.num_rows
+
+
+class ParsedPDFStore:
+    """Content-addressed cache of parsed PDFs stored as Arrow IPC files."""
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        self.root = Path(root or os.getenv("LCA_PARSED_PDF_DIR") or DEFAULT_STORE_DIR)
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+
+    def key_for(self, pdf_path: Union[str, Path]) -> str:
+        """Content hash of a PDF, memoized per path, size and modification time."""
+        stat = os.stat(pdf_path)
+        memo = (str(Path(pdf_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        if memo not in self._digests:
+            self._digests[memo] = file_digest(pdf_path)
+        return self._digests[memo]
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.arrow"
+
+    def get(self, key: str) -> Optional[ParsedPDF]:
+        """Memory-map a stored entry, or return None if it has not been parsed yet."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        return ParsedPDF(key, table)
+
+    def put(self, key: str, texts: List[str], tables: List[List[Table]]) -> ParsedPDF:
+        """Write parsed pages atomically, so concurrent workers never see partial files."""
+        table = pa.table({
+            "page": pa.array(range(1, len(texts) + 1), pa.int32()),
+            "text": pa.array(texts, pa.large_string()),
+            "tables": pa.array(tables, SCHEMA.field("tables").type),
+        }, schema=SCHEMA)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+                writer.write_table(table)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return ParsedPDF(key, table)
+
+    def load(self, pdf_path: Union[str, Path]) -> ParsedPDF:
+        """Return the parsed content of a PDF, parsing and storing it on first use."""
+        key = self.key_for(pdf_path)
+        parsed = self.get(key)
+        if parsed is not None:
+            telemetry.count("cache_hits", cache="parsed_pdfs")
+            return parsed
+        telemetry.count("cache_misses", cache="parsed_pdfs")
+        with telemetry.span("pdf.parse") as span:
+            texts, tables = parse_pdf(pdf_path)
+            span.set(pages=len(texts))
+        return self.put(key, texts, tables)
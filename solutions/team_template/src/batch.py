@@ -0,0 +1,178 @@
+"""Concurrent batch extraction for directories of EPD PDFs.
+
+PDF parsing is CPU bound and runs in a process pool, while the LLM calls are I/O bound
+and run on the event loop behind a semaphore. Results are streamed back as soon as each
+document finishes and appended to a JSONL checkpoint, so an interrupted run can be
+resumed without redoing finished documents. Rate-limited and overloaded requests are
+retried once, by the shared :class:`~.llm_client.LLMClient`, not again per document.
+
+Usage:
+    python -m team_template.src.batch data/epds/ --concurrency 16 --checkpoint run.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+from .llm_client import MODEL_ROUTES
+
+_worker_extractor: Any = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of extracting a single document."""
+    path: str
+    data: Optional[Dict] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _init_worker(extractor_cls: type, model: str) -> None:
+    global _worker_extractor
+    _worker_extractor = extractor_cls(model_name=model)
+
+
+def _parse_in_worker(pdf_path: str) -> Tuple[str, list]:
+    return _worker_extractor._extract_text(pdf_path), _worker_extractor._extract_tables(pdf_path)
+
+
+def load_checkpoint(path: Union[str, Path, None]) -> Set[str]:
+    """Return the documents already extracted successfully in a previous run."""
+    if path is None or not Path(path).exists():
+        return set()
+    done = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a run killed mid-write leaves a truncated last line
+            if record.get("error") is None:
+                done.add(record["path"])
+    return done
+
+
+async def extract_many(extractor: Any,
+                       paths: Iterable[Union[str, Path]],
+                       concurrency: int = 8,
+                       workers: Optional[int] = None,
+                       checkpoint: Union[str, Path, None] = None,
+                       parser: Optional[Callable[[str], Tuple[str, list]]] = None
+                       ) -> AsyncIterator[BatchResult]:
+    """Extract many EPDs concurrently and yield results in completion order.
+
+    Args:
+        extractor: EPDExtractor (or subclass) whose prompt, model and cache are used
+        paths: PDF files to extract
+        concurrency: Maximum number of LLM calls in flight
+        workers: Parsing processes; defaults to the CPU count, ``0`` parses in threads
+        checkpoint: JSONL file that records finished documents. Documents already
+            recorded there without an error are skipped.
+        parser: Picklable ``path -> (text, tables)`` callable replacing the extractor's
+            own PDF helpers, e.g. for benchmarks
+    Yields:
+        BatchResult per document; failures are reported, not raised
+    """
+    done = load_checkpoint(checkpoint)
+    pending = iter([str(p) for p in paths if str(p) not in done])
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    parse_slots = workers or os.cpu_count() or 1
+    pool: Executor
+    parse: Callable[[str], Tuple[str, list]]
+    if workers == 0:
+        pool = ThreadPoolExecutor(max_workers=parse_slots)
+        parse = parser or (lambda path: (extractor._extract_text(path),
+                                         extractor._extract_tables(path)))
+    else:
+        pool = ProcessPoolExecutor(max_workers=parse_slots, initializer=_init_worker,
+                                   initargs=(type(extractor), extractor.model))
+        parse = parser or _parse_in_worker
+
+    async def run(path: str) -> BatchResult:
+        try:
+            text, tables = await loop.run_in_executor(pool, parse, path)
+            async with semaphore:
+                data = await extractor._aprocess_content(text, tables)
+            return BatchResult(path, data=data)
+        except Exception as exc:
+            return BatchResult(path, error=f"{type(exc).__name__}: {exc}")
+
+    # Only a bounded window of documents is started at a time, so parsed text does
+    # not pile up in memory while waiting for an LLM slot.
+    window = concurrency + parse_slots
+    running: Set[asyncio.Task] = set()
+    log = None
+    if checkpoint is not None:
+        Path(checkpoint).parent.mkdir(parents=True, exist_ok=True)
+        log = open(checkpoint, "a", encoding="utf-8")
+    try:
+        while True:
+            for path in pending:
+                running.add(asyncio.create_task(run(path)))
+                if len(running) >= window:
+                    break
+            if not running:
+                break
+            finished, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                result = task.result()
+                if log is not None:
+                    log.write(json.dumps(asdict(result)) + "\n")
+                    log.flush()
+                yield result
+    finally:
+        for task in running:
+            task.cancel()
+        if log is not None:
+            log.close()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _collect_pdfs(inputs: Iterable[str]) -> list:
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        paths.extend(sorted(path.rglob("*.pdf")) if path.is_dir() else [path])
+    return paths
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from .extraction import EPDExtractor
+
+    extractor = EPDExtractor(model_name=args.model)
+    failures = 0
+    async for result in extractor.extract_many(_collect_pdfs(args.inputs),
+                                               concurrency=args.concurrency,
+                                               workers=args.workers,
+                                               checkpoint=args.checkpoint):
+        failures += not result.ok
+        print(f"{'ok  ' if result.ok else 'FAIL'} {result.path}"
+              + (f"  ({result.error})" if result.error else ""))
+    return 1 if failures else 0
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point for batch extraction."""
+    parser = argparse.ArgumentParser(description="Extract EPD data from many PDFs.")
+    parser.add_argument("inputs", nargs="+", help="PDF files or directories to scan")
+    parser.add_argument("--model", default=MODEL_ROUTES["extraction"])
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM calls in flight")
+    parser.add_argument("--workers", type=int, default=None, help="PDF parsing processes")
+    parser.add_argument("--checkpoint", default="results/batch_extraction.jsonl",
+                        help="JSONL results file; re-running resumes from it")
+    return asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+"""Persistent, content-addressed cache for LLM responses.
+
+Re-running extraction or validation over the same EPDs sends the same prompts again.
+Responses are stored in a local SQLite file keyed on a hash of the model name, the
+prompt and the input content, so a re-run is answered from disk without API calls.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Union
+
+from . import telemetry
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / ".cache" / "llm_responses.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def make_cache_key(model: str, prompt: str, content: str = "") -> str:
+    """Hash the parts of an LLM request into a stable cache key.
+
+    Each part is length-prefixed so that moving text between the prompt and the
+    content can never produce the same key.
+    """
+    digest = hashlib.sha256()
+    for part in (model, prompt, content):
+        encoded = part.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LLM response cache with TTL expiry and size-based LRU eviction."""
+
+    def __init__(self,
+                 path: Union[str, Path, None] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: Optional[float] = None):
+        """Configure the cache; the database file is only opened on first use.
+
+        Args:
+            path: SQLite file location. Defaults to ``LCA_CACHE_PATH`` or ``.cache/``
+                inside the team directory; ``":memory:"`` keeps responses only for
+                the life of this object.
+            max_bytes: Total response size kept before least recently used entries
+                are evicted.
+            ttl: Entry lifetime in seconds. Defaults to ``LCA_CACHE_TTL`` from the
+                environment; unset or ``0`` keeps entries until they are evicted, so a
+                re-run days later still makes no API calls.
+        """
+        self.path = Path(path or os.getenv("LCA_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes
+        self.ttl = float(os.getenv("LCA_CACHE_TTL") or 0) if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._size = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+        return self._conn
+
+    def get(self, model: str, prompt: str, content: str = "") -> Optional[str]:
+        """Return the cached response for a request, or None if absent or expired."""
+        key = make_cache_key(model, prompt, content)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                telemetry.count("cache_misses", cache="responses")
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+        telemetry.count("cache_hits", cache="responses")
+        return row[0]
+
+    def put(self, model: str, prompt: str, content: str, response: str) -> None:
+        """Store a response and evict old entries if the cache grew past its limit."""
+        key = make_cache_key(model, prompt, content)
+        now = time.time()
+        expires = now + self.ttl if self.ttl > 0 else None
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            conn = self._connection()
+            self._size -= self._stored_size(conn, key)
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now, expires),
+            )
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict(conn, now)
+            conn.commit()
+
+    def delete(self, model: str, prompt: str, content: str = "") -> None:
+        """Drop a single entry, e.g. after its response failed to parse."""
+        key = make_cache_key(model, prompt, content)
+        with self._lock:
+            conn = self._connection()
+            self._size -= self._stored_size(conn, key)
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+            self._size = 0
+
+    def size_bytes(self) -> int:
+        """Total size of the stored responses."""
+        with self._lock:
+            self._connection()
+            return self._size
+
+    @staticmethod
+    def _stored_size(conn: sqlite3.Connection, key: str) -> int:
+        row = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under the limit."""
+        conn.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if self._size <= self.max_bytes:
+                break
+            doomed.append((key,))
+            self._size -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def get_or_call(self, model: str, prompt: str, content: str,
+                    call: Callable[[], str]) -> str:
+        """Return the cached response or invoke ``call`` and cache its result."""
+        cached = self.get(model, prompt, content)
+        if cached is not None:
+            return cached
+        response = call()
+        self.put(model, prompt, content, response)
+        return response
+
+    async def aget_or_call(self, model: str, prompt: str, content: str,
+                           call: Callable[[], Awaitable[str]]) -> str:
+        """Async variant of :meth:`get_or_call` for coroutine-based LLM calls."""
+        cached = self.get(model, prompt, content)
+        if cached is not None:
+            return cached
+        response = await call()
+        self.put(model, prompt, content, response)
+        return response
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
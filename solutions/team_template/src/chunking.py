@@ -0,0 +1,210 @@
+"""Section-aware, token-budgeted chunking of long EPD documents.
+
+A 40-80 page EPD is mostly boilerplate (company history, verification statements,
+references) around a few pages of impact tables. :class:`DocumentChunker` splits the
+parsed text at section headings into chunks of at most ``max_tokens``, puts the tables
+into chunks of their own, and scores every chunk for the content extraction needs:
+
+- impact indicators and their units (GWP, kg CO2 eq., ...)
+- the declared or functional unit
+- life cycle modules A1-A3 ... D and the system boundary
+
+Only chunks scoring at least ``min_score`` are sent (at most ``max_chunks``, best
+first), each as its own extraction request, and :func:`merge_extractions` combines the
+answers into one result.
+
+Example:
+    >>> extractor = EPDExtractor(chunker=DocumentChunker(max_tokens=3000))
+    >>> extractor.extract_from_pdf("epd.pdf")["metadata"]["chunks"]
+    {'total': 41, 'sent': 5, 'tokens_sent': 9120, 'tokens_total': 61200}
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .llm import estimate_tokens
+from .validation import normalize_category
+
+Table = List[List[Optional[str]]]
+
+# Numbered ("4.2 LCA results") or upper-case ("SYSTEM BOUNDARIES") heading lines
+_HEADING = re.compile(r"^(?:\d{1,2}(?:\.\d{1,2})*\.?\s+[A-Z][^.:]{2,80}"
+                      r"|[A-Z][A-Z0-9 ,&/()+-]{3,80})$")
+
+# (weight, pattern) per kind of relevant content; matches are counted per chunk
+RELEVANCE_PATTERNS: Dict[str, Tuple[float, str]] = {
+    "impact_indicators": (3.0, r"\b(?:GWP|global warming|acidification|eutrophication|"
+                               r"ozone depletion|photochemical|abiotic depletion|ADP[ -]|"
+                               r"water (?:use|deprivation)|particulate matter|PERT|PENRT)"),
+    "impact_units": (3.0, r"\bkg\s*(?:CO2|SO2|PO4|CFC|C2H4|Sb|NMVOC|P)\b|\bmol H\+|"
+                          r"\bMJ\b|\bm3 (?:world )?(?:eq|depriv)"),
+    "declared_unit": (5.0, r"\b(?:declared|functional) unit\b"),
+    "modules": (2.0, r"\bA1\s*[-–]\s*A3\b|\b[ABC][1-7]\b|\bmodule D\b"),
+    "system_boundary": (4.0, r"\bsystem boundar(?:y|ies)\b|\bcradle[ -]to[ -](?:gate|grave)\b"),
+    "results": (2.0, r"\bLCA results\b|\benvironmental (?:impacts?|indicators?|performance)\b"),
+}
+_COMPILED = {name: (weight, re.compile(pattern, re.IGNORECASE))
+             for name, (weight, pattern) in RELEVANCE_PATTERNS.items()}
+_NUMBER = re.compile(r"^[-+]?\d[\d.,]*(?:[eE][-+]?\d+)?$")
+
+CONFIDENCE_RANK = {"high": 3, "medium": 2, "low": 1}
+
+
+@dataclass
+class Chunk:
+    """A piece of a document sent to the model on its own."""
+    index: int
+    title: str
+    text: str = ""
+    tables: List[Table] = field(default_factory=list)
+    tokens: int = 0
+    score: float = 0.0
+    matches: Dict[str, int] = field(default_factory=dict)
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split text at heading lines into ``(heading, body)`` pairs, in order."""
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in text.splitlines():
+        stripped = line.strip()
+        if _HEADING.match(stripped) and len(stripped.split()) <= 12:
+            sections.append((stripped, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(title, "\n".join(lines)) for title, lines in sections if any(lines)]
+
+
+def score_text(text: str) -> Tuple[float, Dict[str, int]]:
+    """Relevance score of a piece of text and the match count per pattern.
+
+    Each kind of content adds ``weight * log2(1 + matches)``, so a chunk mentioning
+    several relevant things outranks one repeating a single keyword.
+    """
+    matches = {name: len(pattern.findall(text)) for name, (_, pattern) in _COMPILED.items()}
+    score = sum(_COMPILED[name][0] * math.log2(1 + n) for name, n in matches.items())
+    return score, {name: n for name, n in matches.items() if n}
+
+
+def _numeric_share(table: Table) -> float:
+    cells = [c.strip() for row in table for c in row if c and c.strip()]
+    return sum(bool(_NUMBER.match(c)) for c in cells) / len(cells) if cells else 0.0
+
+
+class DocumentChunker:
+    """Splits documents into scored chunks and picks the relevant ones."""
+
+    def __init__(self, max_tokens: int = 3000, min_score: float = 4.0,
+                 max_chunks: int = 8, max_concurrency: int = 4):
+        """Configure chunk sizes and selection.
+
+        Args:
+            max_tokens: Estimated tokens of text and tables per chunk
+            min_score: Chunks scoring lower are not sent
+            max_chunks: Upper bound on the chunks sent per document
+            max_concurrency: Chunk extractions in flight per document
+        """
+        self.max_tokens = max_tokens
+        self.min_score = min_score
+        self.max_chunks = max_chunks
+        self.max_concurrency = max_concurrency
+
+    def chunk(self, text: str, tables: Sequence[Table] = ()) -> List[Chunk]:
+        """Pack sections, then tables, into chunks of at most ``max_tokens``."""
+        chunks: List[Chunk] = []
+        current: Optional[Chunk] = None
+        for title, body in split_sections(text):
+            for piece in self._split_long(body):
+                tokens = estimate_tokens(piece)
+                if current is None or current.tokens + tokens > self.max_tokens:
+                    current = Chunk(index=len(chunks), title=title)
+                    chunks.append(current)
+                current.text = f"{current.text}\n{piece}" if current.text else piece
+                current.tokens += tokens
+
+        current = None
+        for table in tables:
+            tokens = estimate_tokens(json.dumps(table))
+            if current is None or current.tokens + tokens > self.max_tokens:
+                current = Chunk(index=len(chunks), title="Tables")
+                chunks.append(current)
+            current.tables.append(table)
+            current.tokens += tokens
+
+        for c in chunks:
+            table_text = "\n".join(" ".join(cell or "" for cell in row)
+                                   for table in c.tables for row in table)
+            c.score, c.matches = score_text(f"{c.title}\n{c.text}\n{table_text}")
+            if c.tables:
+                c.score *= 1.0 + max(_numeric_share(t) for t in c.tables)
+        return chunks
+
+    def select(self, chunks: List[Chunk]) -> List[Chunk]:
+        """The chunks worth sending, in document order.
+
+        If no chunk reaches ``min_score`` the best scoring one is still sent, so a
+        document with unusual wording is never skipped entirely.
+        """
+        ranked = sorted(chunks, key=lambda c: c.score, reverse=True)
+        chosen = [c for c in ranked if c.score >= self.min_score][:self.max_chunks]
+        if not chosen and ranked:
+            chosen = ranked[:1]
+        return sorted(chosen, key=lambda c: c.index)
+
+    def _split_long(self, body: str) -> List[str]:
+        """Split a section longer than the budget at line breaks."""
+        if estimate_tokens(body) <= self.max_tokens:
+            return [body]
+        pieces: List[str] = []
+        current = ""
+        for line in body.splitlines(keepends=True):
+            while estimate_tokens(line) > self.max_tokens:  # a single enormous line
+                cut = (self.max_tokens - 1) * 4
+                pieces.append(line[:cut])
+                line = line[cut:]
+            if current and estimate_tokens(current + line) > self.max_tokens:
+                pieces.append(current)
+                current = ""
+            current += line
+        if current:
+            pieces.append(current)
+        return pieces
+
+
+def merge_extractions(results: Sequence[Dict[str, Any]],
+                      chunk_stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Combine per-chunk extraction results into one document result.
+
+    Impact categories are de-duplicated on normalized name, unit and module. When two
+    chunks disagree, the entry with the higher ``confidence`` wins (earlier chunks on a
+    tie) and the disagreement is listed in ``metadata["merge_conflicts"]``. Metadata
+    fields take the first non-empty value.
+    """
+    merged: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    conflicts: List[Dict[str, Any]] = []
+    metadata: Dict[str, Any] = {}
+    for result in results:
+        for category in result.get("impact_categories") or []:
+            key = (normalize_category(category.get("name", "")),
+                   str(category.get("unit", "")).strip(),
+                   str(category.get("module", "")).strip())
+            kept = merged.get(key)
+            if kept is None:
+                merged[key] = category
+                continue
+            if kept.get("value") != category.get("value"):
+                conflicts.append({"name": category.get("name"), "unit": key[1],
+                                  "values": [kept.get("value"), category.get("value")]})
+            rank = CONFIDENCE_RANK.get(str(category.get("confidence", "")).lower(), 0)
+            if rank > CONFIDENCE_RANK.get(str(kept.get("confidence", "")).lower(), 0):
+                merged[key] = category
+        for name, value in (result.get("metadata") or {}).items():
+            if metadata.get(name) in (None, "", [], {}):
+                metadata[name] = value
+    if conflicts:
+        metadata["merge_conflicts"] = conflicts
+    if chunk_stats is not None:
+        metadata["chunks"] = chunk_stats
+    return {"impact_categories": list(merged.values()), "metadata": metadata}
@@ -0,0 +1,324 @@
+"""Pre-aggregated contribution cube for contribution analysis across many products.
+
+:class:`ContributionCube` materializes the contributions of every product once, as a
+dense ``products x categories x processes x modules`` float64 array, together with its
+roll-ups:
+
+- ``totals``: products x categories
+- ``by_process``: products x categories x processes (summed over modules)
+- ``by_module``: products x categories x modules (summed over processes)
+- ``order``: processes of each (product, category) sorted by absolute contribution
+- portfolio sums over all products per category, by process and by module
+
+Module D (benefits and loads beyond the system boundary) is kept in ``values`` and
+``by_module``, so it shows in module roll-ups and drill-downs, but is left out of
+``by_process`` and ``totals``.
+
+Top-N contributors, roll-ups and drill-downs are then lookups and slices of these arrays
+instead of a pass over the processed results. Adding a product, or replacing one whose
+results changed, updates only that product's slices and the portfolio sums; the product
+axis grows by doubling, so adding thousands of products one at a time stays cheap.
+
+Categories are matched by any spelling the table synonyms know ("GWP", "Global warming
+potential"); processes and modules by name. Contributions come from a matrix model
+(``MatrixLCA.contributions`` / ``ImpactGraph.contribution_table``) or from processed EPD
+results, whose values per life cycle module are stored under :data:`REPORTED`; a total
+declared next to the modules is kept as the product's total, as in the charts.
+
+Example:
+    >>> cube = ContributionCube()
+    >>> cube.add_contributions("rockwool-100mm", model.contributions(), module="A1-A3")
+    >>> cube.top_contributors("rockwool-100mm", "GWP", n=3)
+    [('Melting', 7.1, 0.62), ('Binder', 2.4, 0.21), ('Transport', 0.9, 0.08)]
+    >>> cube.slice("GWP").nlargest(10, "Melting")
+    >>> render_chart(ChartJob("contribution", cube.chart_data("rockwool-100mm"),
+    ...                       "gwp.svg", category="GWP"))
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .table_extraction import (SynonymIndex, life_cycle_modules, life_cycle_total,
+                               normalize_label, parse_module)
+
+# Process of values reported per module without a process breakdown (processed EPDs)
+REPORTED = "(reported)"
+# Module of contributions without a life cycle module
+NO_MODULE = "unspecified"
+
+Record = Tuple[str, str, str, float]  # category, process, module, value
+
+
+class _Axis:
+    """Names along one cube dimension and their positions, optionally matched by a key."""
+
+    def __init__(self, key=None):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._key = key
+        self._keys: Dict[str, str] = {}  # memo of key(), which may be a synonym lookup
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def key(self, name: str) -> str:
+        if self._key is None:
+            return name
+        if name not in self._keys:
+            self._keys[name] = self._key(name)
+        return self._keys[name]
+
+    def get(self, name: str) -> Optional[int]:
+        return self.index.get(self.key(name))
+
+    def add(self, name: str) -> int:
+        key = self.key(name)
+        if key not in self.index:
+            self.index[key] = len(self.names)
+            self.names.append(name)
+        return self.index[key]
+
+    def position(self, name: str) -> int:
+        """Position of a name.
+
+        Raises:
+            KeyError: If the name is not on this axis.
+        """
+        i = self.get(name)
+        if i is None:
+            raise KeyError(f"{name!r} is not in the cube")
+        return i
+
+
+class ContributionCube:
+    """Products x categories x processes x modules contributions with materialized roll-ups."""
+
+    def __init__(self, capacity: int = 64):
+        """Create an empty cube.
+
+        Args:
+            capacity: Products to allocate room for; the cube grows as needed
+        """
+        synonyms = SynonymIndex()
+        self.products = _Axis()
+        self.categories = _Axis(lambda name: synonyms.lookup(name) or normalize_label(name))
+        self.processes = _Axis()
+        self.modules = _Axis()
+        self.units: Dict[str, str] = {}
+        self._capacity = capacity
+        self._allocate(capacity, 0, 0, 0)
+
+    def _allocate(self, products: int, categories: int, processes: int, modules: int) -> None:
+        self.values = np.zeros((products, categories, processes, modules))
+        self.by_process = np.zeros((products, categories, processes))
+        self.by_module = np.zeros((products, categories, modules))
+        self.totals = np.zeros((products, categories))
+        self.order = np.zeros((products, categories, processes), dtype=np.int32)
+        self.portfolio_by_process = np.zeros((categories, processes))
+        self.portfolio_by_module = np.zeros((categories, modules))
+
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        return (len(self.products), len(self.categories), len(self.processes),
+                len(self.modules))
+
+    def _grow(self) -> None:
+        """Resize the arrays to the axes, doubling the product capacity when full."""
+        n_products, n_categories, n_processes, n_modules = self.shape
+        old = self.values
+        if (n_products <= old.shape[0] and (n_categories, n_processes, n_modules)
+                == old.shape[1:]):
+            return
+        capacity = old.shape[0]
+        while capacity < n_products:
+            capacity *= 2
+        _, c, k, m = old.shape
+        self._allocate(capacity, n_categories, n_processes, n_modules)
+        self.values[:old.shape[0], :c, :k, :m] = old
+        self._rollup()
+
+    def _module_weights(self) -> np.ndarray:
+        """1 for the modules that count towards totals, 0 for module D."""
+        return np.array([0.0 if parse_module(name) == "D" else 1.0
+                         for name in self.modules.names])
+
+    def _rollup(self) -> None:
+        """Recompute every roll-up from the values (after growing or loading)."""
+        self.by_process = self.values @ self._module_weights()
+        self.by_module = self.values.sum(axis=2)
+        self.totals = self.by_process.sum(axis=2)
+        self.order = np.argsort(-np.abs(self.by_process), axis=2, kind="stable").astype(np.int32)
+        self.portfolio_by_process = self.by_process.sum(axis=0)
+        self.portfolio_by_module = self.by_module.sum(axis=0)
+
+    def add(self, product: str, records: Iterable[Record]) -> None:
+        """Store a product's contributions, replacing any stored before.
+
+        Args:
+            product: Product ID
+            records: ``(category, process, module, value)`` tuples; ``module`` may be
+                None. Values of repeated keys are added up.
+        """
+        records = [(c, p, m or NO_MODULE, float(v)) for c, p, m, v in records
+                   if v is not None and not np.isnan(v)]
+        i = self.products.add(product)
+        for category, process, module, _ in records:
+            self.categories.add(category)
+            self.processes.add(process)
+            self.modules.add(module)
+        self._grow()
+
+        old_process, old_module = self.by_process[i].copy(), self.by_module[i].copy()
+        self.values[i] = 0.0
+        for category, process, module, value in records:
+            self.values[i, self.categories.get(category), self.processes.get(process),
+                        self.modules.get(module)] += value
+        self.by_process[i] = self.values[i] @ self._module_weights()
+        self.by_module[i] = self.values[i].sum(axis=1)
+        self.totals[i] = self.by_process[i].sum(axis=1)
+        self.order[i] = np.argsort(-np.abs(self.by_process[i]), axis=1, kind="stable")
+        self.portfolio_by_process += self.by_process[i] - old_process
+        self.portfolio_by_module += self.by_module[i] - old_module
+
+    def add_contributions(self, product: str, table: pd.DataFrame,
+                          module: Optional[str] = None,
+                          units: Optional[Dict[str, str]] = None) -> None:
+        """Store a categories x processes table, e.g. ``MatrixLCA.contributions()``."""
+        self.units.update(units or {})
+        self.add(product, ((category, process, module, value)
+                           for category, row in table.iterrows()
+                           for process, value in row.items() if value))
+
+    def add_processed(self, product: str, data: Dict) -> None:
+        """Store processed EPD results: ``data["contributions"]`` (``{category:
+        {process: value}}``) if present, otherwise the impact values per module.
+
+        Per category, the A-C modules of :func:`table_extraction.life_cycle_modules`
+        (no "A1" next to "A1-A3") and module D are stored. A total declared without
+        module stays the category's total: the part of it the modules do not account
+        for is stored under :data:`NO_MODULE`.
+        """
+        if data.get("contributions"):
+            records = [(category, process, None, value)
+                       for category, parts in data["contributions"].items()
+                       for process, value in parts.items()]
+        else:
+            names: Dict[str, str] = {}
+            declared: Dict[str, float] = {}
+            modules: Dict[str, Dict[str, float]] = {}
+            for entry in data.get("impact_categories", []):
+                try:
+                    value = float(entry.get("value"))
+                except (TypeError, ValueError):
+                    continue
+                name = entry.get("name", "")
+                key = self.categories.key(name)
+                names.setdefault(key, name)
+                if entry.get("module"):
+                    parts = modules.setdefault(key, {})
+                    parts[entry["module"]] = parts.get(entry["module"], 0.0) + value
+                else:
+                    declared[key] = declared.get(key, 0.0) + value
+            records = []
+            for key, name in names.items():
+                parts = modules.get(key, {})
+                kept = life_cycle_modules(parts)
+                kept += [m for m in parts if parse_module(m) == "D"]
+                records += [(name, REPORTED, m, parts[m]) for m in kept]
+                if key in declared:
+                    rest = declared[key] - (life_cycle_total(parts) or 0.0)
+                    if abs(rest) > 1e-9 * max(abs(declared[key]), 1.0):
+                        records.append((name, REPORTED, None, rest))
+        for entry in data.get("impact_categories", []):
+            if entry.get("unit"):
+                self.units.setdefault(entry.get("name", ""), entry["unit"])
+        self.add(product, records)
+
+    def total(self, product: str, category: str) -> float:
+        """Impact of a product in a category."""
+        return float(self.totals[self.products.position(product),
+                                 self.categories.position(category)])
+
+    def top_contributors(self, product: str, category: str,
+                         n: int = 5) -> List[Tuple[str, float, float]]:
+        """The ``n`` processes contributing most (by absolute value) to a category.
+
+        Returns:
+            ``(process, value, share of the total)``, largest first
+        """
+        i, c = self.products.position(product), self.categories.position(category)
+        total = self.totals[i, c]
+        top = []
+        for k in self.order[i, c, :n]:
+            value = float(self.by_process[i, c, k])
+            if value == 0.0:
+                break
+            top.append((self.processes.names[k], value, value / total if total else 0.0))
+        return top
+
+    def rollup(self, product: str, category: str, by: str = "process") -> Dict[str, float]:
+        """A product's contributions to a category, summed by ``"process"`` or ``"module"``."""
+        i, c = self.products.position(product), self.categories.position(category)
+        axis, values = ((self.processes, self.by_process[i, c]) if by == "process"
+                        else (self.modules, self.by_module[i, c]))
+        return {name: float(v) for name, v in zip(axis.names, values) if v}
+
+    def drill_down(self, product: str, category: str, process: str) -> Dict[str, float]:
+        """One process's contribution to a category, split by life cycle module."""
+        i, c = self.products.position(product), self.categories.position(category)
+        values = self.values[i, c, self.processes.position(process)]
+        return {name: float(v) for name, v in zip(self.modules.names, values) if v}
+
+    def slice(self, category: str, by: str = "process",
+              products: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Products x processes (or x modules) contributions to one category."""
+        c = self.categories.position(category)
+        rows = (list(range(len(self.products))) if products is None
+                else [self.products.position(p) for p in products])
+        axis, values = ((self.processes, self.by_process) if by == "process"
+                        else (self.modules, self.by_module))
+        return pd.DataFrame(values[rows, c, :len(axis)], columns=axis.names,
+                            index=pd.Index([self.products.names[i] for i in rows],
+                                           name="product"))
+
+    def portfolio(self, category: str, by: str = "process") -> pd.Series:
+        """Contributions to a category summed over all products, largest first."""
+        c = self.categories.position(category)
+        axis, values = ((self.processes, self.portfolio_by_process) if by == "process"
+                        else (self.modules, self.portfolio_by_module))
+        series = pd.Series(values[c], index=axis.names, name=self.categories.names[c])
+        return series.iloc[np.argsort(-np.abs(series.to_numpy()), kind="stable")]
+
+    def chart_data(self, product: str) -> Dict:
+        """A product's contributions by process in the form the chart functions take
+        (``{"contributions": {category: {process: value}}}``)."""
+        return {"contributions": {category: self.rollup(product, category)
+                                  for category in self.categories.names}}
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the cube as one ``.npz`` file (values and axis names)."""
+        n = len(self.products)
+        names = {"products": self.products.names, "categories": self.categories.names,
+                 "processes": self.processes.names, "modules": self.modules.names,
+                 "units": self.units}
+        np.savez_compressed(path, values=self.values[:n], names=json.dumps(names))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ContributionCube":
+        """Read a cube written by :meth:`save`; the roll-ups are rebuilt once."""
+        with np.load(path) as stored:
+            values = stored["values"]
+            names = json.loads(str(stored["names"]))
+        cube = cls(capacity=max(len(names["products"]), 1))
+        for axis in ("products", "categories", "processes", "modules"):
+            for name in names[axis]:
+                getattr(cube, axis).add(name)
+        cube.units = names["units"]
+        cube._allocate(cube._capacity, *values.shape[1:])
+        cube.values[:len(values)] = values
+        cube._rollup()
+        return cube
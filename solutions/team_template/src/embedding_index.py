@@ -0,0 +1,273 @@
+"""Offline vector index for matching inventory flows to background datasets.
+
+Filling the background template means deciding, for every inventory input ("Slags",
+"Electricity"), which background dataset ("Blast furnace slag", "Electricity medium
+voltage") supplies it. :class:`EmbeddingIndex` embeds dataset names and descriptions
+with :class:`HashedNgramEmbedder` (signed feature hashing of words and character
+n-grams, no model download) into an L2-normalized float32 matrix. The matrix is saved as
+a ``.npy`` file and opened memory-mapped, so large background databases are not read
+into memory; :meth:`EmbeddingIndex.search` returns the top-k datasets for a batch of
+queries as one matrix product per block.
+
+:class:`FlowMatcher` accepts the best match when it is both similar enough and clearly
+ahead of the runner-up. Only the ambiguous flows are sent to an LLM, once, together with
+their candidates.
+
+Example:
+    >>> index = EmbeddingIndex.build(background_flows, BACKGROUND_DESCRIPTIONS)
+    >>> index.save("flow_index/")
+    >>> index = EmbeddingIndex.load("flow_index/")  # memory-mapped
+    >>> FlowMatcher(index).match(["Slags", "Coke"])
+"""
+
+import json
+import re
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cache import ResponseCache
+from .llm import complete, parse_json_response
+from .llm_client import MODEL_ROUTES
+from .matrix_lca import FLOW_TO_BACKGROUND
+from .prompts import get_registry
+
+DEFAULT_DIMENSIONS = 1024
+BLOCK_SIZE = 1024
+
+# Extra words for the background datasets of the rock wool templates
+BACKGROUND_DESCRIPTIONS: Dict[str, str] = {
+    "Basalt production": "basalt rock stone quarry raw material",
+    "Dolomite production": "dolomite limestone mineral raw material",
+    "Blast furnace slag": "slags slag steel industry by-product raw material",
+    "Resin binder": "phenol formaldehyde resin binder glue",
+    "Electricity medium voltage": "electricity electric power grid kWh",
+    "Compressed air": "compressed air compressor pneumatic",
+    "Truck transport": "truck lorry road freight transport tkm",
+    "Wooden pallet": "wooden wood pallet packaging",
+    "Polyethylene film": "polyethylene PE plastic film foil wrap packaging",
+}
+
+_WORD = re.compile(r"[0-9a-z]+")
+
+
+class HashedNgramEmbedder:
+    """Embeds text as signed hashed counts of words and character n-grams."""
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS,
+                 ngram_range: Tuple[int, int] = (3, 4), word_weight: float = 2.0):
+        self.dimensions = dimensions
+        self.ngram_range = tuple(ngram_range)
+        self.word_weight = word_weight
+
+    def config(self) -> Dict:
+        return {"dimensions": self.dimensions, "ngram_range": list(self.ngram_range),
+                "word_weight": self.word_weight}
+
+    def features(self, text: str) -> Tuple[List[str], List[float]]:
+        features, weights = [], []
+        low, high = self.ngram_range
+        for word in _WORD.findall(text.lower()):
+            features.append(f"w:{word}")
+            weights.append(self.word_weight)
+            padded = f"<{word}>"
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    features.append(padded[i:i + n])
+                    weights.append(1.0)
+        return features, weights
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """L2-normalized ``(len(texts), dimensions)`` float32 matrix."""
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features, weights = self.features(text)
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features),
+                                 dtype=np.uint64, count=len(features))
+            signs = np.where(hashes & np.uint64(1 << 31), -1.0, 1.0) * weights
+            vector = np.bincount((hashes % np.uint64(self.dimensions)).astype(np.intp),
+                                 weights=signs, minlength=self.dimensions)
+            norm = np.linalg.norm(vector)
+            if norm:
+                matrix[row] = vector / norm
+        return matrix
+
+
+class EmbeddingIndex:
+    """Names with their embedding vectors, searchable by cosine similarity."""
+
+    VECTORS_FILE = "vectors.npy"
+    META_FILE = "index.json"
+
+    def __init__(self, names: Sequence[str], vectors: np.ndarray,
+                 embedder: Optional[HashedNgramEmbedder] = None):
+        self.names = list(names)
+        self.vectors = vectors
+        self.embedder = embedder or HashedNgramEmbedder(vectors.shape[1])
+
+    @classmethod
+    def build(cls, names: Sequence[str], descriptions: Optional[Dict[str, str]] = None,
+              embedder: Optional[HashedNgramEmbedder] = None) -> "EmbeddingIndex":
+        """Embed every name together with its description, if any."""
+        embedder = embedder or HashedNgramEmbedder()
+        descriptions = descriptions or {}
+        texts = [f"{name} {descriptions.get(name, '')}" for name in names]
+        return cls(names, embedder.embed(texts), embedder)
+
+    def save(self, directory: Union[str, Path]) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / self.VECTORS_FILE, np.ascontiguousarray(self.vectors, np.float32))
+        (directory / self.META_FILE).write_text(json.dumps(
+            {"names": self.names, "embedder": self.embedder.config()}, ensure_ascii=False),
+            encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "EmbeddingIndex":
+        """Open a saved index; the vectors stay on disk, memory-mapped read-only."""
+        directory = Path(directory)
+        meta = json.loads((directory / cls.META_FILE).read_text(encoding="utf-8"))
+        vectors = np.load(directory / cls.VECTORS_FILE, mmap_mode="r")
+        return cls(meta["names"], vectors, HashedNgramEmbedder(**meta["embedder"]))
+
+    def search(self, queries: Sequence[str], k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k names per query.
+
+        Returns:
+            ``(indices, scores)``, both ``(len(queries), k)`` and best first; ``k`` is
+            capped at the number of names, so an empty index returns no columns
+        """
+        k = min(k, len(self.names))
+        indices = np.empty((len(queries), k), dtype=np.intp)
+        scores = np.empty((len(queries), k), dtype=np.float32)
+        if k == 0:
+            return indices, scores
+        query_vectors = self.embedder.embed(queries)
+        for start in range(0, len(queries), BLOCK_SIZE):
+            similarity = query_vectors[start:start + BLOCK_SIZE] @ self.vectors.T
+            top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            indices[start:start + len(top)] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + len(top)] = np.take_along_axis(top_scores, order, axis=1)
+        return indices, scores
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        indices, scores = self.search([query], k)
+        return [(self.names[i], float(s)) for i, s in zip(indices[0], scores[0])]
+
+
+@dataclass
+class FlowMatch:
+    """Background dataset chosen for an inventory flow.
+
+    Attributes:
+        flow: Inventory input name
+        dataset: Background dataset, or None if nothing matched
+        method: ``"map"``, ``"embedding"``, ``"llm"`` or None
+        score: Cosine similarity of the best candidate
+        candidates: Top candidates with their similarity, best first
+    """
+    flow: str
+    dataset: Optional[str]
+    method: Optional[str]
+    score: float = 0.0
+    candidates: List[Tuple[str, float]] = field(default_factory=list)
+
+
+class FlowMatcher:
+    """Matches inventory flows to background datasets, asking an LLM only when unsure."""
+
+    def __init__(self, index: EmbeddingIndex, flow_map: Optional[Dict[str, str]] = None,
+                 min_score: float = 0.3, margin: float = 0.1, k: int = 3,
+                 model: str = MODEL_ROUTES["matching"],
+                 cache: Optional[ResponseCache] = None):
+        """Configure matching.
+
+        Args:
+            index: Index over the background datasets
+            flow_map: Known input name -> dataset pairs, see ``FLOW_TO_BACKGROUND``
+            min_score: Best candidate's similarity needed to accept it without the LLM
+            margin: Lead over the second candidate needed to accept it without the LLM
+            k: Candidates shown to the LLM per ambiguous flow
+            model: Model confirming ambiguous matches
+            cache: Response cache for the confirmation requests; a default on-disk
+                cache is used when omitted
+        """
+        self.index = index
+        self.flow_map = dict(FLOW_TO_BACKGROUND if flow_map is None else flow_map)
+        self.min_score = min_score
+        self.margin = margin
+        self.k = k
+        self.model = model
+        self.cache = cache if cache is not None else ResponseCache()
+        self.confirmed: Dict[str, Optional[str]] = {}
+
+    def match(self, flows: Sequence[str], confirm: bool = True) -> Dict[str, FlowMatch]:
+        """Match flows in one batch search; with ``confirm``, ambiguous ones go to the LLM.
+
+        LLM answers are remembered, so each ambiguous flow is asked about once; flows
+        the LLM gave no usable answer for stay unmatched and are asked about again.
+        """
+        known = set(self.index.names)
+        flows = list(dict.fromkeys(flows))
+        matches: Dict[str, FlowMatch] = {}
+        for flow in flows:
+            dataset = self.flow_map.get(flow, flow if flow in known else None)
+            if dataset in known:
+                matches[flow] = FlowMatch(flow, dataset, "map", 1.0, [(dataset, 1.0)])
+            elif flow in self.confirmed:
+                dataset = self.confirmed[flow]
+                matches[flow] = FlowMatch(flow, dataset, "llm" if dataset else None)
+
+        pending = [f for f in flows if f not in matches]
+        ambiguous = []
+        if pending:
+            indices, scores = self.index.search(pending, self.k)
+            for flow, row, row_scores in zip(pending, indices, scores):
+                candidates = [(self.index.names[i], float(s)) for i, s in zip(row, row_scores)]
+                if not candidates:  # empty index
+                    matches[flow] = FlowMatch(flow, None, None)
+                    continue
+                best, runner_up = candidates[0][1], (candidates[1][1] if len(candidates) > 1
+                                                     else 0.0)
+                clear = best >= self.min_score and best - runner_up >= self.margin
+                matches[flow] = FlowMatch(flow, candidates[0][0] if clear else None,
+                                          "embedding" if clear else None, best, candidates)
+                if not clear:
+                    ambiguous.append(flow)
+        if confirm and ambiguous:
+            self._confirm([matches[flow] for flow in ambiguous])
+        return matches
+
+    def _confirm(self, matches: List[FlowMatch]) -> None:
+        candidates = list(dict.fromkeys(name for m in matches for name, _ in m.candidates))
+        template = get_registry().get("harmonization/match_names.md")
+        static, dynamic = template.split(candidates="\n".join(f"- {c}" for c in candidates),
+                                         names=json.dumps([m.flow for m in matches],
+                                                          ensure_ascii=False))
+        response = self.cache.get_or_call(
+            self.model, static, dynamic,
+            lambda: complete(dynamic, self.model, cached_prefix=static))
+        try:
+            answer = parse_json_response(response)
+        except json.JSONDecodeError:
+            answer = None
+        chosen = answer.get("matches") if isinstance(answer, dict) else None
+        if not isinstance(chosen, dict):
+            self.cache.delete(self.model, static, dynamic)
+            return
+        for match in matches:
+            if match.flow not in chosen:
+                continue
+            dataset = chosen[match.flow]
+            if dataset is not None and dataset not in {name for name, _ in match.candidates}:
+                continue
+            match.dataset = dataset
+            match.method = "llm" if dataset is not None else None
+            self.confirmed[match.flow] = dataset
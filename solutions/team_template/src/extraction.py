@@ -1,18 +1,214 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from .artifacts import ParsedPDFStore
+from .batch import BatchResult, extract_many
+from .cache import ResponseCache
+from .chunking import Chunk, DocumentChunker, merge_extractions
+from .llm import acomplete, complete, parse_json_response
+from .llm_client import MODEL_ROUTES
+from .prompts import get_registry
+from .table_extraction import (TableExtraction, TableExtractionStats, TableExtractor,
+                               parse_module)
+from .telemetry import traced
+
+
+def load_prompt(relative_path: str) -> str:
+    """Read a prompt template from the team's prompts/ directory.
+
+    Templates come from the process-wide prompt registry, so only the first call (and a
+    periodic mtime check) touches the disk.
+    """
+    return get_registry().get(relative_path).text
+
+
 class EPDExtractor:
     """Base class for EPD data extraction with pre-implemented helpers."""
-    
-    def __init__(self, model_name: str = "claude-3-5-sonnet-latest"): # Currently latest is claude-3-5-sonnet-20241022 at time of writing
+
+    def __init__(self, model_name: str = MODEL_ROUTES["extraction"],
+                 cache: Optional[ResponseCache] = None,
+                 artifacts: Optional[ParsedPDFStore] = None,
+                 chunker: Optional[DocumentChunker] = None,
+                 table_extractor: Optional[TableExtractor] = None):
         self.model = model_name
         self.extraction_prompt = load_prompt("extraction/base_prompt.md")
-    
+        self.cache = cache if cache is not None else ResponseCache()
+        self.artifacts = artifacts if artifacts is not None else ParsedPDFStore()
+        # With a chunker, only the relevant parts of long documents are sent
+        self.chunker = chunker
+        # With a table extractor, well-formed impact tables are read without the LLM
+        self.table_extractor = table_extractor
+        self.table_stats = TableExtractionStats()
+
+    @traced("extraction.extract_from_pdf")
     def extract_from_pdf(self, pdf_path: str) -> dict:
         """Extract structured data from EPD PDF."""
         text = self._extract_text(pdf_path)
         tables = self._extract_tables(pdf_path)
         return self._process_content(text, tables)
-    
+
+    def extract_many(self,
+                     paths: Iterable[Union[str, Path]],
+                     concurrency: int = 8,
+                     workers: Optional[int] = None,
+                     checkpoint: Union[str, Path, None] = None) -> AsyncIterator[BatchResult]:
+        """Extract many PDFs concurrently, yielding results as they finish.
+
+        PDFs are parsed in a process pool and at most ``concurrency`` LLM calls are in
+        flight at once. See :func:`batch.extract_many` for the resume and retry options.
+        """
+        return extract_many(self, paths, concurrency=concurrency, workers=workers,
+                            checkpoint=checkpoint)
+
     def validate_extraction(self, data: dict) -> tuple[bool, list[str]]:
         """Validate extracted data against known patterns."""
         # Pre-implemented validation logic
         pass
 
+    def _extract_text(self, pdf_path: str) -> str:
+        """Return the text of every page, separated by blank lines.
+
+        The PDF is parsed once; later calls read the parsed-PDF store.
+        """
+        return self.artifacts.load(pdf_path).text
+
+    def _extract_tables(self, pdf_path: str) -> list[list[list[Optional[str]]]]:
+        """Return every table detected in the PDF as a list of rows."""
+        return self.artifacts.load(pdf_path).tables
+
+    @traced("extraction.process_content")
+    def _process_content(self, text: str, tables: list) -> dict:
+        """Ask the LLM to structure the document content using the extraction prompt.
+
+        Responses are served from the response cache when the same model has already
+        seen the same prompt and document content. With a chunker, the relevant chunks
+        are extracted concurrently and merged. With a table extractor, values it reads
+        from the tables are used directly and only the unresolved rows and tables go to
+        the LLM, together with the (chunked) document text.
+        """
+        fast = self._read_tables(tables)
+        if fast is not None and fast.complete:
+            return self._table_result(fast)
+        if fast is not None and fast.resolved_cells:
+            return self._table_result(fast, self._extract_llm(text, fast.unresolved_tables))
+        return self._extract_llm(text, tables)
+
+    def _extract_llm(self, text: str, tables: list) -> dict:
+        """The LLM's extraction of a document, chunk by chunk when a chunker is set."""
+        if self.chunker is None:
+            return self._process_part(text, tables)
+        chunks, stats = self._plan_chunks(text, tables)
+        with ThreadPoolExecutor(max_workers=self.chunker.max_concurrency) as pool:
+            results = list(pool.map(lambda c: self._process_part(c.text, c.tables), chunks))
+        return merge_extractions(results, stats)
+
+    @traced("extraction.process_content")
+    async def _aprocess_content(self, text: str, tables: list) -> dict:
+        """Async variant of :meth:`_process_content` used by batch extraction."""
+        fast = self._read_tables(tables)
+        if fast is not None and fast.complete:
+            return self._table_result(fast)
+        if fast is not None and fast.resolved_cells:
+            return self._table_result(fast,
+                                      await self._aextract_llm(text, fast.unresolved_tables))
+        return await self._aextract_llm(text, tables)
+
+    async def _aextract_llm(self, text: str, tables: list) -> dict:
+        """Async variant of :meth:`_extract_llm`."""
+        if self.chunker is None:
+            return await self._aprocess_part(text, tables)
+        chunks, stats = self._plan_chunks(text, tables)
+        semaphore = asyncio.Semaphore(self.chunker.max_concurrency)
+
+        async def extract(chunk: Chunk) -> dict:
+            async with semaphore:
+                return await self._aprocess_part(chunk.text, chunk.tables)
+
+        results = await asyncio.gather(*(extract(c) for c in chunks))
+        return merge_extractions(results, stats)
+
+    @traced("extraction.table_fast_path")
+    def _read_tables(self, tables: list) -> Optional[TableExtraction]:
+        """Run the table fast path, if configured, and count its hit rate."""
+        if self.table_extractor is None:
+            return None
+        result = self.table_extractor.extract(tables)
+        self.table_stats.add(result)
+        return result
+
+    def _table_result(self, fast: TableExtraction, llm_result: Optional[dict] = None) -> dict:
+        """Table values merged with the LLM's answer for the unresolved rows.
+
+        The document text sent along still shows the resolved tables, so the LLM may
+        extract their rows again under another spelling; its entries for a category and
+        module the tables already gave are dropped, matched through the table
+        extractor's synonym index.
+        """
+        parts = [{"impact_categories": fast.impact_categories, "metadata": {}}]
+        if llm_result:
+            index = self.table_extractor.index
+            covered = {(index.lookup(c["name"]), c.get("module"))
+                       for c in fast.impact_categories}
+            llm_result = dict(llm_result, impact_categories=[
+                c for c in llm_result.get("impact_categories") or []
+                if (index.lookup(str(c.get("name", ""))),
+                    parse_module(str(c.get("module") or ""))) not in covered])
+        result = merge_extractions(parts + ([llm_result] if llm_result else []))
+        result["metadata"]["table_fast_path"] = {
+            "resolved_cells": fast.resolved_cells,
+            "unresolved_cells": fast.unresolved_cells,
+            "hit_rate": fast.hit_rate,
+            "llm_fallback": llm_result is not None,
+        }
+        return result
+
+    def _plan_chunks(self, text: str, tables: list) -> Tuple[List[Chunk], Dict[str, int]]:
+        """Relevant chunks of a document and counts for the result's metadata."""
+        chunks = self.chunker.chunk(text, tables)
+        selected = self.chunker.select(chunks)
+        return selected, {
+            "total": len(chunks),
+            "sent": len(selected),
+            "tokens_sent": sum(c.tokens for c in selected),
+            "tokens_total": sum(c.tokens for c in chunks),
+        }
+
+    @traced("extraction.llm")
+    def _process_part(self, text: str, tables: list) -> dict:
+        content = self._format_content(text, tables)
+        return self._parse_response(content, self._complete(self.extraction_prompt, content))
+
+    @traced("extraction.llm")
+    async def _aprocess_part(self, text: str, tables: list) -> dict:
+        content = self._format_content(text, tables)
+        response = await self.cache.aget_or_call(
+            self.model, self.extraction_prompt, content,
+            lambda: acomplete(content, self.model, cached_prefix=self.extraction_prompt),
+        )
+        return self._parse_response(content, response)
+
+    @staticmethod
+    def _format_content(text: str, tables: list) -> str:
+        return f"EPD text:\n{text}\n\nTables:\n{json.dumps(tables)}"
+
+    def _parse_response(self, content: str, response: str) -> dict:
+        """Parse the model's JSON, evicting unparseable responses from the cache."""
+        try:
+            return parse_json_response(response)
+        except json.JSONDecodeError:
+            self.cache.delete(self.model, self.extraction_prompt, content)
+            raise
+
+    def _complete(self, prompt: str, content: str) -> str:
+        """Run prompt + content through the model, going through the response cache.
+
+        The prompt is sent as a cached prefix, so the provider only processes the
+        instructions once across documents.
+        """
+        return self.cache.get_or_call(
+            self.model, prompt, content,
+            lambda: complete(content, self.model, cached_prefix=prompt),
+        )
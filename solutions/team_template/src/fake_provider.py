@@ -0,0 +1,300 @@
+"""Local fake LLM provider for load tests.
+
+:class:`FakeProvider` answers the Anthropic Messages API (``/v1/messages``) and the
+OpenAI Chat Completions API (``/v1/chat/completions``) on a local port, with a
+configurable latency, its own requests-per-minute limit (answered with HTTP 429 and a
+``retry-after`` header, like the real providers) and optional overload errors. It speaks
+HTTP/1.1, so clients can keep connections alive, and counts connections, requests and
+the peak number of requests in flight, which is what a load test of
+:class:`~team_template.src.llm_client.LLMClient` needs to check.
+
+Anthropic Message Batches (``/v1/messages/batches``) are answered too: a job reports
+``in_progress`` on its first status check and ``ended`` afterwards. The tests and
+benchmarks use this one fake for every provider round trip.
+
+Point the SDKs at it with ``ANTHROPIC_BASE_URL`` / ``OPENAI_BASE_URL`` (OpenAI expects
+the ``/v1`` suffix), or pass ``base_urls`` to ``LLMClient``.
+
+Example:
+    >>> with FakeProvider(latency=0.2, requests_per_minute=600) as server:
+    ...     client = LLMClient(base_urls={"anthropic": server.url})
+    ...     asyncio.run(client.complete("Hello", "claude-3-5-haiku-latest"))
+
+Usage:
+    python -m team_template.src.fake_provider --port 8765 --latency 0.5 --rpm 600
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+DEFAULT_RESPONSE = json.dumps({
+    "impact_categories": [
+        {"name": "Global Warming Potential", "value": 12.3, "unit": "kg CO2 eq."}
+    ],
+    "metadata": {}
+})
+
+
+def _prompt_text(body: dict) -> str:
+    """Concatenated text of the request's messages, whichever API shape it has."""
+    parts = []
+    for message in body.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content)
+    return "\n".join(parts)
+
+
+class FakeProvider:
+    """Serve canned completions with provider-like latency, rate limits and errors.
+
+    Args:
+        response_text: Text returned as the model's answer
+        latency: Seconds to wait before answering
+        requests_per_minute: Requests accepted per minute before answering HTTP 429
+            (0 disables the limit)
+        burst: Requests accepted at once before the limit applies; default one second's
+            worth
+        fail_every: Answer every n-th accepted request with HTTP 529 "overloaded"
+            (0 disables)
+        rate_limit_every: Answer every n-th request with HTTP 429 and ``retry-after: 0``,
+            independent of ``requests_per_minute`` (0 disables)
+        respond: Builds the answer from the request body instead of ``response_text``
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one
+    """
+
+    def __init__(self, response_text: str = DEFAULT_RESPONSE, latency: float = 0.0,
+                 requests_per_minute: float = 0, burst: Optional[float] = None,
+                 fail_every: int = 0, rate_limit_every: int = 0,
+                 respond: Optional[Callable[[dict], str]] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.response_text = response_text
+        self.latency = latency
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst if burst is not None else max(self.rate, 1.0)
+        self.fail_every = fail_every
+        self.rate_limit_every = rate_limit_every
+        self.respond = respond
+        self.address = (host, port)
+        self.stats: Counter = Counter()
+        self.prompts: Counter = Counter()
+        self.batches: Dict[str, dict] = {}
+        self._in_flight = 0
+        self._allowance = self.burst
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "server is not running"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _admit(self) -> Optional[float]:
+        """Take one request from the rate limit; returns the wait if there is none left."""
+        if self.rate_limit_every and self.stats["requests"] % self.rate_limit_every == 0:
+            return 0.0
+        if not self.rate:
+            return None
+        now = time.monotonic()
+        self._allowance = min(self.burst, self._allowance + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._allowance < 1:
+            return (1 - self._allowance) / self.rate
+        self._allowance -= 1
+        return None
+
+    def start(self) -> "FakeProvider":
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self) -> None:
+                super().setup()
+                with provider._lock:
+                    provider.stats["connections"] += 1
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path.startswith("/v1/messages/batches"):
+                    self._send(200, provider._create_batch(body))
+                    return
+                openai = self.path.rstrip("/").endswith("/chat/completions")
+                with provider._lock:
+                    provider.stats["requests"] += 1
+                    wait = provider._admit()
+                    if wait is not None:
+                        provider.stats["rate_limited"] += 1
+                    else:
+                        provider.stats["accepted"] += 1
+                        provider.prompts[_prompt_text(body)] += 1
+                        failed = (provider.fail_every
+                                  and provider.stats["accepted"] % provider.fail_every == 0)
+                        provider.stats["failed"] += bool(failed)
+                        provider._in_flight += 1
+                        provider.stats["peak_in_flight"] = max(
+                            provider.stats["peak_in_flight"], provider._in_flight)
+                if wait is not None:
+                    self._error(429, "rate_limit_error", "rate limit exceeded", openai,
+                                {"retry-after": f"{wait:.3f}"})
+                    return
+                try:
+                    time.sleep(provider.latency)
+                    if failed:
+                        self._error(529, "overloaded_error", "overloaded", openai)
+                    else:
+                        text = (provider.respond(body) if provider.respond
+                                else provider.response_text)
+                        self._send(200, provider._openai(body, text) if openai
+                                   else provider._anthropic(body, text))
+                finally:
+                    with provider._lock:
+                        provider._in_flight -= 1
+
+            def do_GET(self) -> None:
+                parts = self.path.strip("/").split("/")  # v1/messages/batches/<id>[/results]
+                batch = provider.batches.get(parts[3]) if len(parts) >= 4 else None
+                if batch is None:
+                    self._error(404, "not_found_error", self.path, openai=False)
+                elif parts[-1] == "results":
+                    lines = "\n".join(json.dumps(r) for r in batch["results"]).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/binary")
+                    self.send_header("Content-Length", str(len(lines)))
+                    self.end_headers()
+                    self.wfile.write(lines)
+                else:
+                    self._send(200, provider._batch_status(batch))
+
+            def _error(self, status: int, kind: str, message: str, openai: bool,
+                       headers: Optional[Dict[str, str]] = None) -> None:
+                payload = ({"error": {"type": kind, "message": message}} if openai else
+                           {"type": "error", "error": {"type": kind, "message": message}})
+                self._send(status, payload, headers)
+
+            def _send(self, status: int, payload: dict,
+                      headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(self.address, Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeProvider":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _anthropic(self, body: dict, text: str) -> dict:
+        return {
+            "id": f"msg_{self.stats['requests']}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(_prompt_text(body)) // 4 + 1,
+                      "output_tokens": len(text) // 4 + 1},
+        }
+
+    def _create_batch(self, body: dict) -> dict:
+        with self._lock:
+            batch_id = f"msgbatch_{len(self.batches) + 1}"
+            self.batches[batch_id] = batch = {"id": batch_id, "checks": 0, "results": []}
+        for request in body["requests"]:
+            params = request["params"]
+            text = self.respond(params) if self.respond else self.response_text
+            batch["results"].append({"custom_id": request["custom_id"], "result": {
+                "type": "succeeded", "message": self._anthropic(params, text)}})
+        return self._batch_status(batch, count=False)
+
+    def _batch_status(self, batch: dict, count: bool = True) -> dict:
+        batch["checks"] += count
+        ended = batch["checks"] > 1
+        n = len(batch["results"])
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0 if ended else n, "succeeded": n if ended else 0,
+                               "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2024-01-01T00:00:00Z",
+            "expires_at": "2024-01-02T00:00:00Z",
+            "ended_at": "2024-01-01T01:00:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch['id']}/results"
+                           if ended else None,
+        }
+
+    def _openai(self, body: dict, text: str) -> dict:
+        prompt_tokens, completion_tokens = len(_prompt_text(body)) // 4 + 1, len(text) // 4 + 1
+        return {
+            "id": f"chatcmpl-{self.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point: serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve a fake LLM provider for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per answer")
+    parser.add_argument("--rpm", type=float, default=0, help="Requests per minute (0: no limit)")
+    parser.add_argument("--fail-every", type=int, default=0,
+                        help="Answer every n-th request with HTTP 529")
+    args = parser.parse_args(argv)
+
+    server = FakeProvider(latency=args.latency, requests_per_minute=args.rpm,
+                          fail_every=args.fail_every, host=args.host, port=args.port).start()
+    print(f"Fake provider on {server.url} (ANTHROPIC_BASE_URL={server.url}, "
+          f"OPENAI_BASE_URL={server.url}/v1); Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(dict(server.stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
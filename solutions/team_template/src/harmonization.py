@@ -0,0 +1,348 @@
+"""Nomenclature harmonisation of impact category and flow names.
+
+The same quantity shows up as ``"Global Warming"``, ``"GWP"``, ``"GWP-total"`` or
+``"global_warming_potential"`` depending on the EPD, template or tool it came from.
+:class:`HarmonizationIndex` maps raw names to a fixed set of canonical names in three
+local stages, cheapest first:
+
+1. exact: a hash lookup of every known spelling, ignoring case
+2. token: lower-cased alphanumeric tokens, sorted, without filler words ("of", "total")
+3. n-gram: cosine similarity of character 3-gram TF-IDF vectors against every known
+   spelling, as one sparse matrix product per block of names. Only spellings with the
+   same qualifiers (fossil, non-fossil, renewable, LULUC, ...) are candidates, so
+   "GWP fossil" never falls back to total GWP and "ADP non-fossil" never to ADP fossil
+
+:meth:`HarmonizationIndex.resolve_many` de-duplicates its input first, so batches of
+millions of names cost one lookup per distinct name. Names none of the stages resolves
+can be sent to an LLM with :meth:`HarmonizationIndex.harmonize`; its answers are added
+to the exact and token indexes, so each unknown spelling is asked about once, and
+:meth:`HarmonizationIndex.save` keeps them for the next run.
+
+Units are harmonised separately by :class:`units.UnitRegistry`.
+
+Example:
+    >>> index = HarmonizationIndex.for_categories()
+    >>> index.lookup("Global Warming")
+    'global_warming_potential'
+    >>> index.resolve_many(names)["method"].value_counts()
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .llm import complete, parse_json_response
+from .llm_client import MODEL_ROUTES
+from .matrix_lca import FLOW_TO_BACKGROUND
+from .prompts import get_registry
+from .table_extraction import CATEGORY_SYNONYMS
+
+NGRAM = 3
+FILLER_TOKENS = frozenset({"the", "of", "and", "for", "in", "total", "potential", "eq"})
+# Words that tell indicators of one quantity apart; see qualifiers()
+QUALIFIER_TOKENS = frozenset({"fossil", "biogenic", "luluc", "renewable", "elements",
+                              "freshwater", "marine", "terrestrial"})
+BLOCK_SIZE = 20_000
+LLM_BATCH_SIZE = 100
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(name: str) -> str:
+    """``"GWP-total [kg CO2 eq.]"`` -> ``"gwp total kg co2 eq"``."""
+    return _NON_ALNUM.sub(" ", str(name).lower()).strip()
+
+
+def token_key(name: str) -> str:
+    """Order-insensitive key of a name's tokens without filler words."""
+    tokens = set(normalize_name(name).split()) - FILLER_TOKENS
+    return " ".join(sorted(tokens))
+
+
+def qualifiers(name: str) -> frozenset:
+    """Qualifier words of a name, negated ones as ``"non <word>"``.
+
+    ``"ADP - non-fossil resources"`` -> ``{"non fossil"}``, ``"Land use and land use
+    change"`` -> ``{"luluc"}``.
+    """
+    text = normalize_name(name)
+    tokens = text.split()
+    found = {"luluc"} if "land use change" in text else set()
+    for i, token in enumerate(tokens):
+        if token in QUALIFIER_TOKENS:
+            found.add(f"non {token}" if i and tokens[i - 1] == "non" else token)
+        elif token.startswith("non") and token[3:] in QUALIFIER_TOKENS:
+            found.add(f"non {token[3:]}")
+    return frozenset(found)
+
+
+def _ngrams(text: str) -> List[str]:
+    padded = f" {text} "
+    return [padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)]
+
+
+@dataclass(frozen=True)
+class Match:
+    """How a raw name was resolved.
+
+    Attributes:
+        name: The raw name
+        canonical: Canonical name, or None if unresolved
+        method: ``"exact"``, ``"token"``, ``"ngram"``, ``"llm"`` or None
+        score: Similarity for n-gram matches, 1.0 for the other methods
+    """
+    name: str
+    canonical: Optional[str]
+    method: Optional[str]
+    score: float
+
+
+class HarmonizationIndex:
+    """Resolves raw names to canonical names without a network call where possible."""
+
+    def __init__(self, canonical: Iterable[str],
+                 synonyms: Optional[Dict[str, str]] = None,
+                 min_similarity: float = 0.6,
+                 model: str = MODEL_ROUTES["matching"]):
+        """Build the indexes.
+
+        Args:
+            canonical: The names every raw name is mapped to
+            synonyms: Known spellings -> canonical name
+            min_similarity: Lowest n-gram cosine similarity accepted as a match; only
+                spellings with the same :func:`qualifiers` are compared
+            model: Model asked about names no index resolves
+        """
+        self.canonical = list(dict.fromkeys(canonical))
+        self._canonical_set = set(self.canonical)
+        self.min_similarity = min_similarity
+        self.model = model
+        self.learned: Dict[str, str] = {}
+        self.unmatched: set = set()
+        self._exact: Dict[str, str] = {}
+        self._tokens: Dict[str, str] = {}
+        self._aliases: List[Tuple[str, str]] = []
+        self._ngram_matrix: Optional[sparse.csr_matrix] = None
+        for name in self.canonical:
+            self._add(name, name)
+        for name, target in (synonyms or {}).items():
+            self._add(name, target)
+
+    @classmethod
+    def for_categories(cls, **kwargs) -> "HarmonizationIndex":
+        """Index of impact categories, keyed as in ``validation.normalize_category``."""
+        synonyms = {}
+        for key, (display, words) in CATEGORY_SYNONYMS.items():
+            synonyms.update({word: key for word in (display, *words)})
+        return cls(CATEGORY_SYNONYMS, synonyms, **kwargs)
+
+    @classmethod
+    def for_flows(cls, flows: Sequence[str],
+                  flow_map: Optional[Dict[str, str]] = None, **kwargs) -> "HarmonizationIndex":
+        """Index of background datasets, with template input names as synonyms."""
+        flow_map = FLOW_TO_BACKGROUND if flow_map is None else flow_map
+        return cls(flows, {k: v for k, v in flow_map.items() if v in set(flows)}, **kwargs)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "HarmonizationIndex":
+        """Index saved by :meth:`save`, including what the LLM resolved."""
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+        index = cls(state["canonical"], state["synonyms"], **kwargs)
+        index.learned = dict(state.get("learned", {}))
+        for name, target in index.learned.items():
+            index._add(name, target)
+        return index
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write canonical names, synonyms and learned spellings as JSON."""
+        synonyms = {name: target for name, target in self._aliases
+                    if name != target and name not in self.learned}
+        Path(path).write_text(json.dumps({
+            "canonical": self.canonical, "synonyms": synonyms, "learned": self.learned,
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def add(self, name: str, canonical: str) -> None:
+        """Teach the index a spelling, e.g. one an LLM resolved.
+
+        Raises:
+            KeyError: If ``canonical`` is not one of the canonical names.
+        """
+        if canonical not in self._canonical_set:
+            raise KeyError(f"Unknown canonical name: {canonical}")
+        self.learned[name] = canonical
+        self.unmatched.discard(name)
+        self._add(name, canonical)
+
+    def _add(self, name: str, target: str) -> None:
+        self._exact[name.strip().casefold()] = target
+        self._tokens.setdefault(token_key(name), target)
+        self._aliases.append((name, target))
+        self._ngram_matrix = None  # rebuilt on the next n-gram lookup
+
+    def lookup(self, name: str, fuzzy: bool = True) -> Optional[str]:
+        """Canonical name for one raw name, or None; never calls an LLM."""
+        return self.resolve(name, fuzzy).canonical
+
+    def resolve(self, name: str, fuzzy: bool = True) -> Match:
+        """Resolve one raw name through the exact, token and (if ``fuzzy``) n-gram
+        indexes."""
+        found = self._resolve_indexed(name)
+        if found is not None:
+            return Match(name, *found)
+        if not fuzzy:
+            return Match(name, None, None, 0.0)
+        canonical, score = self._nearest([name])
+        if canonical[0] is None:
+            return Match(name, None, None, 0.0)
+        return Match(name, canonical[0], "ngram", float(score[0]))
+
+    def _resolve_indexed(self, name: str) -> Optional[Tuple[str, str, float]]:
+        target = self._exact.get(name.strip().casefold())
+        if target is not None:
+            return target, "exact", 1.0
+        target = self._tokens.get(token_key(name))
+        if target is not None:
+            return target, "token", 1.0
+        return None
+
+    def resolve_many(self, names: Iterable[Optional[str]]) -> pd.DataFrame:
+        """Resolve a batch of raw names.
+
+        Returns:
+            DataFrame aligned with ``names`` with columns ``name``, ``canonical``,
+            ``method`` and ``score``; ``canonical`` and ``method`` are missing (NA)
+            for unresolved and missing names
+        """
+        names = pd.Series(list(names) if not isinstance(names, pd.Series) else names,
+                          dtype=object)
+        codes, unique = pd.factorize(names)
+        canonical = np.full(len(unique) + 1, None, dtype=object)
+        method = np.full(len(unique) + 1, None, dtype=object)
+        score = np.zeros(len(unique) + 1)
+
+        pending = []
+        for i, name in enumerate(unique):
+            found = self._resolve_indexed(str(name))
+            if found is None:
+                pending.append(i)
+            else:
+                canonical[i], method[i], score[i] = found
+        if pending:
+            nearest, similarity = self._nearest([str(unique[i]) for i in pending])
+            hit = np.array([c is not None for c in nearest], dtype=bool)
+            rows = np.asarray(pending)[hit]
+            canonical[rows] = np.asarray(nearest, dtype=object)[hit]
+            method[rows] = "ngram"
+            score[rows] = similarity[hit]
+
+        return pd.DataFrame({"name": names.to_numpy(), "canonical": canonical[codes],
+                             "method": method[codes], "score": score[codes]})
+
+    def harmonize(self, names: Iterable[Optional[str]], use_llm: bool = True,
+                  batch_size: int = LLM_BATCH_SIZE) -> pd.DataFrame:
+        """:meth:`resolve_many`, then ask the LLM about the distinct unresolved names.
+
+        Names the LLM maps to a canonical name are added to the index (method
+        ``"llm"``); names it cannot map are remembered in ``unmatched`` and not asked
+        about again.
+        """
+        result = self.resolve_many(names)
+        if not use_llm:
+            return result
+        open_names = result.loc[result["canonical"].isna() & result["name"].notna(), "name"]
+        tail = [n for n in pd.unique(open_names) if n not in self.unmatched]
+        for start in range(0, len(tail), batch_size):
+            self._ask_llm([str(n) for n in tail[start:start + batch_size]])
+
+        answered = (result["canonical"].isna() & result["name"].isin(self.learned)).to_numpy()
+        canonical = result["canonical"].to_numpy(copy=True)
+        method = result["method"].to_numpy(copy=True)
+        canonical[answered] = result["name"][answered].map(self.learned).to_numpy()
+        method[answered] = "llm"
+        return result.assign(canonical=canonical, method=method,
+                             score=np.where(answered, 1.0, result["score"]))
+
+    def _ask_llm(self, names: List[str]) -> None:
+        template = get_registry().get("harmonization/match_names.md")
+        static, dynamic = template.split(("candidates",),
+                                         candidates="\n".join(f"- {c}" for c in self.canonical),
+                                         names=json.dumps(names, ensure_ascii=False))
+        answer = parse_json_response(complete(dynamic, self.model, cached_prefix=static))
+        matches = answer.get("matches", {}) if isinstance(answer, dict) else {}
+        for name in names:
+            target = matches.get(name)
+            if isinstance(target, str) and target in self._canonical_set:
+                self.add(name, target)
+            else:
+                self.unmatched.add(name)
+
+    def _nearest(self, names: Sequence[str]) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Best n-gram match per name above ``min_similarity`` among the spellings
+        with the same qualifiers."""
+        if self._ngram_matrix is None:
+            self._build_ngrams()
+        targets: List[Optional[str]] = []
+        scores = np.zeros(len(names))
+        for start in range(0, len(names), BLOCK_SIZE):
+            block = names[start:start + BLOCK_SIZE]
+            similarity = (self._vectorize(block) @ self._ngram_matrix.T).tocoo()
+            signature = np.array([self._signatures.get(qualifiers(n), -1) for n in block])
+            same = signature[similarity.row] == self._alias_signatures[similarity.col]
+            similarity = sparse.csr_matrix(
+                (similarity.data[same], (similarity.row[same], similarity.col[same])),
+                shape=similarity.shape)
+            best = np.asarray(similarity.argmax(axis=1)).ravel()
+            best_score = similarity.max(axis=1).toarray().ravel()
+            scores[start:start + len(block)] = best_score
+            targets += [self._alias_targets[b] if s >= self.min_similarity else None
+                        for b, s in zip(best, best_score)]
+        return targets, scores
+
+    def _build_ngrams(self) -> None:
+        aliases = dict(self._aliases)
+        texts = [normalize_name(a) for a in aliases]
+        self._alias_targets = list(aliases.values())
+        self._signatures: Dict[frozenset, int] = {}
+        self._alias_signatures = np.array(
+            [self._signatures.setdefault(qualifiers(a), len(self._signatures)) for a in aliases],
+            dtype=np.int64)
+        self._vocabulary: Dict[str, int] = {}
+        document_frequency: List[int] = []
+        for text in texts:
+            for gram in set(_ngrams(text)):
+                column = self._vocabulary.setdefault(gram, len(document_frequency))
+                if column == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[column] += 1
+        self._idf = np.log((1 + len(texts)) / (1 + np.asarray(document_frequency))) + 1.0
+        self._unknown_idf = np.log(1 + len(texts)) + 1.0
+        self._ngram_matrix = self._vectorize(texts, normalized=True)
+
+    def _vectorize(self, names: Sequence[str], normalized: bool = False) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF rows; n-grams outside the vocabulary still count in the norm."""
+        rows, columns, weights = [], [], []
+        for row, name in enumerate(names):
+            counts: Dict[str, int] = {}
+            for gram in _ngrams(name if normalized else normalize_name(name)):
+                counts[gram] = counts.get(gram, 0) + 1
+            norm = 0.0
+            start = len(weights)
+            for gram, count in counts.items():
+                column = self._vocabulary.get(gram)
+                weight = count * (self._unknown_idf if column is None else self._idf[column])
+                norm += weight * weight
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    weights.append(weight)
+            if norm:
+                scale = norm ** -0.5
+                weights[start:] = [w * scale for w in weights[start:]]
+        return sparse.csr_matrix((weights, (rows, columns)),
+                                 shape=(len(names), len(self._vocabulary)))
@@ -0,0 +1,363 @@
+"""Inference of missing inventory amounts and impact values.
+
+Missing numbers are filled in stages, cheapest and most reliable first:
+
+1. mass balance: raw material rows whose notes give a share of the total raw material
+   weight ("55% of total raw material weight") are split from the known total, or from
+   the rows of the same process that are known
+2. analogs: the ``k`` reference inventories or EPDs closest on the values that *are*
+   known; the median of their values is used and their spread is the uncertainty
+3. LLM: whatever is still missing is estimated in batched requests
+
+Every imputed value carries its provenance: inventory tables get an ``Imputation`` and an
+``Imputation uncertainty`` column (relative standard deviation), impact categories an
+``"imputed": {"method", "uncertainty", ...}`` entry. ``DataQualityChecker`` lowers its
+confidence for imputed values according to :data:`IMPUTATION_CONFIDENCE`.
+
+Impact values are compared per category and life cycle module, with category spellings
+resolved through :class:`harmonization.HarmonizationIndex`: a reported module D value
+does not make a missing A1-A3 value look known, and "GWP" counts as global warming.
+
+Example:
+    >>> engine = ImputationEngine(reference_inventories=past_inventories)
+    >>> filled, report = engine.impute_inventory(pd.read_csv(ALLOCATION_TEMPLATE))
+    >>> report.summary()
+    {'mass_balance': 4, 'analog': 3, 'llm': 2, 'unresolved': 0}
+"""
+
+import json
+import re
+import warnings
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import ResponseCache
+from .harmonization import HarmonizationIndex
+from .llm import complete, parse_json_response
+from .prompts import get_registry
+from .table_extraction import parse_module
+from .validation import DEFAULT_QUALITY_RULES, IMPUTATION_CONFIDENCE, normalize_category
+
+AMOUNT = "Amount per m2"
+IMPUTATION = "Imputation"
+UNCERTAINTY = "Imputation uncertainty"
+
+# Relative standard deviation assumed for mass balance shares
+MASS_BALANCE_UNCERTAINTY = 0.05
+MASS_UNITS = {"g": 1e-3, "kg": 1.0, "t": 1e3}
+LLM_BATCH_SIZE = 25
+
+_SHARE = re.compile(r"(\d+(?:\.\d+)?)\s*%\s*of total (?:raw material )?(?:weight|mass)",
+                    re.IGNORECASE)
+
+
+@dataclass
+class ImputationReport:
+    """What was imputed and how."""
+    methods: Counter = field(default_factory=Counter)
+    unresolved: List[str] = field(default_factory=list)
+    llm_calls: int = 0
+
+    def summary(self) -> Dict[str, int]:
+        return {**{m: self.methods[m] for m in IMPUTATION_CONFIDENCE},
+                "unresolved": len(self.unresolved), "llm_calls": self.llm_calls}
+
+
+def mass_balance(inventory: pd.DataFrame,
+                 total_mass: Optional[float] = None) -> Tuple[pd.Series, pd.Series]:
+    """Amounts implied by the raw material shares in the notes.
+
+    Per process, the total is taken from the rows whose amount is known
+    (``sum(known amounts) / sum(their shares)``), otherwise from ``total_mass``, which
+    defaults to the heaviest product output in a mass unit (the melted slab in the
+    rock wool template).
+
+    Returns:
+        ``(amounts, filled)``: amounts with the implied values filled in, and a mask of
+        the rows that were filled
+    """
+    amounts = pd.to_numeric(inventory[AMOUNT], errors="coerce")
+    notes = inventory.get("Notes", pd.Series("", index=inventory.index)).fillna("")
+    shares = pd.to_numeric(notes.str.extract(_SHARE, expand=False), errors="coerce") / 100
+    if total_mass is None:
+        units = inventory["Unit"].fillna("").str.strip()
+        is_output = inventory["Output"].notna() & units.isin(MASS_UNITS.keys())
+        masses = amounts[is_output] * units[is_output].map(MASS_UNITS)
+        total_mass = masses.max() if masses.notna().any() else np.nan
+
+    process = inventory["Process"]
+    known = amounts.notna() & shares.notna()
+    known_amount = amounts.where(known, 0.0).groupby(process).transform("sum")
+    known_share = shares.where(known, 0.0).groupby(process).transform("sum")
+    total = (known_amount / known_share).where(known_share > 0, total_mass)
+    filled = amounts.isna() & shares.notna() & total.notna()
+    return amounts.where(~filled, shares * total), filled
+
+
+def knn_impute(targets: pd.DataFrame, references: pd.DataFrame,
+               k: int = 3) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Fill the NaNs of ``targets`` from the ``k`` closest rows of ``references``.
+
+    Rows are compared on the columns both have values for, after dividing each column by
+    its median absolute reference value, so columns of different magnitude weigh alike.
+    References without a value in the column being filled are skipped.
+
+    Returns:
+        ``(values, uncertainty)`` aligned with ``targets``; NaN where nothing was
+        imputed. The uncertainty is the neighbours' standard deviation relative to
+        their median.
+    """
+    columns = [c for c in targets.columns if c in references.columns]
+    values = pd.DataFrame(np.nan, index=targets.index, columns=targets.columns)
+    uncertainty = values.copy()
+    if not columns or references.empty:
+        return values, uncertainty
+
+    ref = references[columns].to_numpy(dtype=np.float64)
+    tgt = targets[columns].to_numpy(dtype=np.float64)
+    scale = np.nanmedian(np.abs(ref), axis=0)
+    scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+    ref_obs, tgt_obs = ~np.isnan(ref), ~np.isnan(tgt)
+    ref_z, tgt_z = np.nan_to_num(ref / scale), np.nan_to_num(tgt / scale)
+
+    # Mean squared difference over the shared columns, (targets x references)
+    shared = tgt_obs.astype(np.float64) @ ref_obs.T.astype(np.float64)
+    squared = ((tgt_z ** 2) @ ref_obs.T + tgt_obs @ (ref_z ** 2).T - 2 * tgt_z @ ref_z.T)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distance = np.where(shared > 0, squared / shared, np.inf)
+
+    for j, column in enumerate(columns):
+        rows = np.flatnonzero(~tgt_obs[:, j])
+        candidates = np.flatnonzero(ref_obs[:, j])
+        if not len(rows) or not len(candidates):
+            continue
+        n = min(k, len(candidates))
+        d = distance[np.ix_(rows, candidates)]
+        nearest = np.argpartition(d, n - 1, axis=1)[:, :n]
+        usable = np.isfinite(np.take_along_axis(d, nearest, axis=1))
+        neighbours = np.where(usable, ref[candidates[nearest], j], np.nan)
+        ok = usable.any(axis=1)
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows stay NaN
+            median = np.nanmedian(neighbours, axis=1)
+            spread = np.nanstd(neighbours, axis=1) / np.abs(median)
+        values.iloc[rows[ok], targets.columns.get_loc(column)] = median[ok]
+        uncertainty.iloc[rows[ok], targets.columns.get_loc(column)] = np.where(
+            np.isfinite(spread[ok]), spread[ok], 1.0)
+    return values, uncertainty
+
+
+class ImputationEngine:
+    """Fills missing inventory amounts and impact values, cheapest estimator first."""
+
+    def __init__(self, reference_inventories: Optional[pd.DataFrame] = None,
+                 reference_epds: Optional[Dict[str, Dict]] = None,
+                 k: int = 3, use_llm: bool = True,
+                 model: str = "claude-3-5-sonnet-latest",
+                 cache: Optional[ResponseCache] = None,
+                 harmonizer: Optional[HarmonizationIndex] = None):
+        """Configure the estimators.
+
+        Args:
+            reference_inventories: Past inventories in long form with columns
+                ``product``, ``Input`` and ``Amount per m2``, used as analogs
+            reference_epds: Extraction results of comparable EPDs, used as analogs for
+                impact values
+            k: Analogs per imputed value
+            use_llm: Estimate values the other stages leave missing with an LLM
+            model: Model for those estimates
+            cache: Response cache for the LLM requests; a default on-disk cache is used
+                when omitted
+            harmonizer: Resolves impact category spellings; default
+                :meth:`HarmonizationIndex.for_categories`
+        """
+        self.k = k
+        self.use_llm = use_llm
+        self.model = model
+        self.cache = cache if cache is not None else ResponseCache()
+        self.harmonizer = harmonizer or HarmonizationIndex.for_categories()
+        self.reference_inventories = None
+        if reference_inventories is not None:
+            self.reference_inventories = reference_inventories.pivot_table(
+                index="product", columns="Input", values=AMOUNT, aggfunc="mean")
+        self.reference_impacts = None
+        if reference_epds:
+            self.reference_impacts = _impact_matrix(reference_epds, self._category_key)
+
+    def impute_inventory(self, inventory: pd.DataFrame, total_mass: Optional[float] = None
+                         ) -> Tuple[pd.DataFrame, ImputationReport]:
+        """Fill the blank ``Amount per m2`` of the input rows of an allocation table.
+
+        Returns:
+            ``(inventory, report)``; the copy has amounts filled in and the
+            ``Imputation`` and ``Imputation uncertainty`` provenance columns
+        """
+        report = ImputationReport()
+        result = inventory.copy()
+        amounts, filled = mass_balance(result, total_mass)
+        method = pd.Series(np.where(filled, "mass_balance", None), index=result.index,
+                           dtype=object)
+        spread = pd.Series(np.where(filled, MASS_BALANCE_UNCERTAINTY, np.nan),
+                           index=result.index)
+
+        is_input = result["Input"].notna() & (result["Input"].astype(str).str.strip() != "")
+        missing = is_input & amounts.isna()
+        if missing.any() and self.reference_inventories is not None:
+            known = amounts[is_input].groupby(result.loc[is_input, "Input"]).sum(min_count=1)
+            target = known.to_frame().T.reindex(
+                columns=self.reference_inventories.columns.union(known.index))
+            values, uncertainty = knn_impute(target, self.reference_inventories, self.k)
+            estimates = result.loc[missing, "Input"].map(values.iloc[0])
+            found = estimates.dropna().index
+            amounts[found] = estimates[found]
+            method[found] = "analog"
+            spread[found] = result.loc[found, "Input"].map(uncertainty.iloc[0])
+            missing = is_input & amounts.isna()
+
+        if missing.any() and self.use_llm:
+            context = {f"{r.Process} / {r.Input}": a for r, a in
+                       zip(result[is_input].itertuples(index=False), amounts[is_input])
+                       if pd.notna(a)}
+            rows = {str(i): {"process": result.at[i, "Process"], "input": result.at[i, "Input"],
+                             "unit": result.at[i, "Unit"],
+                             "notes": result.at[i, "Notes"] if "Notes" in result else None}
+                    for i in result.index[missing]}
+            row_of = {str(i): i for i in result.index[missing]}
+            for key, (value, uncertainty) in self._ask_llm(rows, context, report).items():
+                i = row_of[key]
+                amounts[i], method[i], spread[i] = value, "llm", uncertainty
+
+        result[AMOUNT] = amounts
+        result[IMPUTATION] = method
+        result[UNCERTAINTY] = spread
+        report.methods.update(method.dropna())
+        report.unresolved = list(result.loc[is_input & amounts.isna(), "Input"])
+        return result, report
+
+    def impute_impacts(self, epds: Dict[str, Dict],
+                       categories: Optional[Sequence[Tuple[str, str]]] = None
+                       ) -> Tuple[Dict[str, Dict], ImputationReport]:
+        """Fill missing impact values of extraction results.
+
+        Categories listed without a usable value are filled in place, per life cycle
+        module; ``categories`` (``(name, unit)`` pairs, default: the required categories
+        of the quality rules) that an EPD does not report in any spelling or module are
+        added without a module.
+
+        Returns:
+            ``(epds, report)``; imputed categories carry an ``"imputed"`` entry
+        """
+        categories = categories or [(name, unit) for name, unit, required, *_ in
+                                    DEFAULT_QUALITY_RULES if required]
+        report = ImputationReport()
+        result = {epd_id: {**data, "impact_categories": [dict(c) for c in
+                                                          data.get("impact_categories", [])]}
+                  for epd_id, data in epds.items()}
+        for data in result.values():
+            present = {self._category_key(c.get("name", "")) for c in data["impact_categories"]}
+            data["impact_categories"] += [{"name": name, "value": None, "unit": unit}
+                                          for name, unit in categories
+                                          if self._category_key(name) not in present]
+
+        matrix = _impact_matrix(result, self._category_key)
+        open_cells = [(epd_id, c) for epd_id, data in result.items()
+                      for c in data["impact_categories"] if _number(c.get("value")) is None]
+        if open_cells and self.reference_impacts is not None:
+            values, uncertainty = knn_impute(matrix, self.reference_impacts, self.k)
+            for epd_id, category in open_cells:
+                key = (self._category_key(category.get("name", "")), _module(category))
+                if key in values.columns and pd.notna(values.at[epd_id, key]):
+                    _mark(category, values.at[epd_id, key], "analog",
+                          uncertainty.at[epd_id, key], report)
+            open_cells = [(e, c) for e, c in open_cells if _number(c.get("value")) is None]
+
+        if open_cells and self.use_llm:
+            rows = {f"{epd_id}#{i}": {"epd": epd_id, "category": c.get("name"),
+                                      "module": c.get("module"), "unit": c.get("unit")}
+                    for i, (epd_id, c) in enumerate(open_cells)}
+            context = {epd_id: [{"category": c["name"], "module": c.get("module"),
+                                 "value": c["value"], "unit": c.get("unit")}
+                                for c in data["impact_categories"]
+                                if _number(c.get("value")) is not None]
+                       for epd_id, data in result.items()
+                       if any(e == epd_id for e, _ in open_cells)}
+            estimates = self._ask_llm(rows, context, report)
+            for i, (epd_id, category) in enumerate(open_cells):
+                if f"{epd_id}#{i}" in estimates:
+                    value, uncertainty = estimates[f"{epd_id}#{i}"]
+                    _mark(category, value, "llm", uncertainty, report)
+
+        report.unresolved = [f"{epd_id}: {c.get('name')}" for epd_id, data in result.items()
+                             for c in data["impact_categories"]
+                             if _number(c.get("value")) is None]
+        return result, report
+
+    def _category_key(self, name: str) -> str:
+        """Canonical category of a reported name, see ``DataQualityChecker``."""
+        return self.harmonizer.lookup(name) or normalize_category(name)
+
+    def _ask_llm(self, rows: Dict[str, Dict], context: Dict,
+                 report: ImputationReport) -> Dict[str, Tuple[float, float]]:
+        """LLM estimates ``{row id: (value, relative uncertainty)}`` in batches."""
+        template = get_registry().get("imputation/estimate_missing.md")
+        estimates: Dict[str, Tuple[float, float]] = {}
+        ids = list(rows)
+        for start in range(0, len(ids), LLM_BATCH_SIZE):
+            batch = {i: rows[i] for i in ids[start:start + LLM_BATCH_SIZE]}
+            static, dynamic = template.split(
+                ("context",), context=json.dumps(context, sort_keys=True, default=str),
+                rows=json.dumps(batch, sort_keys=True, default=str))
+            response = self.cache.get_or_call(
+                self.model, static, dynamic,
+                lambda s=static, d=dynamic: complete(d, self.model, cached_prefix=s))
+            report.llm_calls += 1
+            try:
+                answer = parse_json_response(response)
+            except json.JSONDecodeError:
+                self.cache.delete(self.model, static, dynamic)
+                continue
+            for item in answer.get("estimates", []) if isinstance(answer, dict) else []:
+                key, value = str(item.get("id")), _number(item.get("value"))
+                if key in batch and value is not None:
+                    uncertainty = _number(item.get("uncertainty"))
+                    estimates[key] = (value, 1.0 if uncertainty is None else uncertainty)
+        return estimates
+
+
+def _number(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(number) else number
+
+
+def _mark(category: Dict, value: float, method: str, uncertainty: float,
+          report: ImputationReport) -> None:
+    category["value"] = float(value)
+    category["imputed"] = {"method": method, "uncertainty": float(uncertainty)}
+    report.methods[method] += 1
+
+
+def _module(category: Dict) -> str:
+    """Life cycle module of an impact entry, ``""`` if it has none."""
+    module = str(category.get("module") or "").strip()
+    return parse_module(module) or module
+
+
+def _impact_matrix(epds: Dict[str, Dict],
+                   category_key: Callable[[str], str] = normalize_category) -> pd.DataFrame:
+    """EPDs x ``(category, module)`` columns, NaN where no numeric value is reported."""
+    rows = [(epd_id, category_key(c.get("name", "")), _module(c), _number(c.get("value")))
+            for epd_id, data in epds.items() for c in data.get("impact_categories", [])]
+    if not rows:
+        return pd.DataFrame(index=list(epds), dtype=np.float64)
+    frame = pd.DataFrame(rows, columns=["epd_id", "category", "module", "value"])
+    matrix = frame.pivot_table(index="epd_id", columns=["category", "module"], values="value",
+                               aggfunc="first", dropna=False)
+    matrix.columns = matrix.columns.to_flat_index()
+    return matrix.reindex(list(epds)).astype(np.float64)
@@ -0,0 +1,217 @@
+"""Minimal helpers for calling the hosted LLM providers.
+
+Models whose name starts with ``gpt`` or ``o1`` are sent to OpenAI, ``local:<name>``
+models to a backend registered in :mod:`.local_model`, everything else to Anthropic.
+API keys are read from the environment (see ``.env.template``). Async calls
+go through the shared pooled, rate-limited client of :mod:`.llm_client`.
+"""
+
+import json
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import telemetry
+from .local_model import LOCAL_PREFIX, get_local_model
+
+DEFAULT_MAX_TOKENS = 4096
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+class RateLimitError(Exception):
+    """Raised when a provider keeps answering HTTP 429 after the client's retries."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(exc: Any) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def usage_of(response: Any) -> Tuple[int, int, int, int]:
+    """(input, output, cache read, cache write) tokens an SDK response reports.
+
+    Anthropic counts cached prompt tokens apart from ``input_tokens``; OpenAI includes
+    them in ``prompt_tokens``, so they are split off here.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0, 0, 0
+    if hasattr(usage, "prompt_tokens"):
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+        return usage.prompt_tokens - cached, usage.completion_tokens, cached, 0
+    return (usage.input_tokens, usage.output_tokens,
+            getattr(usage, "cache_read_input_tokens", 0) or 0,
+            getattr(usage, "cache_creation_input_tokens", 0) or 0)
+
+
+def provider_for(model: str) -> str:
+    """Return the provider serving a model name."""
+    if model.startswith(LOCAL_PREFIX):
+        return "local"
+    return "openai" if model.startswith(("gpt", "o1")) else "anthropic"
+
+
+@lru_cache(maxsize=None)
+def _client(provider: str) -> Any:
+    if provider == "openai":
+        from openai import OpenAI
+        return OpenAI()
+    from anthropic import Anthropic
+    return Anthropic()
+
+
+def _messages(prompt: str, model: str, cached_prefix: str = "") -> List[Dict[str, Any]]:
+    """Single user turn; ``cached_prefix`` is sent first and marked for prompt caching.
+
+    Anthropic caches a content block marked with ``cache_control``; OpenAI caches long
+    identical prefixes automatically, so there (and for local models) the prefix is
+    simply prepended.
+    """
+    if not cached_prefix:
+        return [{"role": "user", "content": prompt}]
+    if provider_for(model) != "anthropic":
+        return [{"role": "user", "content": f"{cached_prefix}\n\n{prompt}"}]
+    return [{"role": "user", "content": [
+        {"type": "text", "text": cached_prefix, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": prompt},
+    ]}]
+
+
+def complete(prompt: str, model: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+             cached_prefix: str = "") -> str:
+    """Send a single-turn prompt and return the response text.
+
+    Args:
+        prompt: Prompt text, or its variable part when ``cached_prefix`` is given
+        model: Model name; see :func:`provider_for`
+        max_tokens: Maximum response length
+        cached_prefix: Static instructions sent before ``prompt`` and cached by the
+            provider across calls (see ``prompts.PromptTemplate.split``)
+    """
+    messages = _messages(prompt, model, cached_prefix)
+    with telemetry.span("llm.request", model=model):
+        if provider_for(model) == "local":
+            text = get_local_model(model)([messages[0]["content"]], max_tokens)[0]
+            telemetry.record_llm(model, estimate_tokens(messages[0]["content"]),
+                                 estimate_tokens(text))
+            return text
+        if provider_for(model) == "openai":
+            response = _client("openai").chat.completions.create(
+                model=model, messages=messages, max_tokens=max_tokens
+            )
+            if telemetry.enabled():
+                telemetry.record_llm(model, *usage_of(response))
+            return response.choices[0].message.content or ""
+        response = _client("anthropic").messages.create(
+            model=model, messages=messages, max_tokens=max_tokens
+        )
+        if telemetry.enabled():
+            telemetry.record_llm(model, *usage_of(response))
+        return "".join(block.text for block in response.content if block.type == "text")
+
+
+async def acomplete(prompt: str, model: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+                    cached_prefix: str = "") -> str:
+    """Async variant of :func:`complete`, sent through the event loop's shared client.
+
+    Requests are pooled, rate limited, retried and deduplicated; see
+    :class:`~.llm_client.LLMClient`.
+
+    Raises:
+        RateLimitError: If the provider is still rate limiting after the client's retries.
+    """
+    from .llm_client import get_client
+
+    return await get_client().complete(prompt, model, max_tokens, cached_prefix)
+
+
+def submit_batch(prompts: Dict[str, str], model: str,
+                 max_tokens: int = DEFAULT_MAX_TOKENS) -> str:
+    """Submit single-turn prompts as one provider batch job and return its ID.
+
+    Batch jobs are processed asynchronously by the provider (typically within hours) at
+    a reduced price, which suits overnight runs. Only Anthropic's Message Batches API
+    is supported.
+
+    Args:
+        prompts: Custom ID -> prompt; IDs come back with the results
+    """
+    if provider_for(model) != "anthropic":
+        raise ValueError(f"Batch jobs are only supported for Anthropic models, not {model!r}")
+    batch = _client("anthropic").messages.batches.create(requests=[
+        {"custom_id": custom_id,
+         "params": {"model": model, "max_tokens": max_tokens,
+                    "messages": [{"role": "user", "content": prompt}]}}
+        for custom_id, prompt in prompts.items()
+    ])
+    return batch.id
+
+
+def batch_results(batch_id: str, poll_interval: float = 60.0,
+                  timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+    """Wait for a batch job to end and collect its response texts.
+
+    Returns:
+        Custom ID -> response text, or ``None`` for requests that errored or expired
+    Raises:
+        TimeoutError: If the job has not ended within ``timeout`` seconds
+    """
+    client = _client("anthropic")
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while client.messages.batches.retrieve(batch_id).processing_status != "ended":
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"Batch {batch_id} still processing after {timeout}s")
+        time.sleep(poll_interval)
+    texts: Dict[str, Optional[str]] = {}
+    for item in client.messages.batches.results(batch_id):
+        if item.result.type == "succeeded":
+            texts[item.custom_id] = "".join(
+                block.text for block in item.result.message.content if block.type == "text"
+            )
+        else:
+            texts[item.custom_id] = None
+    return texts
+
+
+def batch_complete(prompts: Dict[str, str], model: str,
+                   max_tokens: int = DEFAULT_MAX_TOKENS,
+                   poll_interval: float = 60.0,
+                   timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+    """Run prompts through a provider batch job and block until the results are in."""
+    return batch_results(submit_batch(prompts, model, max_tokens), poll_interval, timeout)
+
+
+def parse_json_response(text: str) -> Any:
+    """Parse the JSON payload of an LLM response.
+
+    Accepts bare JSON, JSON inside a markdown code fence, or JSON surrounded by prose.
+
+    Raises:
+        json.JSONDecodeError: If no JSON value can be recovered.
+    """
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+        if not starts:
+            raise
+        return json.JSONDecoder().raw_decode(text[min(starts):])[0]
@@ -0,0 +1,329 @@
+"""Shared async client layer for the hosted LLM providers.
+
+Every async LLM call in the package (``llm.acomplete``, used by :class:`EPDExtractor`,
+:class:`LCAValidator` and the validation router) goes through one :class:`LLMClient` per
+event loop, see :func:`get_client`. The client:
+
+- keeps one SDK client per provider on a pooled ``httpx`` transport, so connections are
+  reused (HTTP keep-alive) instead of opened per component or per call;
+- waits for a per-provider :class:`TokenBucket` of requests and of input tokens per
+  minute before sending, so a burst of documents stays under the account's limits
+  instead of collecting HTTP 429s;
+- retries rate-limited, overloaded and dropped requests with jittered exponential
+  backoff, honouring ``retry-after``; a 429 also pauses the provider's buckets, so the
+  other requests in flight back off too;
+- sends identical in-flight requests once: concurrent callers with the same model,
+  prompt and ``max_tokens`` share the first caller's response;
+- hands ``local:`` models to a :class:`~.local_model.ContinuousBatcher` per model
+  instead of the network.
+
+:data:`MODEL_ROUTES` names the model for each kind of task (Haiku for quick checks,
+Sonnet for extraction and validation); components take their defaults from it.
+
+Example:
+    >>> client = get_client()
+    >>> text = await client.complete(prompt, model_for("quick_check"))
+    >>> client.stats["deduplicated"]
+"""
+
+import asyncio
+import os
+import random
+import time
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from . import telemetry
+from .llm import (DEFAULT_MAX_TOKENS, RateLimitError, _messages, _retry_after,
+                  estimate_tokens, provider_for, usage_of)
+from .local_model import ContinuousBatcher, get_local_model
+
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+MODEL_ROUTES: Dict[str, str] = {
+    "extraction": "claude-3-5-sonnet-latest",
+    "validation": "claude-3-5-sonnet-latest",
+    "quick_check": "claude-3-5-haiku-latest",
+    "matching": "claude-3-5-haiku-latest",
+}
+
+
+def model_for(task: str) -> str:
+    """Model routed to a kind of task, see :data:`MODEL_ROUTES`.
+
+    Raises:
+        KeyError: If the task has no route.
+    """
+    try:
+        return MODEL_ROUTES[task]
+    except KeyError:
+        raise KeyError(f"No model routed for task {task!r}; "
+                       f"known: {sorted(MODEL_ROUTES)}") from None
+
+
+@dataclass
+class ProviderLimits:
+    """Rate limits and connection pool size for one provider.
+
+    Attributes:
+        requests_per_minute: Requests sent per minute; 0 disables the limit
+        input_tokens_per_minute: Estimated prompt tokens sent per minute; 0 disables it
+        max_connections: Open connections at most, which also caps concurrent requests
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept
+        timeout: Seconds per request
+    """
+    requests_per_minute: float = 50
+    input_tokens_per_minute: float = 40_000
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry: float = 30.0
+    timeout: float = 120.0
+
+
+# Anthropic's and OpenAI's entry tier limits; raise them for higher tier accounts
+DEFAULT_LIMITS: Dict[str, ProviderLimits] = {
+    "anthropic": ProviderLimits(requests_per_minute=50, input_tokens_per_minute=40_000),
+    "openai": ProviderLimits(requests_per_minute=500, input_tokens_per_minute=200_000),
+}
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate_per_minute``.
+
+    The capacity defaults to one second's worth: providers enforce per-minute limits
+    over shorter intervals, so a full minute's burst at once is answered with 429s.
+    Waiters are served in arrival order. A request larger than the capacity waits for a
+    full bucket and then takes its whole amount, leaving the bucket in debt: the
+    requests after it wait until the debt is paid off, so large prompts are limited to
+    the same average rate as small ones.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(self.rate, 1.0)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """Hand out nothing for ``seconds``, e.g. after the provider answered 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until ``amount`` tokens are available and take them.
+
+        Returns:
+            Seconds waited
+        """
+        if not self.rate:
+            return 0.0
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        needed = min(amount, self.capacity)
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                paused = self._paused_until - time.monotonic()
+                if paused > 0:
+                    await asyncio.sleep(paused)
+                    continue
+                self._refill()
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    return time.monotonic() - start
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+
+
+def _retryable(exc: Exception) -> bool:
+    """Dropped connections, timeouts and 5xx/529 answers are worth another attempt."""
+    if isinstance(exc, RateLimitError):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class LLMClient:
+    """Pooled, rate-limited, retrying and deduplicating client for all providers.
+
+    A client belongs to the event loop it is first used on; use :func:`get_client`
+    rather than creating one per component.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, ProviderLimits]] = None,
+                 max_retries: int = MAX_RETRIES,
+                 base_urls: Optional[Dict[str, str]] = None):
+        """Configure the client.
+
+        Args:
+            limits: Provider -> limits, overriding :data:`DEFAULT_LIMITS`
+            max_retries: Retries per request after the first attempt
+            base_urls: Provider -> API base URL, e.g. a :class:`FakeProvider`; default
+                the SDKs' own (``ANTHROPIC_BASE_URL`` / ``OPENAI_BASE_URL``)
+        """
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.max_retries = max_retries
+        self.base_urls = dict(base_urls or {})
+        self.stats: Counter = Counter()
+        self._sdk: Dict[str, Any] = {}
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+        self._batchers: Dict[str, ContinuousBatcher] = {}
+
+    def sdk(self, provider: str) -> Any:
+        """The provider's SDK client on a pooled keep-alive transport, created once."""
+        if provider not in self._sdk:
+            import httpx
+
+            limits = self.limits.get(provider, ProviderLimits())
+            pool = httpx.Limits(max_connections=limits.max_connections,
+                                max_keepalive_connections=limits.max_keepalive_connections,
+                                keepalive_expiry=limits.keepalive_expiry)
+            options: Dict[str, Any] = {"max_retries": 0, "timeout": limits.timeout}
+            if provider in self.base_urls:
+                options["base_url"] = self.base_urls[provider]
+            if provider == "openai":
+                import openai
+                self._sdk[provider] = openai.AsyncOpenAI(
+                    http_client=openai.DefaultAsyncHttpxClient(limits=pool), **options)
+            else:
+                import anthropic
+                self._sdk[provider] = anthropic.AsyncAnthropic(
+                    http_client=anthropic.DefaultAsyncHttpxClient(limits=pool), **options)
+        return self._sdk[provider]
+
+    def batcher(self, model: str) -> ContinuousBatcher:
+        """The batcher feeding a ``local:`` model, created once."""
+        if model not in self._batchers:
+            self._batchers[model] = ContinuousBatcher(get_local_model(model))
+        return self._batchers[model]
+
+    def buckets(self, provider: str) -> Tuple[TokenBucket, TokenBucket]:
+        """The provider's (requests, input tokens) buckets."""
+        if provider not in self._buckets:
+            limits = self.limits.get(provider, ProviderLimits())
+            self._buckets[provider] = (TokenBucket(limits.requests_per_minute),
+                                       TokenBucket(limits.input_tokens_per_minute))
+        return self._buckets[provider]
+
+    async def complete(self, prompt: str, model: Optional[str] = None,
+                       max_tokens: int = DEFAULT_MAX_TOKENS, cached_prefix: str = "",
+                       task: str = "extraction") -> str:
+        """Send a single-turn prompt and return the response text.
+
+        Args:
+            prompt: Prompt text, or its variable part when ``cached_prefix`` is given
+            model: Model name; default the model routed to ``task``
+            max_tokens: Maximum response length
+            cached_prefix: Static instructions cached by the provider across calls
+            task: Kind of task, see :data:`MODEL_ROUTES`; only used without ``model``
+        Raises:
+            RateLimitError: If the provider is still rate limiting after all retries.
+        """
+        model = model or model_for(task)
+        key = (model, max_tokens, cached_prefix, prompt)
+        request = self._in_flight.get(key)
+        if request is None:
+            request = asyncio.ensure_future(self._send(prompt, model, max_tokens, cached_prefix))
+            self._in_flight[key] = request
+            request.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats["deduplicated"] += 1
+            telemetry.count("llm_deduplicated", provider=provider_for(model))
+        # Shielded: a cancelled caller must not cancel the request others are waiting on
+        return await asyncio.shield(request)
+
+    async def _send(self, prompt: str, model: str, max_tokens: int, cached_prefix: str) -> str:
+        provider = provider_for(model)
+        messages = _messages(prompt, model, cached_prefix)
+        with telemetry.span("llm.request", model=model) as span:
+            if provider == "local":
+                self.stats["local_requests"] += 1
+                text = await self.batcher(model).submit(messages[0]["content"], max_tokens)
+                telemetry.record_llm(model, estimate_tokens(messages[0]["content"]),
+                                     estimate_tokens(text))
+                return text
+            requests, tokens = self.buckets(provider)
+            input_tokens = estimate_tokens(cached_prefix + prompt)
+            for attempt in range(self.max_retries + 1):
+                waited = await requests.acquire() + await tokens.acquire(input_tokens)
+                self.stats["throttled_seconds"] += waited
+                self.stats["requests"] += 1
+                span.set(attempts=attempt + 1)
+                if waited:
+                    telemetry.count("llm_throttled_seconds", waited, provider=provider)
+                try:
+                    return await self._call(provider, model, messages, max_tokens)
+                except Exception as exc:
+                    if attempt == self.max_retries or not _retryable(exc):
+                        self.stats["failed"] += 1
+                        telemetry.count("llm_failed", provider=provider)
+                        raise
+                    delay = getattr(exc, "retry_after", None)
+                    if delay is None:
+                        delay = min(BASE_BACKOFF_SECONDS * 2 ** attempt, MAX_BACKOFF_SECONDS)
+                    delay *= random.uniform(1.0, 1.5)
+                    if isinstance(exc, RateLimitError):
+                        self.stats["rate_limited"] += 1
+                        telemetry.count("llm_rate_limited", provider=provider)
+                        requests.pause(delay)
+                        tokens.pause(delay)
+                    self.stats["retries"] += 1
+                    telemetry.count("llm_retries", provider=provider)
+                    await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _call(self, provider: str, model: str, messages: list, max_tokens: int) -> str:
+        if provider == "openai":
+            import openai
+            try:
+                response = await self.sdk(provider).chat.completions.create(
+                    model=model, messages=messages, max_tokens=max_tokens
+                )
+            except openai.RateLimitError as exc:
+                raise RateLimitError(str(exc), _retry_after(exc)) from exc
+            if telemetry.enabled():
+                telemetry.record_llm(model, *usage_of(response))
+            return response.choices[0].message.content or ""
+        import anthropic
+        try:
+            response = await self.sdk(provider).messages.create(
+                model=model, messages=messages, max_tokens=max_tokens
+            )
+        except anthropic.RateLimitError as exc:
+            raise RateLimitError(str(exc), _retry_after(exc)) from exc
+        if telemetry.enabled():
+            telemetry.record_llm(model, *usage_of(response))
+        return "".join(block.text for block in response.content if block.type == "text")
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        for sdk in self._sdk.values():
+            await sdk.close()
+        self._sdk.clear()
+
+
+# One client per event loop: pooled connections and locks cannot cross loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_client() -> LLMClient:
+    """The running event loop's shared client, created on first use."""
+    loop = asyncio.get_running_loop()
+    if loop not in _clients:
+        _clients[loop] = LLMClient()
+    return _clients[loop]
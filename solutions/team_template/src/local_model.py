@@ -0,0 +1,176 @@
+"""CPU-only local models as a third provider, with batching across concurrent requests.
+
+High-volume, low-stakes calls (bulk validation of thousands of records) do not need a
+hosted model. A model registered here under a name is addressed as ``local:<name>``
+wherever a model name is accepted, so ``LCAValidator(model_name="local:qwen")`` and
+``EPDExtractor(model_name="local:qwen")`` run offline, with no per-call latency or cost:
+``llm.complete``, ``llm.acomplete`` and the shared client route ``local:`` names here.
+
+A backend's :meth:`LocalBackend.generate` answers a list of prompts in one call. Async
+callers go through a :class:`ContinuousBatcher` per model: requests queue up while the
+model is busy, and as soon as a batch finishes the next one starts with everything
+waiting (up to ``max_batch_size``). Throughput only improves when the backend's
+``generate`` shares forward passes between the prompts of a batch.
+
+:class:`LlamaCppBackend` runs quantized GGUF models through the optional
+``llama-cpp-python`` package (``pip install llama-cpp-python``). It decodes the prompts
+of a batch one after another, so with it batching gains nothing over serial calls
+beyond fewer thread hand-offs. Runtimes with batched decoding, e.g. ONNX Runtime GenAI,
+plug in by subclassing :class:`LocalBackend`.
+
+Example:
+    >>> register_local_model("qwen", LlamaCppBackend("models/qwen2.5-1.5b-q4_k_m.gguf"))
+    >>> validator = LCAValidator(model_name="local:qwen")
+    >>> results = await validator.validate_extraction_batch(records)
+"""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+LOCAL_PREFIX = "local:"
+
+_models: Dict[str, "LocalBackend"] = {}
+
+
+class LocalBackend(ABC):
+    """A local model answering batches of prompts; subclasses implement :meth:`generate`.
+
+    Calls are serialized with a lock, since one loaded model is not safe to use from
+    several threads at once.
+    """
+
+    max_batch_size = 8
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    @abstractmethod
+    def generate(self, prompts: List[str], max_tokens: int) -> List[str]:
+        """Response text for each prompt, in order."""
+
+    def __call__(self, prompts: List[str], max_tokens: int) -> List[str]:
+        with self.lock:
+            texts = self.generate(prompts, max_tokens)
+        if len(texts) != len(prompts):
+            raise RuntimeError(f"{type(self).__name__} answered {len(texts)} of "
+                               f"{len(prompts)} prompts")
+        return texts
+
+
+class LlamaCppBackend(LocalBackend):
+    """Quantized GGUF model run on the CPU by llama.cpp.
+
+    Prompts of a batch are decoded in turn through the model's chat template: no forward
+    pass is shared, so a batch takes as long as its prompts called one by one and the
+    :class:`ContinuousBatcher` only saves thread hand-offs.
+    """
+
+    def __init__(self, model_path: str, n_ctx: int = 8192, n_threads: Optional[int] = None,
+                 n_batch: int = 512, temperature: float = 0.0, max_batch_size: int = 8):
+        """Load the model.
+
+        Args:
+            model_path: GGUF file
+            n_ctx: Context window in tokens; prompt and answer must fit
+            n_threads: CPU threads; default llama.cpp's choice
+            n_batch: Prompt tokens evaluated per forward pass
+            temperature: Sampling temperature; 0 keeps answers reproducible
+            max_batch_size: Requests collected into one :meth:`generate` call
+        Raises:
+            ImportError: If ``llama-cpp-python`` is not installed.
+        """
+        super().__init__()
+        try:
+            from llama_cpp import Llama
+        except ImportError as exc:
+            raise ImportError("LlamaCppBackend needs llama-cpp-python: "
+                              "pip install llama-cpp-python") from exc
+        self.model = Llama(model_path=str(model_path), n_ctx=n_ctx, n_threads=n_threads,
+                           n_batch=n_batch, verbose=False)
+        self.temperature = temperature
+        self.max_batch_size = max_batch_size
+
+    def generate(self, prompts: List[str], max_tokens: int) -> List[str]:
+        texts = []
+        for prompt in prompts:
+            response = self.model.create_chat_completion(
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens, temperature=self.temperature,
+            )
+            texts.append(response["choices"][0]["message"]["content"] or "")
+        return texts
+
+
+def register_local_model(name: str, backend: LocalBackend) -> str:
+    """Make a backend available as model ``local:<name>`` and return that model name."""
+    _models[name] = backend
+    return LOCAL_PREFIX + name
+
+
+def is_local(model: str) -> bool:
+    return model.startswith(LOCAL_PREFIX)
+
+
+def get_local_model(model: str) -> LocalBackend:
+    """Backend registered for a ``local:<name>`` model name.
+
+    Raises:
+        KeyError: If no backend is registered under the name.
+    """
+    name = model[len(LOCAL_PREFIX):] if is_local(model) else model
+    try:
+        return _models[name]
+    except KeyError:
+        raise KeyError(f"No local model registered as {name!r}; "
+                       f"see register_local_model()") from None
+
+
+class ContinuousBatcher:
+    """Feeds concurrent requests for one local model to it in batches.
+
+    A single worker task owns the model: while a batch runs, new requests wait in the
+    queue, and the next batch takes all of them (up to ``max_batch_size``) as soon as
+    the model is free. ``max_wait`` holds the first batch after an idle period open
+    briefly, so a burst that is still arriving lands in one batch.
+    """
+
+    def __init__(self, backend: LocalBackend, max_batch_size: Optional[int] = None,
+                 max_wait: float = 0.005):
+        self.backend = backend
+        self.max_batch_size = max_batch_size or backend.max_batch_size
+        self.max_wait = max_wait
+        self.stats: Counter = Counter()
+        self._queue: List[Tuple[str, int, asyncio.Future]] = []
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, prompt: str, max_tokens: int) -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((prompt, max_tokens, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        while self._queue:
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            batch = [item for item in batch if not item[2].cancelled()]
+            if not batch:
+                continue
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(batch)
+            try:
+                texts = await asyncio.to_thread(self.backend, [p for p, _, _ in batch],
+                                                max(n for _, n, _ in batch))
+            except Exception as exc:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, _, future), text in zip(batch, texts):
+                if not future.done():
+                    future.set_result(text)
@@ -0,0 +1,163 @@
+"""Matrix-based LCA calculations with sparse matrices.
+
+The product system is described by three matrices:
+
+- ``A`` technosphere matrix (products x processes): each process's reference output on
+  the diagonal and, negative, the intermediate products it takes from other processes
+- ``B`` intervention matrix (background flows x processes): amounts of background
+  datasets (basalt, electricity, transport, ...) used by one run of each process
+- ``C`` characterization matrix (impact categories x background flows): impact per unit
+  of each background dataset, as in ``rock-wool-background-template.csv``
+
+Impacts for a final demand ``f`` are ``h = C B A^-1 f``. ``A`` is factorized once, so any
+number of demand vectors (scenarios) are solved together in one call.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+# Allocation template inputs and the background datasets that supply them
+FLOW_TO_BACKGROUND: Dict[str, str] = {
+    "Basalt": "Basalt production",
+    "Dolomite": "Dolomite production",
+    "Slags": "Blast furnace slag",
+    "Resin binder": "Resin binder",
+    "Electricity": "Electricity medium voltage",
+    "Compressed air": "Compressed air",
+    "Truck transport": "Truck transport",
+    "Wooden pallet": "Wooden pallet",
+    "Polyethylene film": "Polyethylene film",
+}
+
+
+@dataclass
+class MatrixLCA:
+    """Sparse matrix model of a product system."""
+    processes: List[str]
+    flows: List[str]
+    categories: List[str]
+    units: Dict[str, str]
+    technosphere: sparse.csc_matrix
+    interventions: sparse.csr_matrix
+    characterization: sparse.csr_matrix
+    unmatched_flows: List[Tuple[str, str]] = field(default_factory=list)
+    missing_amounts: List[Tuple[str, str]] = field(default_factory=list)
+    _lu: Optional[object] = field(default=None, repr=False)
+
+    @classmethod
+    def from_templates(cls,
+                       allocation: pd.DataFrame,
+                       background: pd.DataFrame,
+                       flow_map: Optional[Dict[str, str]] = None) -> "MatrixLCA":
+        """Build the matrices from the allocation and background template tables.
+
+        Args:
+            allocation: Rows shaped like ``rock-wool-allocation-template.csv``
+                (Process, Input, Output, Unit, Amount per m2)
+            background: Rows shaped like ``rock-wool-background-template.csv``
+                (Impact Category, Unit, one column per background dataset)
+            flow_map: Input name -> background dataset column. Defaults to
+                :data:`FLOW_TO_BACKGROUND`; names missing from the map are matched to a
+                background column of the same name.
+        Returns:
+            Model whose ``unmatched_flows`` and ``missing_amounts`` list inputs that
+            had no background dataset or no amount and were therefore left out
+        """
+        flow_map = FLOW_TO_BACKGROUND if flow_map is None else flow_map
+        processes = list(dict.fromkeys(allocation["Process"]))
+        proc_index = {p: i for i, p in enumerate(processes)}
+        flows = [c for c in background.columns if c not in ("Impact Category", "Unit")]
+        flow_index = {f: i for i, f in enumerate(flows)}
+        amounts = pd.to_numeric(allocation["Amount per m2"], errors="coerce")
+
+        # Reference product of each process (1 unit if the template names none)
+        output_amount = np.ones(len(processes))
+        producer: Dict[str, int] = {}
+        for row, amount in zip(allocation.itertuples(index=False), amounts):
+            if isinstance(row.Output, str) and row.Output:
+                output_amount[proc_index[row.Process]] = 1.0 if np.isnan(amount) else amount
+                producer[row.Output] = proc_index[row.Process]
+
+        n_proc = len(processes)
+        a_rows, a_cols, a_vals = list(range(n_proc)), list(range(n_proc)), list(output_amount)
+        b_rows, b_cols, b_vals = [], [], []
+        unmatched, missing = [], []
+        for row, amount in zip(allocation.itertuples(index=False), amounts):
+            name = row.Input
+            if not isinstance(name, str) or not name:
+                continue
+            if np.isnan(amount):
+                missing.append((row.Process, name))
+                continue
+            col = proc_index[row.Process]
+            if name in producer:
+                a_rows.append(producer[name])
+                a_cols.append(col)
+                a_vals.append(-amount)
+            elif flow_map.get(name, name) in flow_index:
+                b_rows.append(flow_index[flow_map.get(name, name)])
+                b_cols.append(col)
+                b_vals.append(amount)
+            else:
+                unmatched.append((row.Process, name))
+
+        factors = background[flows].apply(pd.to_numeric, errors="coerce").fillna(0.0)
+        return cls(
+            processes=processes,
+            flows=flows,
+            categories=list(background["Impact Category"]),
+            units=dict(zip(background["Impact Category"], background["Unit"])),
+            technosphere=sparse.csc_matrix((a_vals, (a_rows, a_cols)), shape=(n_proc, n_proc)),
+            interventions=sparse.csr_matrix((b_vals, (b_rows, b_cols)),
+                                            shape=(len(flows), n_proc)),
+            characterization=sparse.csr_matrix(factors.to_numpy(dtype=np.float64)),
+            unmatched_flows=unmatched,
+            missing_amounts=missing,
+        )
+
+    def reference_demand(self) -> np.ndarray:
+        """Demand for one functional unit.
+
+        Template amounts are already given per m2, so every process whose product is
+        not consumed by another process is demanded at its reference output.
+        """
+        consumed = np.asarray((self.technosphere < 0).sum(axis=1)).ravel() > 0
+        demand = self.technosphere.diagonal().copy()
+        demand[consumed] = 0.0
+        return demand
+
+    def scaling(self, demand: Optional[np.ndarray] = None) -> np.ndarray:
+        """Solve ``A s = f`` for one demand vector or a (processes x scenarios) matrix."""
+        if self._lu is None:
+            self._lu = splu(self.technosphere.tocsc())
+        demand = self.reference_demand() if demand is None else np.asarray(demand, float)
+        return self._lu.solve(demand)
+
+    def impacts(self, demand: Optional[np.ndarray] = None) -> np.ndarray:
+        """Impacts per category; one column per scenario if ``demand`` is a matrix."""
+        return self.characterization @ (self.interventions @ self.scaling(demand))
+
+    def contributions(self, demand: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Impact of each process per category (categories x processes)."""
+        scaled = self.interventions @ sparse.diags(self.scaling(demand))
+        return pd.DataFrame((self.characterization @ scaled).toarray(),
+                            index=self.categories, columns=self.processes)
+
+    def impacts_for_inventories(self, inventories: np.ndarray) -> np.ndarray:
+        """Characterize a batch of background inventories in a single product.
+
+        Args:
+            inventories: (scenarios x flows) amounts of each background dataset
+        Returns:
+            (scenarios x categories) impacts
+        """
+        return np.asarray(self.characterization @ np.asarray(inventories, float).T).T
+
+    def to_dict(self, demand: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """Impacts for one demand vector as ``{category: value}``."""
+        return dict(zip(self.categories, map(float, self.impacts(demand))))
@@ -0,0 +1,301 @@
+"""Staged pipeline from EPD PDFs to validated results, with checkpoints.
+
+The notebooks hand data to each other through timestamped JSON files. :class:`Pipeline`
+runs the same steps as stages instead (extract -> process -> visualize and validate by
+default), and every stage output is stored under a key hashed from the stage's name,
+its fingerprint (model, prompts, templates and unit definitions, output directory) and
+the digests of its inputs. A stage whose key is already stored is skipped, so re-running
+after changing one prompt redoes only the stages downstream of it.
+
+Documents do not wait for each other: each flows through its stages as soon as the
+stages it depends on are done, with at most ``Stage.concurrency`` documents in a stage
+at once. A failing stage stops only its own document.
+
+Usage:
+    python -m team_template.src.pipeline data/epds/ --concurrency 4 --records
+"""
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from .artifacts import file_digest
+from .llm_client import MODEL_ROUTES
+
+DEFAULT_CHECKPOINT_DIR = Path(__file__).resolve().parents[1] / ".cache" / "pipeline"
+
+StageFunction = Callable[..., Union[Any, Awaitable[Any]]]
+
+
+def digest(value: Any) -> str:
+    """SHA-256 of a JSON-serializable value, independent of dict key order."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Stage:
+    """One step of the pipeline.
+
+    Attributes:
+        name: Stage name, also the keyword its output is passed to later stages under
+        func: ``func(**inputs)`` returning a JSON-serializable output; may be async.
+            Sync functions run in a worker thread.
+        after: Stages whose outputs this stage receives; the first stage receives the
+            document (``source``)
+        fingerprint: Anything that changes the output besides the inputs, e.g. the
+            model and prompt; a new fingerprint invalidates the checkpoints
+        concurrency: Documents in this stage at once
+    """
+    name: str
+    func: StageFunction
+    after: Sequence[str] = ("source",)
+    fingerprint: Any = "1"
+    concurrency: int = 4
+
+
+@dataclass
+class DocumentResult:
+    """Outputs and per-stage status of one document."""
+    document: str
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    status: Dict[str, str] = field(default_factory=dict)  # "ran", "cached", "failed", ...
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class CheckpointStore:
+    """Stage outputs stored as JSON files named after their content-hash key."""
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        self.root = Path(root or os.getenv("LCA_PIPELINE_DIR") or DEFAULT_CHECKPOINT_DIR)
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:2] / f"{key}.json"
+
+    def get(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(stage, key)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, stage: str, key: str, entry: Dict[str, Any]) -> None:
+        """Write atomically, so concurrent runs never read a partial checkpoint."""
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class Pipeline:
+    """Runs documents through stages concurrently, skipping stages with unchanged inputs."""
+
+    def __init__(self, stages: Sequence[Stage],
+                 checkpoints: Optional[CheckpointStore] = None):
+        """Check and store the stage graph.
+
+        Raises:
+            ValueError: If a stage depends on a stage that is not defined before it.
+        """
+        self.stages = list(stages)
+        self.checkpoints = checkpoints if checkpoints is not None else CheckpointStore()
+        known = {"source"}
+        for stage in self.stages:
+            missing = [name for name in stage.after if name not in known]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on undefined {missing}")
+            known.add(stage.name)
+        self.stats: Dict[str, Counter] = {s.name: Counter() for s in self.stages}
+
+    def run(self, documents: Union[Dict[str, Any], Iterable[Union[str, Path]]]
+            ) -> Dict[str, DocumentResult]:
+        """Blocking variant of :meth:`arun`."""
+        return asyncio.run(self.arun(documents))
+
+    async def arun(self, documents: Union[Dict[str, Any], Iterable[Union[str, Path]]]
+                   ) -> Dict[str, DocumentResult]:
+        """Run every document through every stage.
+
+        Args:
+            documents: ``{document ID: source}``, or file paths, which are their own IDs
+                and are keyed on their content hash
+        Returns:
+            ``{document ID: DocumentResult}`` in input order
+        """
+        if not isinstance(documents, dict):
+            documents = {str(p): str(p) for p in documents}
+        semaphores = {s.name: asyncio.Semaphore(s.concurrency) for s in self.stages}
+        results = await asyncio.gather(*(self._run_document(doc, source, semaphores)
+                                         for doc, source in documents.items()))
+        return dict(zip(documents, results))
+
+    async def _run_document(self, document: str, source: Any,
+                            semaphores: Dict[str, asyncio.Semaphore]) -> DocumentResult:
+        result = DocumentResult(document)
+        source_digest = (file_digest(source) if isinstance(source, str) and os.path.isfile(source)
+                         else digest(source))
+        outputs: Dict[str, Any] = {"source": source}
+        digests: Dict[str, str] = {"source": source_digest}
+        done: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> None:
+            for name in stage.after:
+                if name in done:
+                    await done[name]
+            if any(name not in digests for name in stage.after):
+                result.status[stage.name] = "skipped"
+                return
+            inputs = {name: digests[name] for name in stage.after}
+            key = digest({"stage": stage.name, "fingerprint": stage.fingerprint,
+                          "inputs": inputs})
+            entry = self.checkpoints.get(stage.name, key)
+            if entry is not None:
+                status = "cached"
+            else:
+                async with semaphores[stage.name]:
+                    try:
+                        output = await self._call(stage, {n: outputs[n] for n in stage.after})
+                    except Exception as exc:
+                        result.status[stage.name] = "failed"
+                        result.errors[stage.name] = f"{type(exc).__name__}: {exc}"
+                        self.stats[stage.name]["failed"] += 1
+                        return
+                entry = {"stage": stage.name, "document": document, "inputs": inputs,
+                         "output": output, "created": time.time()}
+                self.checkpoints.put(stage.name, key, entry)
+                status = "ran"
+            outputs[stage.name] = result.outputs[stage.name] = entry["output"]
+            digests[stage.name] = digest(entry["output"])
+            result.status[stage.name] = status
+            self.stats[stage.name][status] += 1
+
+        for stage in self.stages:
+            done[stage.name] = asyncio.create_task(run_stage(stage))
+        await asyncio.gather(*done.values())
+        return result
+
+    @staticmethod
+    async def _call(stage: Stage, inputs: Dict[str, Any]) -> Any:
+        if inspect.iscoroutinefunction(stage.func):
+            return await stage.func(**inputs)
+        return await asyncio.to_thread(stage.func, **inputs)
+
+
+def default_stages(extractor=None, processor=None, validator=None,
+                   figures_dir: Union[str, Path, None] = None) -> List[Stage]:
+    """The workshop's extract -> process -> (visualize, validate) stages.
+
+    Components are created with their defaults when omitted. The visualize stage renders
+    an impact comparison chart into ``figures_dir``, if given.
+    """
+    from .extraction import EPDExtractor
+    from .processing import LCAProcessor
+    from .validation import LCAValidator
+    from .visualization import ChartJob, render_chart
+
+    extractor = extractor or EPDExtractor()
+    processor = processor or LCAProcessor()
+    validator = validator or LCAValidator()
+    figures_dir = Path(figures_dir) if figures_dir is not None else None
+
+    async def extract(source: str) -> Dict:
+        text, tables = await asyncio.to_thread(
+            lambda: (extractor._extract_text(source), extractor._extract_tables(source)))
+        return await extractor._aprocess_content(text, tables)
+
+    def process(extract: Dict) -> Dict:
+        return processor.process_extraction(extract)
+
+    def visualize(process: Dict) -> Dict:
+        if figures_dir is None:
+            return {"figures": []}
+        path = figures_dir / f"impacts_{digest(process)[:12]}.png"
+        return {"figures": [render_chart(ChartJob("impact_comparison", process, str(path)))]}
+
+    async def validate(process: Dict) -> Dict:
+        verdict = await validator.validate_extraction(process)
+        return {"is_valid": verdict.is_valid, "issues": verdict.issues,
+                "confidence": verdict.confidence}
+
+    prompt = digest(extractor.extraction_prompt)
+    return [
+        Stage("extract", extract, ("source",), {"model": extractor.model, "prompt": prompt},
+              concurrency=8),
+        Stage("process", process, ("extract",), digest(processor.fingerprint())),
+        Stage("visualize", visualize, ("process",),
+              {"figures_dir": None if figures_dir is None else str(figures_dir.resolve())}),
+        Stage("validate", validate, ("process",),
+              {"model": validator.model, "prompts": digest(validator.prompts)}, concurrency=8),
+    ]
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point for the pipeline."""
+    from .batch import _collect_pdfs
+    from .extraction import EPDExtractor
+    from .records import EPDRecord, RecordStore
+    from .validation import LCAValidator
+
+    parser = argparse.ArgumentParser(description="Run EPD PDFs through the LCA pipeline.")
+    parser.add_argument("inputs", nargs="+", help="PDF files or directories to scan")
+    parser.add_argument("--model", default=MODEL_ROUTES["extraction"])
+    parser.add_argument("--validation-model", default=MODEL_ROUTES["validation"])
+    parser.add_argument("--stages", default="extract,process,visualize,validate",
+                        help="Comma-separated stages to run (dependencies are added)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Documents per stage")
+    parser.add_argument("--checkpoints", default=None, help="Checkpoint directory")
+    parser.add_argument("--figures", default="results/visualizations")
+    parser.add_argument("--records", action="store_true",
+                        help="Also write the extraction results to the record store")
+    args = parser.parse_args(argv)
+
+    stages = default_stages(EPDExtractor(model_name=args.model),
+                            validator=LCAValidator(model_name=args.validation_model),
+                            figures_dir=args.figures)
+    wanted = set(args.stages.split(","))
+    for stage in reversed(stages):
+        if stage.name in wanted:
+            wanted.update(stage.after)
+    selected = [s for s in stages if s.name in wanted]
+    for stage in selected:
+        stage.concurrency = min(stage.concurrency, args.concurrency) or 1
+
+    pipeline = Pipeline(selected, CheckpointStore(args.checkpoints))
+    results = pipeline.run(_collect_pdfs(args.inputs))
+    for doc, result in results.items():
+        status = " ".join(f"{name}={state}" for name, state in result.status.items())
+        print(f"{'ok  ' if result.ok else 'FAIL'} {doc}  {status}"
+              + "".join(f"\n     {name}: {error}" for name, error in result.errors.items()))
+    for name, counts in pipeline.stats.items():
+        print(f"{name:>10}: " + ", ".join(f"{k} {v}" for k, v in sorted(counts.items())))
+
+    if args.records:
+        records = [EPDRecord.from_extraction(Path(doc).stem, r.outputs["extract"], source=doc)
+                   for doc, r in results.items() if "extract" in r.outputs]
+        print(f"record store run: {RecordStore().write(records, stage='extraction')}")
+    return 0 if all(r.ok for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
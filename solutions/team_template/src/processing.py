@@ -1,18 +1,307 @@
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .embedding_index import BACKGROUND_DESCRIPTIONS, EmbeddingIndex, FlowMatcher
+from .harmonization import HarmonizationIndex
+from .imputation import ImputationEngine, ImputationReport
+from .incremental import ImpactGraph
+from .matrix_lca import MatrixLCA
+from .streaming import DEFAULT_CHUNKSIZE, StreamReport, stream_impacts
+from .table_extraction import CATEGORY_SYNONYMS
+from .telemetry import traced
+from .uncertainty import MonteCarloLCA
+from .units import BASE_UNITS, SI_PREFIXES, UnitRegistry
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data"
+ALLOCATION_TEMPLATE = DATA_DIR / "output_templates" / "rock-wool-allocation-template.csv"
+BACKGROUND_TEMPLATE = DATA_DIR / "output_templates" / "rock-wool-background-template.csv"
+
+# Canonical category (see CATEGORY_SYNONYMS) -> background template category. Only
+# indicators measuring the same quantity as a template category are mapped: GWP fossil,
+# biogenic and LULUC or PERT and PENRT are parts of a template total and stay unmapped.
+TEMPLATE_CATEGORIES = {
+    "global_warming_potential": "Global Warming",
+    "acidification_potential": "Acidification",
+    "eutrophication_potential": "Eutrophication",
+    "ozone_depletion_potential": "Ozone Depletion",
+    "photochemical_ozone_creation_potential": "Photochemical Oxidation",
+    "primary_energy_total": "Primary Energy",
+    "particulate_matter": "Particulate Matter",
+    "water_use": "Water Use",
+    "land_use": "Land Use",
+    "abiotic_depletion_elements": "Resource Depletion",  # kg Sb eq.
+}
+
+# Units that appear in the workshop templates and EPDs
+COMMON_UNITS = [
+    "g", "kg", "t", "kWh", "MJ", "m3", "l", "m2", "tkm",
+    "g CO2 eq.", "kg CO2 eq.", "t CO2 eq.",
+    "g SO2 eq.", "kg SO2 eq.",
+    "g PO4 eq.", "kg PO4 eq.",
+    "kg CFC11 eq.", "mg CFC11 eq.",
+    "kg C2H4 eq.", "g C2H4 eq.",
+    "kg Sb eq.", "mg Sb eq.",
+]
+
+
+def load_conversions(registry: Optional[UnitRegistry] = None) -> dict:
+    """Conversion factors between the common LCA units: ``{from_unit: {to_unit: factor}}``."""
+    registry = registry or UnitRegistry()
+    factors = registry.factor_matrix(COMMON_UNITS)
+    return {
+        from_unit: {to_unit: factor for to_unit, factor in row.items()
+                    if to_unit != from_unit and not np.isnan(factor)}
+        for from_unit, row in factors.iterrows()
+    }
+
+
+def load_categories(path: Path = BACKGROUND_TEMPLATE) -> dict:
+    """Impact categories of the background template with their reference units."""
+    template = pd.read_csv(path, usecols=["Impact Category", "Unit"])
+    return dict(zip(template["Impact Category"], template["Unit"]))
+
+
 class LCAProcessor:
     """Core LCA calculations and data processing."""
-    
-    def __init__(self):
-        self.unit_conversions = load_conversions()
+
+    def __init__(self, flow_index: Optional[EmbeddingIndex] = None):
+        self.unit_registry = UnitRegistry()
+        self.unit_conversions = load_conversions(self.unit_registry)
         self.impact_categories = load_categories()
-    
-    def standardize_units(self, value: float, 
-                         from_unit: str, 
-                         to_unit: str) -> float:
-        """Convert between common LCA units."""
-        pass
-    
-    def calculate_impacts(self, 
+        # Index over background datasets; built from the background template if None
+        self.flow_index = flow_index
+        self._flow_matcher: Optional[FlowMatcher] = None
+        self.category_index = HarmonizationIndex.for_categories()
+
+    @traced("processing.standardize_units")
+    def standardize_units(self, value: Union[float, np.ndarray, pd.Series],
+                         from_unit: Union[str, np.ndarray, pd.Series],
+                         to_unit: Union[str, np.ndarray, pd.Series]
+                         ) -> Union[float, np.ndarray, pd.Series]:
+        """Convert between common LCA units.
+
+        Accepts a single value or a whole column. Unit arguments may be one unit string
+        or a column of unit strings aligned with the values; each distinct unit string is
+        parsed once and the conversion is a single vectorized multiplication.
+
+        Raises:
+            ValueError: If the units measure different kinds of quantity.
+        """
+        return self.unit_registry.convert(value, from_unit, to_unit)
+
+    @traced("processing.process_extraction")
+    def process_extraction(self, data: dict) -> dict:
+        """Standardize an extraction result to the background template's categories.
+
+        Category names are resolved to a canonical category by a known spelling (exact
+        or token match, no fuzzy matching) and mapped to the template through
+        :data:`TEMPLATE_CATEGORIES`; values are converted to the template's reference
+        unit of the category. Entries keep their original name, value and unit under
+        ``"original"``; those that map to no template category or whose unit cannot be
+        converted are passed through and listed in ``metadata["unstandardized"]``.
+        """
+        categories, unstandardized = [], []
+        for entry in data.get("impact_categories", []):
+            target = self._template_category(str(entry.get("name", "")))
+            value = None if target is None else self._standard_value(entry, target[1])
+            if value is None:
+                categories.append(dict(entry))
+                unstandardized.append(entry.get("name"))
+                continue
+            original = {k: entry.get(k) for k in ("name", "value", "unit")}
+            categories.append({**entry, "name": target[0], "value": value, "unit": target[1],
+                               "original": original})
+        metadata = dict(data.get("metadata") or {})
+        if unstandardized:
+            metadata["unstandardized"] = unstandardized
+        return {"impact_categories": categories, "metadata": metadata}
+
+    def _standard_value(self, entry: dict, unit: str) -> Optional[float]:
+        """An entry's value in ``unit``; None if it is missing or cannot be converted."""
+        try:
+            value = float(entry.get("value"))
+        except (TypeError, ValueError):
+            return None
+        try:
+            return float(self.standardize_units(value, str(entry.get("unit")), unit))
+        except ValueError:  # unknown unit, or another kind of quantity
+            return None
+
+    def _template_category(self, name: str) -> Optional[Tuple[str, str]]:
+        """``(template category, unit)`` of an indicator name, or None if unmapped."""
+        category = TEMPLATE_CATEGORIES.get(self.category_index.lookup(name, fuzzy=False))
+        if category not in self.impact_categories:
+            return None
+        return category, self.impact_categories[category]
+
+    def fingerprint(self) -> Dict:
+        """Everything :meth:`process_extraction` depends on besides its input: the
+        template, the category mapping and synonyms, and the unit definitions."""
+        return {"template": self.impact_categories, "mapping": TEMPLATE_CATEGORIES,
+                "synonyms": CATEGORY_SYNONYMS, "learned": self.category_index.learned,
+                "units": BASE_UNITS, "prefixes": SI_PREFIXES}
+
+    @traced("processing.calculate_impacts")
+    def calculate_impacts(self,
                          inventory_data: dict,
                          impact_factors: dict) -> dict:
-        """Calculate environmental impacts from inventory."""
-        pass
\ No newline at end of file
+        """Calculate environmental impacts from inventory.
+
+        Args:
+            inventory_data: ``{flow: amount}`` per functional unit
+            impact_factors: ``{flow: {category: impact per unit of flow}}``
+        Returns:
+            ``{category: impact}``; flows without factors contribute nothing
+        """
+        impacts: dict = {}
+        for flow, amount in inventory_data.items():
+            for category, factor in impact_factors.get(flow, {}).items():
+                impacts[category] = impacts.get(category, 0.0) + amount * factor
+        return impacts
+
+    @traced("processing.calculate_impacts_streaming")
+    def calculate_impacts_streaming(self,
+                                    inventory: Union[Path, str],
+                                    background: Union[Path, str] = BACKGROUND_TEMPLATE,
+                                    flow_map: Optional[dict] = None,
+                                    chunksize: int = DEFAULT_CHUNKSIZE
+                                    ) -> Tuple[dict, StreamReport]:
+        """:meth:`calculate_impacts` for CSV files too large to load at once.
+
+        Both files are read in chunks of ``chunksize`` rows and validated row by row, so
+        memory stays flat as the files grow.
+
+        Args:
+            inventory: CSV shaped like the allocation template
+            background: CSV shaped like the background template
+            flow_map: Input name -> background dataset, see ``FLOW_TO_BACKGROUND``
+            chunksize: Rows read at a time
+        Returns:
+            ``({category: impact}, report)``; the report lists rejected rows
+        """
+        return stream_impacts(inventory, background, flow_map, self.unit_registry, chunksize)
+
+    def match_flows(self, flows: Sequence[str],
+                    background: Union[Path, str] = BACKGROUND_TEMPLATE,
+                    confirm: bool = True) -> Dict[str, str]:
+        """Find the background dataset supplying each inventory input.
+
+        Known pairs (``FLOW_TO_BACKGROUND``) are used as they are, the others are looked
+        up in the flow embedding index and only ambiguous ones are confirmed by an LLM.
+
+        Args:
+            flows: Inventory input names
+            background: Background template whose dataset columns are matched against
+                when no ``flow_index`` was given
+            confirm: Ask the LLM about ambiguous matches; without it they stay unmatched
+        Returns:
+            ``{flow: dataset}`` for the matched flows, usable as ``flow_map``
+        """
+        if self._flow_matcher is None:
+            if self.flow_index is None:
+                columns = pd.read_csv(background, nrows=0).columns
+                datasets = [c.strip() for c in columns if c not in ("Impact Category", "Unit")]
+                self.flow_index = EmbeddingIndex.build(datasets, BACKGROUND_DESCRIPTIONS)
+            self._flow_matcher = FlowMatcher(self.flow_index)
+        matches = self._flow_matcher.match(flows, confirm=confirm)
+        return {flow: m.dataset for flow, m in matches.items() if m.dataset is not None}
+
+    def impute_missing(self,
+                       inventory: Union[pd.DataFrame, Path, str] = ALLOCATION_TEMPLATE,
+                       engine: Optional[ImputationEngine] = None
+                       ) -> Tuple[pd.DataFrame, ImputationReport]:
+        """Infer the blank input amounts of an allocation table.
+
+        Mass balance shares from the notes come first, then analogs from the engine's
+        reference inventories, then batched LLM estimates.
+
+        Args:
+            inventory: Allocation table or path to a CSV shaped like the template
+            engine: Configured engine; the default has no references and uses the LLM
+        Returns:
+            ``(inventory, report)``; imputed rows are flagged in the ``Imputation`` and
+            ``Imputation uncertainty`` columns
+        """
+        if not isinstance(inventory, pd.DataFrame):
+            inventory = pd.read_csv(inventory)
+        return (engine or ImputationEngine()).impute_inventory(inventory)
+
+    def impute_impacts(self, epds: Dict[str, dict],
+                       engine: Optional[ImputationEngine] = None,
+                       categories: Optional[Sequence[Tuple[str, str]]] = None
+                       ) -> Tuple[Dict[str, dict], ImputationReport]:
+        """Infer the missing impact values of extraction results.
+
+        Analogs from the engine's reference EPDs come first, then batched LLM estimates,
+        per category and life cycle module.
+
+        Args:
+            epds: Extraction results by EPD ID
+            engine: Configured engine; the default has no references and uses the LLM
+            categories: ``(name, unit)`` pairs every EPD should report; default the
+                required categories of the quality rules
+        Returns:
+            ``(epds, report)``; imputed categories carry an ``"imputed"`` entry
+        """
+        engine = engine or ImputationEngine(harmonizer=self.category_index)
+        return engine.impute_impacts(epds, categories)
+
+    @traced("processing.build_matrix_model")
+    def build_matrix_model(self,
+                           allocation: Union[pd.DataFrame, Path, str] = ALLOCATION_TEMPLATE,
+                           background: Union[pd.DataFrame, Path, str] = BACKGROUND_TEMPLATE,
+                           flow_map: Optional[dict] = None) -> MatrixLCA:
+        """Build the sparse matrix model used for large inventories and scenario batches.
+
+        Args:
+            allocation: Allocation table or path to a CSV shaped like the template
+            background: Background table or path to a CSV shaped like the template
+            flow_map: Input name -> background dataset, see ``FLOW_TO_BACKGROUND``
+        Returns:
+            MatrixLCA; ``impacts()`` solves one demand vector or a whole scenario matrix
+        """
+        if not isinstance(allocation, pd.DataFrame):
+            allocation = pd.read_csv(allocation)
+        if not isinstance(background, pd.DataFrame):
+            background = pd.read_csv(background)
+        return MatrixLCA.from_templates(allocation, background, flow_map)
+
+    def build_impact_graph(self,
+                           model: MatrixLCA,
+                           flow_map: Optional[dict] = None) -> ImpactGraph:
+        """Track which results depend on which inputs for incremental recalculation.
+
+        Args:
+            model: Model from :meth:`build_matrix_model`
+            flow_map: Input name -> background dataset, see ``FLOW_TO_BACKGROUND``
+        Returns:
+            ImpactGraph whose ``set_amount``/``set_factor`` recompute only the affected
+            contributions
+        """
+        return ImpactGraph(model, flow_map=flow_map)
+
+    @traced("processing.propagate_uncertainty")
+    def propagate_uncertainty(self,
+                              model: MatrixLCA,
+                              distributions: dict,
+                              iterations: int = 10_000,
+                              seed: Optional[int] = None,
+                              workers: int = 0) -> dict:
+        """Monte Carlo uncertainty of the impacts of a matrix model.
+
+        Args:
+            model: Model from :meth:`build_matrix_model`
+            distributions: Background flow -> ``Lognormal``/``Triangular``, see
+                ``uncertainty.pedigree_lognormal`` for pedigree-matrix based estimates
+            iterations: Number of Monte Carlo iterations
+            seed: Seed for reproducible results
+            workers: Processes to spread the sampling over
+        Returns:
+            ``{category: {"mean", "std", "p2.5", "p50", "p97.5", ...}}``, the input
+            expected by ``LCAValidator.validate_uncertainty``
+        """
+        engine = MonteCarloLCA(model, distributions)
+        return engine.run(iterations, seed=seed, workers=workers).summary()
@@ -0,0 +1,189 @@
+"""Process-wide registry of the prompt templates under ``prompts/``.
+
+Every ``.md`` template is read and compiled once per process: placeholders such as
+``{data}`` are located, the text is split into static and placeholder segments and its
+token count is estimated. Constructing extractors and validators afterwards is a dict
+lookup. A template whose file changes on disk is recompiled on its next use (keyed on
+the file's mtime), so prompts can be edited while a notebook or worker is running; the
+mtime is checked at most once per ``check_interval`` seconds, so lookups in between do
+not touch the disk.
+
+Placeholders are ``{name}`` with a lowercase identifier; the JSON examples inside the
+templates are left alone.
+
+Provider-side prompt caching matches on an identical prefix, so
+:meth:`PromptTemplate.split` renders a template as ``(static, dynamic)``, cut at the
+first line holding a value that changes between calls. Values that stay the same across
+calls, such as a list of candidate names, are named as ``cached`` and rendered into the
+static part; every heading stays next to its value.
+
+Example:
+    >>> template = get_registry().get("extraction/base_prompt.md")
+    >>> template.tokens, template.placeholders
+    >>> get_registry().render("validation/completeness.md")
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from .llm import estimate_tokens
+
+PROMPTS_DIR = Path(__file__).resolve().parents[1] / "prompts"
+
+_PLACEHOLDER = re.compile(r"\{([a-z_][a-z0-9_]*)\}")
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A compiled prompt template.
+
+    Attributes:
+        name: Path relative to the prompts directory, e.g. ``"extraction/base_prompt.md"``
+        text: Raw template text
+        mtime_ns: Modification time of the file it was compiled from (0 if none)
+        tokens: Estimated token count of the text without placeholder values
+        placeholders: Placeholder names in order of first appearance
+        segments: Alternating static text and placeholder names, starting with text
+        static_prefix: Text before the first placeholder
+    """
+    name: str
+    text: str
+    mtime_ns: int
+    tokens: int
+    placeholders: Tuple[str, ...]
+    segments: Tuple[str, ...]
+    static_prefix: str
+
+    @classmethod
+    def compile(cls, name: str, text: str, mtime_ns: int = 0) -> "PromptTemplate":
+        segments = tuple(_PLACEHOLDER.split(text))
+        return cls(
+            name=name,
+            text=text,
+            mtime_ns=mtime_ns,
+            tokens=estimate_tokens(text),
+            placeholders=tuple(dict.fromkeys(segments[1::2])),
+            segments=segments,
+            static_prefix=segments[0],
+        )
+
+    def render(self, **values: str) -> str:
+        """Substitute placeholder values.
+
+        Raises:
+            KeyError: If a placeholder has no value.
+        """
+        return _fill(self.segments, values)
+
+    def split(self, cached: Iterable[str] = (), /, **values: str) -> Tuple[str, str]:
+        """Render as ``(static, dynamic)`` for prefix caching.
+
+        The rendering is cut at the start of the line holding the first placeholder not
+        named in ``cached``, so ``static`` and ``dynamic`` read in order are the whole
+        prompt. Templates put their per-call values last to keep the static part long.
+
+        Args:
+            cached: Placeholders whose values are the same across calls; rendered into
+                the static part
+            **values: Value of every placeholder
+
+        Raises:
+            KeyError: If a placeholder has no value.
+        """
+        cached = set(cached)
+        first = next((i for i in range(1, len(self.segments), 2)
+                      if self.segments[i] not in cached), None)
+        if first is None:
+            return self.render(**values).strip(), ""
+        before = self.segments[first - 1]
+        line = before.rfind("\n") + 1
+        static = _fill(self.segments[:first - 1] + (before[:line],), values)
+        dynamic = _fill((before[line:],) + self.segments[first:], values)
+        return static.rstrip(), dynamic.strip()
+
+
+def _fill(segments: Tuple[str, ...], values: Dict[str, str]) -> str:
+    parts = list(segments)
+    for i in range(1, len(parts), 2):
+        parts[i] = values[parts[i]]
+    return "".join(parts)
+
+
+class PromptRegistry:
+    """Loads, compiles and caches every template under a prompts directory."""
+
+    def __init__(self, root: Union[str, Path] = PROMPTS_DIR, check_interval: float = 2.0):
+        """Create a registry; templates are compiled on first use.
+
+        Args:
+            root: Directory holding the templates
+            check_interval: Seconds between checks of a template's mtime; ``0`` checks
+                on every lookup
+        """
+        self.root = Path(root)
+        self.check_interval = check_interval
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def load_all(self) -> Dict[str, PromptTemplate]:
+        """Compile every ``.md`` template under the root (changed files only)."""
+        for path in sorted(self.root.rglob("*.md")):
+            self.get(path.relative_to(self.root).as_posix())
+        return dict(self._templates)
+
+    def get(self, name: str) -> PromptTemplate:
+        """Compiled template for a path relative to the root, recompiled if it changed.
+
+        Raises:
+            FileNotFoundError: If there is no such template.
+        """
+        template = self._templates.get(name)
+        now = time.monotonic()
+        if template is not None and now - self._checked[name] < self.check_interval:
+            return template
+        path = self.root / name
+        mtime_ns = os.stat(path).st_mtime_ns
+        self._checked[name] = now
+        if template is None or template.mtime_ns != mtime_ns:
+            with self._lock:
+                template = PromptTemplate.compile(name, path.read_text(encoding="utf-8"),
+                                                  mtime_ns)
+                self._templates[name] = template
+        return template
+
+    def group(self, directory: str) -> Dict[str, PromptTemplate]:
+        """Templates directly inside ``directory``, keyed by file stem."""
+        return {path.stem: self.get(path.relative_to(self.root).as_posix())
+                for path in sorted((self.root / directory).glob("*.md"))}
+
+    def render(self, name: str, **values: str) -> str:
+        """Render a template; repeated renders with the same values are cached."""
+        template = self.get(name)
+        return _render_cached(template, tuple(sorted(values.items())))
+
+    def tokens(self, name: str) -> int:
+        """Estimated token count of a template without placeholder values."""
+        return self.get(name).tokens
+
+
+@lru_cache(maxsize=512)
+def _render_cached(template: PromptTemplate, values: Tuple[Tuple[str, str], ...]) -> str:
+    return template.render(**dict(values))
+
+
+_registry: Optional[PromptRegistry] = None
+
+
+def get_registry() -> PromptRegistry:
+    """The process-wide registry for the team's ``prompts/`` directory."""
+    global _registry
+    if _registry is None:
+        _registry = PromptRegistry()
+    return _registry
@@ -0,0 +1,354 @@
+"""Typed EPD records and their partitioned Parquet store.
+
+Extraction results arrive as nested dicts. :meth:`EPDRecord.from_extraction` turns each
+into a slotted record of :class:`ImpactValue` rows, and :class:`RecordStore` writes
+batches of records as two Parquet datasets under one root:
+
+- ``epds/run=<run>/`` with one row per EPD (source, declared unit, reference, metadata)
+- ``impacts/run=<run>/module=<module>/`` with one row per impact value
+
+``manifest.json`` lists every run with its stage, time and row counts, so the next
+notebook asks the store for the latest extraction run instead of globbing for the newest
+JSON file. Readers pass the columns, modules and categories they need; Parquet
+projection and partition pruning skip everything else.
+
+Example:
+    >>> store = RecordStore()
+    >>> run = store.write([EPDRecord.from_extraction("epd-1", result)], stage="extraction")
+    >>> store.read_impacts(columns=["epd_id", "category", "value"], modules=["A1-A3"])
+"""
+
+import json
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .validation import normalize_category
+
+DEFAULT_RECORDS_DIR = Path(__file__).resolve().parents[1] / "results" / "records"
+
+# Partition value for impact rows without a life cycle module
+NO_MODULE = "unspecified"
+
+EPD_SCHEMA = pa.schema([
+    ("epd_id", pa.string()),
+    ("source", pa.string()),
+    ("declared_unit", pa.string()),
+    ("epd_reference", pa.string()),
+    ("metadata", pa.string()),  # remaining metadata as JSON
+])
+
+IMPACT_SCHEMA = pa.schema([
+    ("epd_id", pa.string()),
+    ("category", pa.string()),  # normalized, see validation.normalize_category
+    ("name", pa.string()),
+    ("value", pa.float64()),
+    ("unit", pa.string()),
+    ("module", pa.string()),
+    ("confidence", pa.string()),
+    ("imputed", pa.string()),  # imputation method, if the value was imputed
+    ("imputed_uncertainty", pa.float64()),  # relative standard deviation of the estimate
+    ("original_name", pa.string()),  # as reported, before standardization
+    ("original_value", pa.float64()),
+    ("original_unit", pa.string()),
+])
+
+
+@dataclass(slots=True)
+class ImpactValue:
+    """One reported value of an impact category.
+
+    ``original_*`` hold the name, value and unit as reported when processing has
+    standardized the entry; ``imputed*`` the method and uncertainty of imputed values.
+    """
+    name: str
+    value: Optional[float]
+    unit: Optional[str] = None
+    module: Optional[str] = None
+    confidence: Optional[str] = None
+    imputed: Optional[str] = None
+    imputed_uncertainty: Optional[float] = None
+    original_name: Optional[str] = None
+    original_value: Optional[float] = None
+    original_unit: Optional[str] = None
+
+    @property
+    def category(self) -> str:
+        return normalize_category(self.name)
+
+
+@dataclass(slots=True)
+class EPDRecord:
+    """An extracted EPD: identity, declared unit and impact values."""
+    epd_id: str
+    impacts: List[ImpactValue] = field(default_factory=list)
+    source: Optional[str] = None
+    declared_unit: Optional[str] = None
+    epd_reference: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def modules(self) -> List[str]:
+        return sorted({i.module for i in self.impacts if i.module})
+
+    @classmethod
+    def from_extraction(cls, epd_id: str, result: Dict[str, Any],
+                        source: Optional[str] = None) -> "EPDRecord":
+        """Record of an extractor result (``{"impact_categories": [...], "metadata": {}}``)."""
+        metadata = dict(result.get("metadata") or {})
+        impacts = []
+        for c in result.get("impact_categories") or []:
+            imputed, original = c.get("imputed") or {}, c.get("original") or {}
+            impacts.append(ImpactValue(
+                name=str(c.get("name", "")), value=_number(c.get("value")), unit=c.get("unit"),
+                module=c.get("module"), confidence=c.get("confidence"),
+                imputed=imputed.get("method"),
+                imputed_uncertainty=_number(imputed.get("uncertainty")),
+                original_name=original.get("name"), original_value=_number(original.get("value")),
+                original_unit=original.get("unit"),
+            ))
+        return cls(epd_id=str(epd_id), impacts=impacts, source=source,
+                   declared_unit=metadata.pop("declared_unit", None),
+                   epd_reference=metadata.pop("epd_reference", None), metadata=metadata)
+
+    def to_extraction(self) -> Dict[str, Any]:
+        """The extractor's dict form, for code that still expects it."""
+        metadata = dict(self.metadata)
+        for key in ("declared_unit", "epd_reference"):
+            if getattr(self, key) is not None:
+                metadata[key] = getattr(self, key)
+        categories = []
+        for i in self.impacts:
+            entry = {"name": i.name, "value": i.value, "unit": i.unit}
+            entry.update({k: getattr(i, k) for k in ("module", "confidence")
+                          if getattr(i, k) is not None})
+            if i.imputed is not None:
+                entry["imputed"] = {"method": i.imputed}
+                if i.imputed_uncertainty is not None:
+                    entry["imputed"]["uncertainty"] = i.imputed_uncertainty
+            if i.original_name is not None:
+                entry["original"] = {"name": i.original_name, "value": i.original_value,
+                                     "unit": i.original_unit}
+            categories.append(entry)
+        return {"impact_categories": categories, "metadata": metadata}
+
+
+def records_to_tables(records: Iterable[EPDRecord]) -> Dict[str, pa.Table]:
+    """Column-wise ``{"epds": ..., "impacts": ...}`` Arrow tables of a batch of records."""
+    epds = {name: [] for name in EPD_SCHEMA.names}
+    impacts = {name: [] for name in IMPACT_SCHEMA.names}
+    for r in records:
+        epds["epd_id"].append(r.epd_id)
+        epds["source"].append(r.source)
+        epds["declared_unit"].append(r.declared_unit)
+        epds["epd_reference"].append(r.epd_reference)
+        epds["metadata"].append(json.dumps(r.metadata, default=str) if r.metadata else None)
+        for i in r.impacts:
+            impacts["epd_id"].append(r.epd_id)
+            impacts["category"].append(i.category)
+            impacts["name"].append(i.name)
+            impacts["value"].append(i.value)
+            impacts["unit"].append(i.unit)
+            impacts["module"].append(i.module or NO_MODULE)
+            impacts["confidence"].append(i.confidence)
+            impacts["imputed"].append(i.imputed)
+            impacts["imputed_uncertainty"].append(i.imputed_uncertainty)
+            impacts["original_name"].append(i.original_name)
+            impacts["original_value"].append(i.original_value)
+            impacts["original_unit"].append(i.original_unit)
+    return {"epds": pa.table(epds, schema=EPD_SCHEMA),
+            "impacts": pa.table(impacts, schema=IMPACT_SCHEMA)}
+
+
+class RecordStore:
+    """Partitioned Parquet datasets of EPD records, one partition per run."""
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        self.root = Path(root or os.getenv("LCA_RECORDS_DIR") or DEFAULT_RECORDS_DIR)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def manifest(self) -> Dict[str, List[Dict[str, Any]]]:
+        if not self.manifest_path.exists():
+            return {"runs": []}
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+
+    def runs(self, stage: Optional[str] = None) -> List[str]:
+        """Run IDs, oldest first, optionally of one stage only."""
+        return [r["run"] for r in self.manifest()["runs"] if stage in (None, r["stage"])]
+
+    def latest(self, stage: Optional[str] = "extraction") -> str:
+        """ID of the most recent run of a stage.
+
+        Raises:
+            FileNotFoundError: If the store has no such run.
+        """
+        runs = self.runs(stage)
+        if not runs:
+            raise FileNotFoundError(f"No {stage + ' ' if stage else ''}runs in {self.root}")
+        return runs[-1]
+
+    def write(self, records: Iterable[EPDRecord], stage: str = "extraction",
+              run: Optional[str] = None) -> str:
+        """Write a batch of records as a new run and register it in the manifest.
+
+        The manifest is replaced atomically after the data files are complete, so
+        readers never see a half-written run, and updated under a lock file, so
+        concurrent writers do not drop each other's runs.
+
+        Returns:
+            The run ID
+        """
+        run = run or (datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+                      + f"-{uuid.uuid4().hex[:6]}")
+        tables = records_to_tables(records)
+        for name, partitions in (("epds", ["run"]), ("impacts", ["run", "module"])):
+            table = tables[name]
+            table = table.append_column("run", pa.array([run] * table.num_rows, pa.string()))
+            ds.write_dataset(
+                table, self.root / name, format="parquet",
+                partitioning=ds.partitioning(
+                    pa.schema([(p, pa.string()) for p in partitions]), flavor="hive"),
+                basename_template=f"{run}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+
+        impacts = tables["impacts"]
+        entry = {
+            "run": run,
+            "stage": stage,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "epds": tables["epds"].num_rows,
+            "impacts": impacts.num_rows,
+            "modules": sorted(set(impacts.column("module").to_pylist())),
+        }
+        with self._manifest_lock():
+            manifest = self.manifest()
+            manifest["runs"].append(entry)
+            self._write_manifest(manifest)
+        return run
+
+    @contextmanager
+    def _manifest_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on ``manifest.lock`` across a manifest update."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "manifest.lock", "a+b") as f:
+            if os.name == "nt":
+                import msvcrt
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK gives up after ten seconds
+                        continue
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp, self.manifest_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _read(self, name: str, partitions: Sequence[str], schema: pa.Schema,
+              columns: Optional[Sequence[str]], condition: ds.Expression) -> pd.DataFrame:
+        """Rows of one dataset; empty if no run has written any rows to it yet."""
+        columns = list(columns or schema.names)
+        if not (self.root / name).exists():
+            return schema.empty_table().select(columns).to_pandas()
+        dataset = ds.dataset(self.root / name, format="parquet", partitioning=ds.partitioning(
+            pa.schema([(p, pa.string()) for p in partitions]), flavor="hive"))
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    def read_impacts(self, run: Optional[str] = None,
+                     columns: Optional[Sequence[str]] = None,
+                     modules: Optional[Sequence[str]] = None,
+                     categories: Optional[Sequence[str]] = None,
+                     stage: str = "extraction") -> pd.DataFrame:
+        """Impact rows of one run (default: the latest of ``stage``); empty if it has none.
+
+        Args:
+            run: Run ID
+            columns: Columns to read; default all of :data:`IMPACT_SCHEMA`
+            modules: Only these life cycle modules; other partitions are not opened
+            categories: Only these categories (any spelling ``normalize_category`` maps)
+            stage: Stage whose latest run is read when ``run`` is None
+        """
+        run = run or self.latest(stage)
+        condition = ds.field("run") == run
+        if modules is not None:
+            condition &= ds.field("module").isin(list(modules))
+        if categories is not None:
+            condition &= ds.field("category").isin([normalize_category(c) for c in categories])
+        frame = self._read("impacts", ["run", "module"], IMPACT_SCHEMA, columns, condition)
+        if "module" in frame:
+            frame["module"] = frame["module"].where(frame["module"] != NO_MODULE, None)
+        return frame
+
+    def read_epds(self, run: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+                  stage: str = "extraction") -> pd.DataFrame:
+        """EPD rows of one run (default: the latest of ``stage``)."""
+        run = run or self.latest(stage)
+        return self._read("epds", ["run"], EPD_SCHEMA, columns, ds.field("run") == run)
+
+    def read_records(self, run: Optional[str] = None,
+                     stage: str = "extraction") -> List[EPDRecord]:
+        """Whole records of a run, for code that needs them as objects."""
+        run = run or self.latest(stage)
+        impacts: Dict[str, List[ImpactValue]] = {}
+        for row in self.read_impacts(run).itertuples(index=False):
+            impacts.setdefault(row.epd_id, []).append(ImpactValue(
+                name=row.name, value=_number(row.value), unit=_optional(row.unit),
+                module=_optional(row.module), confidence=_optional(row.confidence),
+                imputed=_optional(row.imputed),
+                imputed_uncertainty=_number(row.imputed_uncertainty),
+                original_name=_optional(row.original_name),
+                original_value=_number(row.original_value),
+                original_unit=_optional(row.original_unit)))
+        return [
+            EPDRecord(epd_id=row.epd_id, impacts=impacts.get(row.epd_id, []),
+                      source=_optional(row.source), declared_unit=_optional(row.declared_unit),
+                      epd_reference=_optional(row.epd_reference),
+                      metadata=json.loads(row.metadata) if _optional(row.metadata) else {})
+            for row in self.read_epds(run).itertuples(index=False)
+        ]
+
+
+def _optional(value: Any) -> Any:
+    return None if value is None or (isinstance(value, float) and pd.isna(value)) else value
+
+
+def _number(value: Any) -> Optional[float]:
+    """``value`` as a float; None if it is missing, NaN or not numeric."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if pd.isna(value) else value
@@ -0,0 +1,212 @@
+"""Tiered validation: rule-based checks first, LLMs only for uncertain records.
+
+Records go through a list of tiers. The first tier is the rule-based
+:class:`DataQualityChecker`, evaluated in bulk; each later tier is an
+:class:`LCAValidator` on a progressively stronger model. A tier's verdict is accepted
+when it is confident enough, otherwise the record is escalated to the next tier. The
+last tier always decides.
+
+Every tier records its calls, latency, estimated cost and how often its verdicts agree
+with the next tier's on escalated records and with labels, when given.
+
+Example:
+    >>> router = ValidationRouter(cache=ResponseCache())
+    >>> report = asyncio.run(router.route(records, labels))
+    >>> report.summary()["tiers"]["rules"]["accepted"]
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cache import ResponseCache
+from .llm import estimate_tokens
+from .llm_client import MODEL_ROUTES
+from .telemetry import MODEL_PRICES
+from .validation import (DataQualityChecker, LCAValidator, ValidationResult,
+                         flatten_impact_categories)
+
+CHEAP_MODEL = MODEL_ROUTES["quick_check"]
+STRONG_MODEL = MODEL_ROUTES["validation"]
+
+# Rough sizes used for cost estimates: prompt template and JSON verdict, in tokens
+PROMPT_TOKENS = 150
+VERDICT_TOKENS = 100
+
+
+@dataclass
+class Tier:
+    """One validation stage.
+
+    Attributes:
+        name: Label used in the statistics
+        validator: LLM validator; ``None`` for the rule-based tier
+        min_confidence: Verdicts below this confidence are escalated
+        escalate_invalid: Also escalate confident "invalid" verdicts
+    """
+    name: str
+    validator: Optional[LCAValidator] = None
+    min_confidence: float = 0.8
+    escalate_invalid: bool = False
+
+    def accepts(self, result: ValidationResult) -> bool:
+        if result.confidence < self.min_confidence:
+            return False
+        return result.is_valid or not self.escalate_invalid
+
+
+@dataclass
+class TierStats:
+    """Counters for one tier."""
+    seen: int = 0
+    accepted: int = 0
+    escalated: int = 0
+    calls: int = 0
+    latency: float = 0.0
+    cost: float = 0.0
+    compared: int = 0
+    agreed: int = 0
+    labeled: int = 0
+    correct: int = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "seen": self.seen, "accepted": self.accepted, "escalated": self.escalated,
+            "calls": self.calls, "latency_s": round(self.latency, 4),
+            "mean_latency_s": round(self.latency / self.calls, 4) if self.calls else 0.0,
+            "estimated_cost_usd": round(self.cost, 6),
+            "agreement_with_next": self.agreed / self.compared if self.compared else None,
+            "accuracy": self.correct / self.labeled if self.labeled else None,
+        }
+
+
+@dataclass
+class RoutingReport:
+    """Final verdicts and per-tier statistics of one routing run."""
+    results: Dict[str, ValidationResult]
+    decided_by: Dict[str, str]
+    stats: Dict[str, TierStats]
+    wall_time: float = 0.0
+    labels: Dict[str, bool] = field(default_factory=dict)
+
+    @property
+    def llm_calls(self) -> int:
+        return sum(s.calls for name, s in self.stats.items() if name != "rules")
+
+    def accuracy(self) -> Optional[float]:
+        """Share of labeled records whose final verdict matches the label."""
+        scored = [self.results[i].is_valid == label for i, label in self.labels.items()
+                  if i in self.results]
+        return sum(scored) / len(scored) if scored else None
+
+    def summary(self) -> Dict:
+        return {
+            "records": len(self.results),
+            "llm_calls": self.llm_calls,
+            "llm_calls_without_routing": len(self.results),
+            "wall_time_s": round(self.wall_time, 4),
+            "estimated_cost_usd": round(sum(s.cost for s in self.stats.values()), 6),
+            "accuracy": self.accuracy(),
+            "tiers": {name: stats.to_dict() for name, stats in self.stats.items()},
+        }
+
+
+class ValidationRouter:
+    """Routes records through rule-based and LLM validation tiers."""
+
+    def __init__(self,
+                 tiers: Optional[Sequence[Tier]] = None,
+                 checker: Optional[DataQualityChecker] = None,
+                 cache: Optional[ResponseCache] = None,
+                 concurrency: int = 8):
+        """Configure the tiers.
+
+        Args:
+            tiers: LLM tiers after the rule-based one, cheapest first. Defaults to
+                :data:`CHEAP_MODEL` then :data:`STRONG_MODEL`.
+            checker: Rule-based checker for the first tier
+            cache: Response cache shared by the default LLM validators
+            concurrency: Maximum LLM requests in flight per tier
+        """
+        self.checker = checker or DataQualityChecker()
+        if tiers is None:
+            cache = cache if cache is not None else ResponseCache()
+            tiers = [Tier("cheap", LCAValidator(CHEAP_MODEL, cache), min_confidence=0.8),
+                     Tier("strong", LCAValidator(STRONG_MODEL, cache))]
+        # Rule verdicts are confident only when nothing failed (confidence 1.0)
+        self.tiers: List[Tier] = [Tier("rules", min_confidence=1.0, escalate_invalid=True),
+                                  *tiers]
+        self.concurrency = concurrency
+
+    async def route(self, records: Dict[str, Dict],
+                    labels: Optional[Dict[str, bool]] = None) -> RoutingReport:
+        """Validate records, escalating uncertain ones tier by tier.
+
+        Args:
+            records: Record ID -> extracted EPD data
+            labels: Record ID -> whether the record is actually valid
+        Returns:
+            RoutingReport with the deciding tier of every record and per-tier stats
+        """
+        labels = labels or {}
+        start = time.perf_counter()
+        stats = {tier.name: TierStats() for tier in self.tiers}
+        results: Dict[str, ValidationResult] = {}
+        decided_by: Dict[str, str] = {}
+
+        pending = list(records)
+        previous: Dict[str, ValidationResult] = {}
+        for i, tier in enumerate(self.tiers):
+            tier_stats = stats[tier.name]
+            verdicts = await self._run_tier(tier, {r: records[r] for r in pending}, tier_stats)
+            if previous:
+                prior = stats[self.tiers[i - 1].name]
+                prior.compared += len(verdicts)
+                prior.agreed += sum(previous[r].is_valid == v.is_valid
+                                    for r, v in verdicts.items())
+
+            last = i == len(self.tiers) - 1
+            escalated = []
+            for record_id, verdict in verdicts.items():
+                if last or tier.accepts(verdict):
+                    results[record_id], decided_by[record_id] = verdict, tier.name
+                    tier_stats.accepted += 1
+                else:
+                    escalated.append(record_id)
+                if record_id in labels:
+                    tier_stats.labeled += 1
+                    tier_stats.correct += verdict.is_valid == labels[record_id]
+            tier_stats.escalated = len(escalated)
+            pending, previous = escalated, verdicts
+            if not pending:
+                break
+
+        return RoutingReport(results=results, decided_by=decided_by, stats=stats,
+                             wall_time=time.perf_counter() - start, labels=dict(labels))
+
+    async def _run_tier(self, tier: Tier, records: Dict[str, Dict],
+                        stats: TierStats) -> Dict[str, ValidationResult]:
+        stats.seen += len(records)
+        if tier.validator is None:
+            start = time.perf_counter()
+            verdicts = self.checker.check_quality_bulk(flatten_impact_categories(records),
+                                                       ids=list(records))
+            stats.latency += time.perf_counter() - start
+            return verdicts
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        input_price, output_price = MODEL_PRICES.get(tier.validator.model, (0.0, 0.0))
+
+        async def validate(record_id: str) -> Tuple[str, ValidationResult]:
+            async with semaphore:
+                start = time.perf_counter()
+                verdict = await tier.validator.validate_extraction(records[record_id])
+                stats.latency += time.perf_counter() - start
+            tokens = PROMPT_TOKENS + estimate_tokens(json.dumps(records[record_id], default=str))
+            stats.calls += 1
+            stats.cost += (tokens * input_price + VERDICT_TOKENS * output_price) / 1e6
+            return record_id, verdict
+
+        return dict(await asyncio.gather(*(validate(r) for r in records)))
@@ -0,0 +1,234 @@
+"""Streaming, chunked ingestion of inventory and background CSV templates.
+
+Large inventories (rows shaped like ``rock-wool-allocation-template.csv``) and background
+databases (shaped like ``rock-wool-background-template.csv``, one column per dataset)
+are read in chunks of at most ``chunksize`` rows, so peak memory does not grow with the
+file size:
+
+- inventory rows are validated and summed per background dataset as they stream past;
+  the only state kept is one amount per distinct dataset
+- the background is then streamed with only the columns of the datasets the inventory
+  actually uses, and each chunk of impact categories is characterized and discarded
+
+Rejected rows are reported with their line number instead of aborting the run.
+
+Example:
+    >>> impacts, report = LCAProcessor().calculate_impacts_streaming(
+    ...     "inventory.csv", "background.csv", chunksize=50_000)
+    >>> report.rejected, report.issues[:3]
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .matrix_lca import FLOW_TO_BACKGROUND
+from .units import UnitRegistry
+
+INVENTORY_COLUMNS = ["Process", "Input", "Unit", "Amount per m2"]
+BACKGROUND_KEYS = ["Impact Category", "Unit"]
+DEFAULT_CHUNKSIZE = 100_000
+MAX_REPORTED_ISSUES = 1_000
+
+
+@dataclass
+class RowIssue:
+    """A row that was rejected or only partly used."""
+    path: str
+    line: int
+    message: str
+
+
+@dataclass
+class StreamReport:
+    """Row counts and issues collected while streaming a file."""
+    rows: int = 0
+    rejected: int = 0
+    issues: List[RowIssue] = field(default_factory=list)
+
+    def add_issues(self, path: Union[str, Path], lines: np.ndarray, message: str) -> None:
+        room = MAX_REPORTED_ISSUES - len(self.issues)
+        self.issues.extend(RowIssue(str(path), int(line), message) for line in lines[:room])
+
+    def merge(self, other: "StreamReport") -> "StreamReport":
+        return StreamReport(rows=self.rows + other.rows,
+                            rejected=self.rejected + other.rejected,
+                            issues=(self.issues + other.issues)[:MAX_REPORTED_ISSUES])
+
+
+def _check_header(path: Union[str, Path], required: List[str]) -> List[str]:
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    missing = [c for c in required if c not in columns]
+    if missing:
+        raise ValueError(f"{path} is missing columns: {missing}")
+    return columns
+
+
+def iter_inventory_chunks(path: Union[str, Path],
+                          report: StreamReport,
+                          registry: Optional[UnitRegistry] = None,
+                          chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Yield validated input rows of an allocation-shaped CSV, chunk by chunk.
+
+    Rows without an input are output/reference rows and are skipped silently. Input rows
+    are rejected, and recorded in ``report``, when the amount is missing, non-numeric or
+    negative, or when the unit cannot be parsed.
+
+    Yields:
+        DataFrames with columns Process, Input, Unit and a float ``Amount per m2``
+    """
+    registry = registry or UnitRegistry()
+    _check_header(path, INVENTORY_COLUMNS)
+    start = 0
+    for chunk in pd.read_csv(path, usecols=INVENTORY_COLUMNS, chunksize=chunksize,
+                             skipinitialspace=True,
+                             dtype={"Process": str, "Input": str, "Unit": str}):
+        lines = np.arange(start, start + len(chunk)) + 2  # header is line 1
+        start += len(chunk)
+        inputs = chunk["Input"].notna() & (chunk["Input"].str.strip() != "")
+        chunk, lines = chunk[inputs], lines[inputs.to_numpy()]
+        report.rows += len(chunk)
+
+        amounts = pd.to_numeric(chunk["Amount per m2"], errors="coerce")
+        checks = [(amounts.isna(), "missing or non-numeric amount"),
+                  (amounts < 0, "negative amount"),
+                  (chunk["Unit"].isna(), "missing unit")]
+        units = chunk["Unit"].dropna().unique()
+        bad_units = [u for u in units if not _parses(registry, u)]
+        checks.append((chunk["Unit"].isin(bad_units), "unknown unit"))
+
+        valid = np.ones(len(chunk), dtype=bool)
+        for failed, message in checks:
+            failed = failed.to_numpy() & valid
+            report.add_issues(path, lines[failed], message)
+            valid &= ~failed
+        report.rejected += int((~valid).sum())
+        if valid.any():
+            yield chunk[valid].assign(**{"Amount per m2": amounts[valid].astype(float)})
+
+
+def _parses(registry: UnitRegistry, unit: str) -> bool:
+    try:
+        registry.intern(unit)
+    except ValueError:
+        return False
+    return True
+
+
+def stream_inventory(path: Union[str, Path],
+                     flow_map: Optional[Dict[str, str]] = None,
+                     registry: Optional[UnitRegistry] = None,
+                     chunksize: int = DEFAULT_CHUNKSIZE
+                     ) -> Tuple[Dict[str, float], Dict[str, str], StreamReport]:
+    """Sum the amounts of an allocation-shaped CSV per background dataset.
+
+    Amounts of the same dataset given in different units are converted to the first
+    unit seen for it; rows whose unit measures a different quantity (``kWh`` for a
+    dataset first seen in ``kg``) are rejected and recorded in the report.
+
+    Args:
+        path: Inventory CSV with Process, Input, Unit and Amount per m2 columns
+        flow_map: Input name -> background dataset; defaults to ``FLOW_TO_BACKGROUND``,
+            names missing from the map are used as they are
+        registry: Unit registry used for validation and conversion
+        chunksize: Rows read at a time
+    Returns:
+        ``({dataset: amount}, {dataset: unit}, report)``
+    """
+    flow_map = FLOW_TO_BACKGROUND if flow_map is None else flow_map
+    registry = registry or UnitRegistry()
+    report = StreamReport()
+    totals: Dict[str, float] = {}
+    units: Dict[str, str] = {}
+    for chunk in iter_inventory_chunks(path, report, registry, chunksize):
+        names = chunk["Input"].str.strip()
+        flows = names.map(flow_map).fillna(names)
+        for flow, unit in chunk.groupby(flows, sort=False)["Unit"].first().items():
+            units.setdefault(flow, unit)
+        pairs = pd.DataFrame({"unit": chunk["Unit"], "target": flows.map(units)})
+        mismatched = pd.Series(False, index=chunk.index)
+        for unit, target in pairs.drop_duplicates().itertuples(index=False):
+            if not registry.compatible(unit, target):
+                rows = (pairs["unit"] == unit) & (pairs["target"] == target)
+                report.add_issues(path, chunk.index[rows].to_numpy() + 2,
+                                  f"unit {unit!r} cannot be converted to {target!r}")
+                mismatched |= rows
+        if mismatched.any():
+            report.rejected += int(mismatched.sum())
+            chunk, flows = chunk[~mismatched], flows[~mismatched]
+            if chunk.empty:
+                continue
+        amounts = registry.convert(chunk["Amount per m2"], chunk["Unit"], flows.map(units))
+        for flow, amount in amounts.groupby(flows, sort=False).sum().items():
+            totals[flow] = totals.get(flow, 0.0) + float(amount)
+    return totals, units, report
+
+
+def iter_background_chunks(path: Union[str, Path],
+                           flows: List[str],
+                           report: StreamReport,
+                           chunksize: int = DEFAULT_CHUNKSIZE
+                           ) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """Yield impact categories of a background-shaped CSV with factors for ``flows`` only.
+
+    Only the requested dataset columns are parsed. Rows without an impact category are
+    rejected; non-numeric factors count as zero and are reported.
+
+    Yields:
+        ``(categories, factors)``: the Impact Category/Unit columns of the chunk and a
+        (rows x flows) float array aligned with ``flows``
+    """
+    columns = _check_header(path, BACKGROUND_KEYS)
+    present = [f for f in flows if f in columns]
+    start = 0
+    for chunk in pd.read_csv(path, usecols=BACKGROUND_KEYS + present, chunksize=chunksize,
+                             skipinitialspace=True,
+                             dtype={"Impact Category": str, "Unit": str}):
+        lines = np.arange(start, start + len(chunk)) + 2
+        start += len(chunk)
+        report.rows += len(chunk)
+
+        valid = chunk["Impact Category"].notna().to_numpy()
+        report.add_issues(path, lines[~valid], "missing impact category")
+        report.rejected += int((~valid).sum())
+        chunk, lines = chunk[valid], lines[valid]
+
+        raw = chunk[present]
+        values = raw.apply(pd.to_numeric, errors="coerce")
+        bad = (values.isna() & raw.notna()).any(axis=1).to_numpy()
+        report.add_issues(path, lines[bad], "non-numeric factor treated as 0")
+
+        factors = np.zeros((len(chunk), len(flows)))
+        factors[:, [flows.index(f) for f in present]] = values.fillna(0.0).to_numpy(float)
+        yield chunk[BACKGROUND_KEYS].reset_index(drop=True), factors
+
+
+def stream_impacts(inventory_path: Union[str, Path],
+                   background_path: Union[str, Path],
+                   flow_map: Optional[Dict[str, str]] = None,
+                   registry: Optional[UnitRegistry] = None,
+                   chunksize: int = DEFAULT_CHUNKSIZE
+                   ) -> Tuple[Dict[str, float], StreamReport]:
+    """Characterize a streamed inventory against a streamed background database.
+
+    Returns:
+        ``({category: impact}, report)``; inputs with no background dataset are reported
+        and contribute nothing, as in ``LCAProcessor.calculate_impacts``
+    """
+    inventory, _, report = stream_inventory(inventory_path, flow_map, registry, chunksize)
+    flows = list(inventory)
+    amounts = np.array([inventory[f] for f in flows])
+    background = StreamReport()
+    columns = _check_header(background_path, BACKGROUND_KEYS)
+    background.issues.extend(
+        RowIssue(str(background_path), 1, f"no background dataset for {flow!r}")
+        for flow in flows if flow not in columns
+    )
+    impacts: Dict[str, float] = {}
+    for categories, factors in iter_background_chunks(background_path, flows, background,
+                                                      chunksize):
+        impacts.update(zip(categories["Impact Category"], map(float, factors @ amounts)))
+    return impacts, report.merge(background)
@@ -0,0 +1,472 @@
+"""Lightweight instrumentation of the hot paths: spans, LLM usage and cost, counters.
+
+Telemetry is off by default. While it is off, the hooks in the package (the
+:func:`traced` methods of ``EPDExtractor``, ``LCAProcessor``, ``LCAValidator`` and
+``DataQualityChecker``, and the :func:`span`, :func:`count` and :func:`record_llm`
+calls in the LLM client and the caches) cost one check of a module global each.
+
+When on, a :class:`Telemetry` collects:
+
+- spans: named, timed sections with attributes, nested through a context variable so
+  a span opened in a task or worker thread knows its parent (``pdf.parse`` inside
+  ``extraction.extract_from_pdf``);
+- LLM usage per model as reported by the provider (input, output and prompt-cache
+  tokens) and its cost from :data:`MODEL_PRICES`;
+- counters with labels, e.g. ``llm_retries{provider="anthropic"}`` and
+  ``cache_hits{cache="responses"}``.
+
+:meth:`Telemetry.summary` aggregates them (span count, total, p50, p95 and max
+duration; tokens and cost per model; cache hit rates), :meth:`Telemetry.report` prints
+that as text, and :meth:`Telemetry.write_jsonl` / :meth:`Telemetry.write_prometheus`
+export to a local file (one event per line, or the Prometheus text format for a node
+exporter's textfile collector).
+
+Setting ``LCA_TELEMETRY_DIR`` turns telemetry on for the whole process and writes
+``telemetry.jsonl`` and ``metrics.prom`` there at exit.
+
+Example:
+    >>> with recording() as telemetry:
+    ...     results = asyncio.run(validator.validate_extraction_batch(records))
+    >>> print(telemetry.report())
+    >>> telemetry.write_prometheus("metrics.prom")
+"""
+
+import atexit
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# USD per million (input, output) tokens
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "claude-3-5-haiku-latest": (0.80, 4.00),
+    "claude-3-5-sonnet-latest": (3.00, 15.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+# Price of prompt-cache reads and writes relative to the input price
+CACHE_READ_PRICE = 0.1
+CACHE_WRITE_PRICE = 1.25
+
+DEFAULT_MAX_SPANS = 100_000
+
+_current_span: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "lca_span", default=None)
+_span_ids = itertools.count(1)
+
+
+def llm_cost(model: str, input_tokens: int, output_tokens: int,
+             cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    """Cost in USD of one call; 0 for models without a price (e.g. local models)."""
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (input_price * (input_tokens + CACHE_READ_PRICE * cache_read_tokens
+                           + CACHE_WRITE_PRICE * cache_write_tokens)
+            + output_price * output_tokens) / 1e6
+
+
+class Span:
+    """A timed section; use as a context manager and add attributes with :meth:`set`."""
+
+    __slots__ = ("name", "attrs", "id", "parent", "start", "duration", "error",
+                 "_telemetry", "_token", "_t0")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.id = next(_span_ids)
+        self.parent: Optional[int] = None
+        self.start = 0.0
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        self._telemetry = telemetry
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self.id)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration = time.perf_counter() - self._t0
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self._telemetry._finish(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        event = {"type": "span", "name": self.name, "id": self.id, "parent": self.parent,
+                 "start": self.start, "duration": self.duration}
+        if self.error:
+            event["error"] = self.error
+        event.update(self.attrs)
+        return event
+
+
+class _NoopSpan:
+    """Stands in for a span while telemetry is off."""
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+@dataclass
+class SpanStats:
+    """Aggregate of every span of one name, including those no longer retained."""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    errors: int = 0
+
+
+@dataclass
+class LLMUsage:
+    """Tokens and cost of the calls to one model."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost: float = 0.0
+
+
+def _labels_key(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prometheus_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1) + 0.5))]
+
+
+def _write_atomic(path: Union[str, Path], text: str) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class Telemetry:
+    """Collects spans, LLM usage and counters of one process or one measured block."""
+
+    def __init__(self, max_spans: int = DEFAULT_MAX_SPANS,
+                 parent: Optional["Telemetry"] = None):
+        """Create an empty recorder.
+
+        Args:
+            max_spans: Spans kept for export and percentiles; older ones are dropped
+                but stay counted in the aggregates
+            parent: Recorder that receives everything recorded here as well
+        """
+        self.spans: deque = deque(maxlen=max_spans)
+        self.span_stats: Dict[str, SpanStats] = {}
+        self.llm: Dict[str, LLMUsage] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self.parent = parent
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attrs: Any) -> Span:
+        return Span(self, name, attrs)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+            stats = self.span_stats.get(span.name)
+            if stats is None:
+                stats = self.span_stats[span.name] = SpanStats()
+            stats.count += 1
+            stats.total += span.duration
+            stats.max = max(stats.max, span.duration)
+            stats.errors += span.error is not None
+        if self.parent is not None:
+            self.parent._finish(span)
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        if self.parent is not None:
+            self.parent.count(name, value, **labels)
+
+    def record_llm(self, model: str, input_tokens: int, output_tokens: int,
+                   cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+        """Add one call's usage; returns its cost."""
+        cost = llm_cost(model, input_tokens, output_tokens, cache_read_tokens,
+                        cache_write_tokens)
+        with self._lock:
+            usage = self.llm.get(model)
+            if usage is None:
+                usage = self.llm[model] = LLMUsage()
+            usage.calls += 1
+            usage.input_tokens += input_tokens
+            usage.output_tokens += output_tokens
+            usage.cache_read_tokens += cache_read_tokens
+            usage.cache_write_tokens += cache_write_tokens
+            usage.cost += cost
+        if self.parent is not None:
+            self.parent.record_llm(model, input_tokens, output_tokens, cache_read_tokens,
+                                   cache_write_tokens)
+        return cost
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Value of a counter; without labels, summed over all label values."""
+        if labels:
+            return self.counters.get((name, _labels_key(labels)), 0)
+        return sum(v for (n, _), v in self.counters.items() if n == name)
+
+    def cache_hit_rates(self) -> Dict[str, float]:
+        """Hit rate per cache, from the ``cache_hits`` / ``cache_misses`` counters."""
+        caches = {dict(labels).get("cache", "") for name, labels in self.counters
+                  if name in ("cache_hits", "cache_misses")}
+        rates = {}
+        for cache in sorted(caches):
+            hits = self.counter("cache_hits", cache=cache)
+            total = hits + self.counter("cache_misses", cache=cache)
+            rates[cache] = hits / total if total else 0.0
+        return rates
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates of everything recorded so far."""
+        with self._lock:
+            durations: Dict[str, List[float]] = {}
+            for span in self.spans:
+                durations.setdefault(span.name, []).append(span.duration)
+            spans = {
+                name: {"count": s.count, "total_s": round(s.total, 6),
+                       "mean_s": round(s.total / s.count, 6),
+                       "p50_s": round(_percentile(durations.get(name, []), 0.5), 6),
+                       "p95_s": round(_percentile(durations.get(name, []), 0.95), 6),
+                       "max_s": round(s.max, 6), "errors": s.errors}
+                for name, s in sorted(self.span_stats.items())
+            }
+            llm = {model: {"calls": u.calls, "input_tokens": u.input_tokens,
+                           "output_tokens": u.output_tokens,
+                           "cache_read_tokens": u.cache_read_tokens,
+                           "cache_write_tokens": u.cache_write_tokens,
+                           "cost_usd": round(u.cost, 6)}
+                   for model, u in sorted(self.llm.items())}
+            counters = {name + _prometheus_labels(dict(labels)): value
+                        for (name, labels), value in sorted(self.counters.items())}
+        return {
+            "elapsed_s": round(time.time() - self.started, 6),
+            "spans": spans,
+            "llm": llm,
+            "llm_total": {key: sum(u[key] for u in llm.values())
+                          for key in ("calls", "input_tokens", "output_tokens", "cost_usd")},
+            "counters": counters,
+            "cache_hit_rates": self.cache_hit_rates(),
+        }
+
+    def report(self) -> str:
+        """:meth:`summary` as a text report: where the time, tokens and money went."""
+        summary = self.summary()
+        lines = [f"{'span':<36}{'count':>7}{'total s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+                 f"{'max ms':>9}{'errors':>7}"]
+        for name, s in sorted(summary["spans"].items(), key=lambda i: -i[1]["total_s"]):
+            lines.append(f"{name:<36}{s['count']:>7}{s['total_s']:>10.3f}"
+                         f"{1e3 * s['p50_s']:>9.1f}{1e3 * s['p95_s']:>9.1f}"
+                         f"{1e3 * s['max_s']:>9.1f}{s['errors']:>7}")
+        if summary["llm"]:
+            lines += ["", f"{'model':<36}{'calls':>7}{'input tok':>11}{'output tok':>11}"
+                          f"{'cached tok':>11}{'cost USD':>10}"]
+            for model, u in summary["llm"].items():
+                lines.append(f"{model:<36}{u['calls']:>7}{u['input_tokens']:>11}"
+                             f"{u['output_tokens']:>11}{u['cache_read_tokens']:>11}"
+                             f"{u['cost_usd']:>10.4f}")
+        if summary["cache_hit_rates"]:
+            lines += ["", "cache hit rates: " + ", ".join(
+                f"{cache} {rate:.0%}" for cache, rate in summary["cache_hit_rates"].items())]
+        if summary["counters"]:
+            lines += ["", "counters: " + ", ".join(
+                f"{name} {value:g}" for name, value in summary["counters"].items())]
+        return "\n".join(lines)
+
+    def events(self) -> Iterator[Dict[str, Any]]:
+        """Retained spans, then LLM usage per model and counters, as JSON-ready dicts."""
+        with self._lock:
+            spans = list(self.spans)
+            llm = dict(self.llm)
+            counters = dict(self.counters)
+        for span in spans:
+            yield span.to_dict()
+        for model, usage in llm.items():
+            yield {"type": "llm", "model": model, **usage.__dict__}
+        for (name, labels), value in counters.items():
+            yield {"type": "counter", "name": name, "labels": dict(labels), "value": value}
+
+    def write_jsonl(self, path: Union[str, Path]) -> None:
+        """Write :meth:`events`, one JSON object per line, atomically."""
+        _write_atomic(path, "".join(json.dumps(e, default=str) + "\n"
+                                    for e in self.events()))
+
+    def write_prometheus(self, path: Union[str, Path], prefix: str = "lca") -> None:
+        """Write the aggregates in the Prometheus text exposition format, atomically."""
+        summary = self.summary()
+        lines = [f"# TYPE {prefix}_span_seconds summary"]
+        for name, s in summary["spans"].items():
+            for q in ("0.5", "0.95"):
+                value = s["p50_s"] if q == "0.5" else s["p95_s"]
+                lines.append(f"{prefix}_span_seconds"
+                             f"{_prometheus_labels({'span': name, 'quantile': q})} {value}")
+            lines.append(f"{prefix}_span_seconds_sum{_prometheus_labels({'span': name})} "
+                         f"{s['total_s']}")
+            lines.append(f"{prefix}_span_seconds_count{_prometheus_labels({'span': name})} "
+                         f"{s['count']}")
+        lines.append(f"# TYPE {prefix}_span_errors_total counter")
+        lines += [f"{prefix}_span_errors_total{_prometheus_labels({'span': name})} "
+                  f"{s['errors']}" for name, s in summary["spans"].items()]
+        lines += [f"# TYPE {prefix}_llm_calls_total counter",
+                  f"# TYPE {prefix}_llm_tokens_total counter",
+                  f"# TYPE {prefix}_llm_cost_usd_total counter"]
+        for model, u in summary["llm"].items():
+            lines.append(f"{prefix}_llm_calls_total{_prometheus_labels({'model': model})} "
+                         f"{u['calls']}")
+            for kind in ("input", "output", "cache_read", "cache_write"):
+                labels = _prometheus_labels({"model": model, "kind": kind})
+                lines.append(f"{prefix}_llm_tokens_total{labels} {u[kind + '_tokens']}")
+            lines.append(f"{prefix}_llm_cost_usd_total{_prometheus_labels({'model': model})} "
+                         f"{u['cost_usd']}")
+        with self._lock:
+            counters = sorted(self.counters.items())
+        for name in dict.fromkeys(name for (name, _), _ in counters):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines += [f"{prefix}_{name}_total{_prometheus_labels(dict(labels))} {value:g}"
+                      for (n, labels), value in counters if n == name]
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+# The recorder hooks report to; None while telemetry is off
+_active: Optional[Telemetry] = None
+
+
+def get_telemetry() -> Optional[Telemetry]:
+    return _active
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def enable(telemetry: Optional[Telemetry] = None) -> Telemetry:
+    """Turn telemetry on for the process, recording into ``telemetry`` (or a new one)."""
+    global _active
+    _active = telemetry if telemetry is not None else Telemetry()
+    return _active
+
+
+def disable() -> Optional[Telemetry]:
+    """Turn telemetry off; returns the recorder that was active."""
+    global _active
+    telemetry, _active = _active, None
+    return telemetry
+
+
+@contextmanager
+def recording(max_spans: int = DEFAULT_MAX_SPANS) -> Iterator[Telemetry]:
+    """Record a block into a fresh :class:`Telemetry`.
+
+    Telemetry that was already on keeps receiving everything recorded in the block.
+    """
+    global _active
+    previous = _active
+    _active = Telemetry(max_spans, parent=previous)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def span(name: str, **attrs: Any) -> Union[Span, _NoopSpan]:
+    """A span of the active recorder, or a no-op while telemetry is off."""
+    telemetry = _active
+    return _NOOP if telemetry is None else Span(telemetry, name, attrs)
+
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    telemetry = _active
+    if telemetry is not None:
+        telemetry.count(name, value, **labels)
+
+
+def record_llm(model: str, input_tokens: int, output_tokens: int,
+               cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> None:
+    telemetry = _active
+    if telemetry is not None:
+        telemetry.record_llm(model, input_tokens, output_tokens, cache_read_tokens,
+                             cache_write_tokens)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator recording every call of a function or coroutine function as a span."""
+    def decorate(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _active is None:
+                    return await func(*args, **kwargs)
+                with Span(_active, name, {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with Span(_active, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _export_at_exit(directory: Path) -> None:
+    telemetry = _active
+    if telemetry is not None:
+        telemetry.write_jsonl(directory / "telemetry.jsonl")
+        telemetry.write_prometheus(directory / "metrics.prom")
+
+
+if os.getenv("LCA_TELEMETRY_DIR"):
+    enable()
+    atexit.register(_export_at_exit, Path(os.environ["LCA_TELEMETRY_DIR"]))
@@ -0,0 +1,184 @@
+"""Monte Carlo uncertainty propagation for matrix LCA models.
+
+Each background flow of a :class:`MatrixLCA` model can be given a distribution. Samples
+are drawn for all flows at once as ``(iterations x flows)`` arrays and characterized with
+a single sparse product per chunk, so memory stays bounded by ``chunk_size`` however many
+iterations are requested. Chunks can be spread over a process pool with independent
+random streams, and the result is reproducible for a given seed and chunking.
+
+Example:
+    >>> distributions = {"Electricity medium voltage": Lognormal(gsd=1.2),
+    ...                  "Truck transport": pedigree_lognormal((2, 3, 1, 2, 3))}
+    >>> result = MonteCarloLCA(model, distributions).run(iterations=100_000, seed=42)
+    >>> result.summary()["Global Warming"]["p97.5"]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .matrix_lca import MatrixLCA
+
+# Variance of the underlying normal added per pedigree score 1-5 (ecoinvent v3)
+PEDIGREE_VARIANCES: Dict[str, Tuple[float, ...]] = {
+    "reliability": (0.0, 0.0006, 0.002, 0.008, 0.04),
+    "completeness": (0.0, 0.0001, 0.0006, 0.002, 0.008),
+    "temporal": (0.0, 0.0002, 0.002, 0.008, 0.04),
+    "geographical": (0.0, 0.000025, 0.0001, 0.0006, 0.002),
+    "technological": (0.0, 0.0006, 0.008, 0.04, 0.12),
+}
+
+DEFAULT_PERCENTILES = (2.5, 50.0, 97.5)
+
+
+@dataclass(frozen=True)
+class Lognormal:
+    """Lognormal distribution around the deterministic amount (its median)."""
+    gsd: float
+
+    @property
+    def sigma(self) -> float:
+        return float(np.log(self.gsd))
+
+
+@dataclass(frozen=True)
+class Triangular:
+    """Triangular distribution; the mode defaults to the deterministic amount."""
+    minimum: float
+    maximum: float
+    mode: Optional[float] = None
+
+
+def pedigree_lognormal(scores: Sequence[int], basic_gsd: float = 1.05) -> Lognormal:
+    """Lognormal distribution derived from a pedigree matrix.
+
+    Args:
+        scores: Scores 1-5 for reliability, completeness, temporal, geographical and
+            technological correlation, in that order
+        basic_gsd: Geometric standard deviation of the basic uncertainty
+    """
+    if len(scores) != len(PEDIGREE_VARIANCES):
+        raise ValueError(f"Expected {len(PEDIGREE_VARIANCES)} pedigree scores, got {len(scores)}")
+    variance = np.log(basic_gsd) ** 2 + sum(
+        table[score - 1] for table, score in zip(PEDIGREE_VARIANCES.values(), scores)
+    )
+    return Lognormal(gsd=float(np.exp(np.sqrt(variance))))
+
+
+@dataclass
+class UncertaintyResult:
+    """Monte Carlo samples of the impacts, one row per iteration."""
+    categories: List[str]
+    units: Dict[str, str]
+    deterministic: np.ndarray
+    samples: np.ndarray
+
+    def percentiles(self, q: Sequence[float] = DEFAULT_PERCENTILES) -> np.ndarray:
+        """(len(q) x categories) percentiles of the sampled impacts."""
+        return np.percentile(self.samples, q, axis=0)
+
+    def summary(self, q: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """Per-category statistics, ready to pass to ``LCAValidator.validate_uncertainty``."""
+        values = self.percentiles(q)
+        mean, std = self.samples.mean(axis=0), self.samples.std(axis=0, ddof=1)
+        summary = {}
+        for i, category in enumerate(self.categories):
+            stats = {"unit": self.units.get(category, ""),
+                     "deterministic": float(self.deterministic[i]),
+                     "mean": float(mean[i]), "std": float(std[i])}
+            stats.update({f"p{p:g}": float(values[j, i]) for j, p in enumerate(q)})
+            summary[category] = stats
+        return summary
+
+
+_worker_engine: Optional["MonteCarloLCA"] = None
+
+
+def _init_worker(engine: "MonteCarloLCA") -> None:
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _run_chunk(args: Tuple[int, np.random.SeedSequence]) -> np.ndarray:
+    size, seed = args
+    assert _worker_engine is not None
+    return _worker_engine.simulate(size, np.random.default_rng(seed))
+
+
+class MonteCarloLCA:
+    """Propagates per-flow uncertainty through a matrix LCA model."""
+
+    def __init__(self, model: MatrixLCA, distributions: Dict[str, object],
+                 demand: Optional[np.ndarray] = None):
+        """Precompile the distributions into index and parameter arrays.
+
+        Args:
+            model: Matrix model providing the flows and characterization matrix
+            distributions: Background flow name -> Lognormal or Triangular
+            demand: Final demand; defaults to the model's functional unit
+        """
+        unknown = set(distributions) - set(model.flows)
+        if unknown:
+            raise ValueError(f"Distributions given for unknown flows: {sorted(unknown)}")
+        self.model = model
+        self.base = np.asarray(model.interventions @ model.scaling(demand)).ravel()
+        index = {flow: i for i, flow in enumerate(model.flows)}
+
+        lognormal = [(index[f], d) for f, d in distributions.items() if isinstance(d, Lognormal)]
+        self._lognormal_idx = np.array([i for i, _ in lognormal], dtype=np.intp)
+        self._lognormal_sigma = np.array([d.sigma for _, d in lognormal])
+
+        triangular = [(index[f], d) for f, d in distributions.items()
+                      if isinstance(d, Triangular)]
+        self._triangular_idx = np.array([i for i, _ in triangular], dtype=np.intp)
+        self._triangular_params = np.array(
+            [(d.minimum, self.base[i] if d.mode is None else d.mode, d.maximum)
+             for i, d in triangular]
+        ).reshape(-1, 3)
+        if len(lognormal) + len(triangular) != len(distributions):
+            raise TypeError("Distributions must be Lognormal or Triangular")
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw ``(size x flows)`` background inventories."""
+        inventories = np.tile(self.base, (size, 1))
+        if len(self._lognormal_idx):
+            noise = rng.standard_normal((size, len(self._lognormal_idx)))
+            inventories[:, self._lognormal_idx] *= np.exp(noise * self._lognormal_sigma)
+        if len(self._triangular_idx):
+            low, mode, high = self._triangular_params.T
+            inventories[:, self._triangular_idx] = rng.triangular(
+                low, mode, high, size=(size, len(self._triangular_idx))
+            )
+        return inventories
+
+    def simulate(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Sample and characterize one chunk: ``(size x categories)`` impacts."""
+        return self.model.impacts_for_inventories(self.sample(size, rng))
+
+    def run(self, iterations: int = 10_000, chunk_size: int = 10_000,
+            seed: Optional[int] = None, workers: int = 0) -> UncertaintyResult:
+        """Run the simulation in chunks of at most ``chunk_size`` iterations.
+
+        Args:
+            iterations: Total number of Monte Carlo iterations
+            chunk_size: Iterations sampled at once; bounds the sample matrix memory
+            seed: Seed for reproducible results
+            workers: Processes to spread the chunks over; 0 runs in this process
+        """
+        sizes = [min(chunk_size, iterations - start) for start in range(0, iterations, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        if workers:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self,)) as pool:
+                chunks = list(pool.map(_run_chunk, zip(sizes, seeds)))
+        else:
+            chunks = [self.simulate(size, np.random.default_rng(s))
+                      for size, s in zip(sizes, seeds)]
+        return UncertaintyResult(
+            categories=self.model.categories,
+            units=self.model.units,
+            deterministic=np.asarray(self.model.characterization @ self.base).ravel(),
+            samples=np.concatenate(chunks) if chunks else np.empty((0, len(self.model.categories))),
+        )
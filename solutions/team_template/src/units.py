@@ -0,0 +1,190 @@
+"""Unit registry for vectorized LCA unit conversion.
+
+Unit strings are parsed once into interned integer IDs. Each ID carries a *kind* (the
+physical dimension plus, for characterized units, the reference substance) and a factor
+to that kind's base unit, so converting between two units of the same kind is a single
+multiplication. Spelling variants such as ``"kg CO2-Eq"``, ``"kg CO2 eq."`` and
+``"kg CO2e"`` resolve to the same unit, and compound units like ``"kg CO2 eq./kWh"`` are
+split into numerator and denominator.
+
+Example:
+    >>> registry = UnitRegistry()
+    >>> registry.convert(np.array([1500.0, 2.0]), "g CO2 eq.", "kg CO2-Eq")
+    array([1.5  , 0.002])
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Base units and their factor to the dimension's base (g, J, m3, m2, m2a, tkm, unit)
+BASE_UNITS: Dict[str, Tuple[str, float]] = {
+    "g": ("mass", 1.0),
+    "t": ("mass", 1e6),
+    "J": ("energy", 1.0),
+    "Wh": ("energy", 3600.0),
+    "cal": ("energy", 4.184),
+    "l": ("volume", 1e-3),
+    "L": ("volume", 1e-3),
+    "m3": ("volume", 1.0),
+    "m2": ("area", 1.0),
+    "m2a": ("area_time", 1.0),
+    "tkm": ("transport", 1.0),
+    "km": ("length", 1e3),
+    "m": ("length", 1.0),
+    "Bq": ("radioactivity", 1.0),
+    "unit": ("count", 1.0),
+    "piece": ("count", 1.0),
+    "p": ("count", 1.0),
+}
+
+SI_PREFIXES: Dict[str, float] = {
+    "n": 1e-9, "µ": 1e-6, "u": 1e-6, "m": 1e-3, "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12,
+}
+
+_EQUIVALENT = re.compile(r"(?:[\s-]*(?:eq|equivalents?)\.?|(?<=\d)e)$", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+Kind = Tuple[str, str, str]  # (numerator dimension, denominator dimension, substance)
+
+
+def _parse_atom(symbol: str) -> Tuple[str, float]:
+    """Resolve a physical unit symbol, with an optional SI prefix, to (dimension, factor)."""
+    if symbol in BASE_UNITS:
+        return BASE_UNITS[symbol]
+    prefix, rest = symbol[:1], symbol[1:]
+    if prefix in SI_PREFIXES and rest in BASE_UNITS:
+        dimension, factor = BASE_UNITS[rest]
+        return dimension, SI_PREFIXES[prefix] * factor
+    raise ValueError(f"Unknown unit symbol: {symbol!r}")
+
+
+def _parse_part(part: str) -> Tuple[str, float, str]:
+    """Parse ``"kg CO2 eq."`` into (dimension, factor, substance)."""
+    tokens = part.split(" ", 1)
+    dimension, factor = _parse_atom(tokens[0])
+    substance = ""
+    if len(tokens) > 1:
+        substance = tokens[1].strip()
+        equivalent = _EQUIVALENT.search(substance) is not None
+        substance = _EQUIVALENT.sub("", substance).upper().replace(" ", "").replace("-", "")
+        if equivalent:
+            substance += " eq"
+    return dimension, factor, substance
+
+
+def parse_unit(unit: str) -> Tuple[Kind, float]:
+    """Parse a unit string into its kind and the factor to that kind's base unit.
+
+    Raises:
+        ValueError: If the string contains an unknown unit symbol.
+    """
+    text = _SPACES.sub(" ", unit.strip())
+    numerator, _, denominator = text.partition("/")
+    num_dim, num_factor, substance = _parse_part(numerator.strip())
+    den_dim, den_factor = "", 1.0
+    if denominator.strip():
+        den_dim, den_factor, den_substance = _parse_part(denominator.strip())
+        if den_substance:
+            raise ValueError(f"Unsupported substance in denominator: {unit!r}")
+    return (num_dim, den_dim, substance), num_factor / den_factor
+
+
+class UnitRegistry:
+    """Interns unit strings and converts arrays of values between them."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._kind_ids: Dict[Kind, int] = {}
+        self._kinds: List[Kind] = []
+        self._unit_kind = np.empty(0, dtype=np.int32)
+        self._unit_factor = np.empty(0, dtype=np.float64)
+
+    def intern(self, unit: str) -> int:
+        """Return the ID of a unit string, parsing it the first time it is seen."""
+        unit_id = self._ids.get(unit)
+        if unit_id is not None:
+            return unit_id
+        kind, factor = parse_unit(unit)
+        kind_id = self._kind_ids.setdefault(kind, len(self._kinds))
+        if kind_id == len(self._kinds):
+            self._kinds.append(kind)
+        unit_id = len(self._names)
+        self._ids[unit] = unit_id
+        self._names.append(unit)
+        self._unit_kind = np.append(self._unit_kind, np.int32(kind_id))
+        self._unit_factor = np.append(self._unit_factor, factor)
+        return unit_id
+
+    def ids(self, units: Union[str, np.ndarray, pd.Series, List[str]]) -> np.ndarray:
+        """Map unit strings (scalar or array-like) to an array of unit IDs.
+
+        Each distinct string is parsed only once, however many rows share it.
+        """
+        if isinstance(units, str):
+            return np.array([self.intern(units)], dtype=np.int32)
+        codes, uniques = pd.factorize(np.asarray(units, dtype=object))
+        if (codes < 0).any():
+            raise ValueError("Missing unit in input")
+        lookup = np.fromiter((self.intern(u) for u in uniques), dtype=np.int32,
+                             count=len(uniques))
+        return lookup[codes]
+
+    def name(self, unit_id: int) -> str:
+        return self._names[unit_id]
+
+    def kind(self, unit: str) -> Kind:
+        """Dimension and reference substance of a unit."""
+        unit_id = self.intern(unit)
+        return self._kinds[self._unit_kind[unit_id]]
+
+    def compatible(self, from_unit: str, to_unit: str) -> bool:
+        return self.kind(from_unit) == self.kind(to_unit)
+
+    def factor(self, from_unit: str, to_unit: str) -> float:
+        """Multiplier converting a value in ``from_unit`` to ``to_unit``."""
+        return float(self.factors(from_unit, to_unit)[0])
+
+    def factors(self, from_units: Union[str, np.ndarray, pd.Series, List[str]],
+                to_units: Union[str, np.ndarray, pd.Series, List[str]]) -> np.ndarray:
+        """Element-wise conversion factors between two unit columns.
+
+        Raises:
+            ValueError: If any pair of units measures different kinds of quantity.
+        """
+        source = self.ids(from_units)
+        target = self.ids(to_units)
+        mismatch = self._unit_kind[source] != self._unit_kind[target]
+        if mismatch.any():
+            i = int(np.argmax(mismatch))
+            a, b = source[i % len(source)], target[i % len(target)]
+            raise ValueError(f"Cannot convert {self._names[a]!r} to {self._names[b]!r}")
+        return self._unit_factor[source] / self._unit_factor[target]
+
+    def factor_matrix(self, units: Optional[List[str]] = None) -> pd.DataFrame:
+        """Conversion factors between every pair of units (NaN where incompatible)."""
+        ids = self.ids(units) if units is not None else np.arange(len(self._names))
+        kinds, factors = self._unit_kind[ids], self._unit_factor[ids]
+        matrix = np.where(kinds[:, None] == kinds[None, :],
+                          factors[:, None] / factors[None, :], np.nan)
+        names = [self._names[i] for i in ids]
+        return pd.DataFrame(matrix, index=names, columns=names)
+
+    def convert(self, values: Union[float, np.ndarray, pd.Series],
+                from_units: Union[str, np.ndarray, pd.Series, List[str]],
+                to_units: Union[str, np.ndarray, pd.Series, List[str]]
+                ) -> Union[float, np.ndarray, pd.Series]:
+        """Convert values between units in a single vectorized operation.
+
+        ``from_units`` and ``to_units`` may each be one unit string or a column of unit
+        strings aligned with ``values``. A pandas Series keeps its index.
+        """
+        factors = self.factors(from_units, to_units)
+        if isinstance(values, pd.Series):
+            return values * (factors if len(factors) > 1 else factors[0])
+        if np.ndim(values) == 0:
+            return float(values) * float(factors[0])
+        return np.asarray(values, dtype=np.float64) * factors
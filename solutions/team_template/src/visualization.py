@@ -1,14 +1,310 @@
+"""Chart templates for LCA results, and headless batch rendering.
+
+Each chart is drawn by a ``draw_*`` function onto a given matplotlib ``Axes``, so the
+same code serves the notebooks (through :class:`LCAVisualizer` and pyplot) and batch
+rendering, which never touches pyplot's global state: :func:`render_chart` draws on a
+:class:`ChartTemplate`, a ``Figure`` on the Agg canvas that is created once per chart
+kind and size in each worker and cleared between charts. :func:`render_batch` spreads
+:class:`ChartJob` s over a process pool, in chunks, and reports per-job failures instead
+of raising.
+
+The output format follows the file suffix: ``.png`` (and other raster formats) at the
+job's DPI, ``.svg`` / ``.pdf`` as vector graphics.
+
+Example:
+    >>> jobs = [ChartJob("impact_comparison", epd, f"charts/{name}.svg", categories=CORE)
+    ...         for name, epd in epds.items()]
+    >>> results = render_batch(jobs, workers=8)
+    >>> [r.error for r in results if not r.ok]
+"""
+
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .table_extraction import SynonymIndex, life_cycle_total, normalize_label
+
+VECTOR_FORMATS = frozenset({"svg", "pdf", "eps", "ps"})
+DEFAULT_SIZE = (8.0, 4.5)
+DEFAULT_DPI = 150
+CHUNK_SIZE = 32
+TEMPLATE_LEFT_MARGIN = 0.32  # share of the figure width for category names
+
+# Values spanning more than this ratio are drawn on a log axis
+LOG_SCALE_RATIO = 1e3
+
+_synonyms: Optional[SynonymIndex] = None
+# Templates per thread: a figure must not be drawn on by two threads at once
+_local = threading.local()
+
+
+def _category_key(name: str) -> str:
+    global _synonyms
+    if _synonyms is None:
+        _synonyms = SynonymIndex()
+    return _synonyms.lookup(str(name)) or normalize_label(str(name))
+
+
+def impact_values(data: Dict, categories: Optional[Sequence[str]] = None
+                  ) -> List[Tuple[str, float, str]]:
+    """``(label, value, unit)`` per category to plot, in the order of ``categories``.
+
+    Categories match any spelling the table synonyms know ("GWP", "Global warming
+    potential"). A total reported without module is used as it is; otherwise the values
+    per life cycle module are summed over stages A to C with
+    :func:`table_extraction.life_cycle_total`, so "A1" is not added to "A1-A3" and
+    module D (beyond the system boundary) is not plotted.
+    """
+    totals: Dict[str, List] = {}
+    by_module: Dict[str, List] = {}
+    for entry in data.get("impact_categories", []):
+        try:
+            value = float(entry.get("value"))
+        except (TypeError, ValueError):
+            continue
+        key = _category_key(entry.get("name", ""))
+        module = entry.get("module")
+        target = by_module if module else totals
+        if key not in target:
+            target[key] = [entry.get("name", key), {} if module else 0.0,
+                           entry.get("unit") or ""]
+        if module:
+            target[key][1][module] = target[key][1].get(module, 0.0) + value
+        else:
+            target[key][1] += value
+    for key, (label, modules, unit) in list(by_module.items()):
+        total = life_cycle_total(modules)
+        if total is None:
+            del by_module[key]
+        else:
+            by_module[key] = [label, total, unit]
+    merged = {**by_module, **totals}
+    keys = [_category_key(c) for c in categories] if categories else list(merged)
+    labels = list(categories) if categories else [merged[k][0] for k in keys]
+    return [(label, merged[key][1], merged[key][2])
+            for label, key in zip(labels, keys) if key in merged]
+
+
+def contribution_values(data: Dict, category: str) -> Dict[str, float]:
+    """Contributions to one category: ``data["contributions"][category]`` if present
+    (``{process: value}``, e.g. a column of ``MatrixLCA.contributions``), otherwise the
+    category's values per life cycle module."""
+    key = _category_key(category)
+    for name, parts in (data.get("contributions") or {}).items():
+        if _category_key(name) == key:
+            return {str(k): float(v) for k, v in parts.items()}
+    parts: Dict[str, float] = defaultdict(float)
+    for entry in data.get("impact_categories", []):
+        if entry.get("module") and _category_key(entry.get("name", "")) == key:
+            try:
+                parts[entry["module"]] += float(entry.get("value"))
+            except (TypeError, ValueError):
+                continue
+    return dict(parts)
+
+
+def draw_impact_comparison(ax: Any, data: Dict,
+                           categories: Optional[Sequence[str]] = None,
+                           title: Optional[str] = None) -> None:
+    """Horizontal bar per impact category, labelled with its value and unit."""
+    values = impact_values(data, categories)
+    if not values:
+        ax.text(0.5, 0.5, "No impact values", ha="center", va="center",
+                transform=ax.transAxes)
+        ax.set_axis_off()
+        return
+    labels = [label for label, _, _ in values]
+    numbers = [value for _, value, _ in values]
+    bars = ax.barh(range(len(values)), numbers, color="C0")
+    ax.set_yticks(range(len(values)), labels, fontsize="small")
+    ax.invert_yaxis()
+    positive = [v for v in numbers if v > 0]
+    if len(positive) == len(numbers) and max(positive) / min(positive) > LOG_SCALE_RATIO:
+        ax.set_xscale("log")
+    ax.bar_label(bars, labels=[f"{v:.3g} {unit}".strip() for _, v, unit in values],
+                 padding=3, fontsize="small")
+    ax.margins(x=0.2)  # room for the labels
+    ax.set_title(title or "Environmental impact categories")
+
+
+def draw_contribution_analysis(ax: Any, data: Dict, category: str,
+                               title: Optional[str] = None, top: int = 8) -> None:
+    """Contributions to one category, largest first; the tail is grouped as "Other"."""
+    parts = sorted(contribution_values(data, category).items(),
+                   key=lambda item: abs(item[1]), reverse=True)
+    if not parts:
+        ax.text(0.5, 0.5, f"No contributions to {category}", ha="center", va="center",
+                transform=ax.transAxes)
+        ax.set_axis_off()
+        return
+    if len(parts) > top:
+        parts = parts[:top - 1] + [("Other", sum(v for _, v in parts[top - 1:]))]
+    total = sum(v for _, v in parts) or 1.0
+    bars = ax.barh(range(len(parts)), [v for _, v in parts],
+                   color=[f"C{i % 10}" for i in range(len(parts))])
+    ax.set_yticks(range(len(parts)), [name for name, _ in parts], fontsize="small")
+    ax.invert_yaxis()
+    ax.bar_label(bars, labels=[f"{100 * v / total:.0f}%" for _, v in parts],
+                 padding=3, fontsize="small")
+    ax.margins(x=0.1)
+    ax.set_title(title or f"Contributions to {category}")
+
+
+DRAWERS = {
+    "impact_comparison": draw_impact_comparison,
+    "contribution": draw_contribution_analysis,
+}
+
+
+class ChartTemplate:
+    """A reusable figure with one axes on the Agg canvas, independent of pyplot.
+
+    The margins are fixed, with room for category names on the left: a layout engine
+    would cost an extra draw pass per chart.
+    """
+
+    def __init__(self, size: Tuple[float, float] = DEFAULT_SIZE):
+        self.figure = Figure(figsize=size)
+        FigureCanvasAgg(self.figure)
+        self.figure.subplots_adjust(left=TEMPLATE_LEFT_MARGIN, right=0.97, top=0.9,
+                                    bottom=0.1)
+        self.ax = self.figure.add_subplot()
+
+    def clear(self) -> Any:
+        """The template's axes, emptied for the next chart."""
+        self.ax.clear()
+        self.ax.set_xscale("linear")
+        self.ax.set_axis_on()
+        return self.ax
+
+    def save(self, path: Path, dpi: int = DEFAULT_DPI) -> None:
+        fmt = path.suffix.lstrip(".").lower() or "png"
+        self.figure.savefig(path, format=fmt, dpi=None if fmt in VECTOR_FORMATS else dpi)
+
+
+@dataclass
+class ChartJob:
+    """One chart to render.
+
+    Attributes:
+        kind: Key of :data:`DRAWERS`: ``"impact_comparison"`` or ``"contribution"``
+        data: Processed EPD data (``{"impact_categories": [...], ...}``)
+        path: Output file; its suffix selects the format
+        categories: Categories of an impact comparison (default: all)
+        category: Category of a contribution analysis
+        title: Chart title; default depends on the kind
+        size: Figure size in inches
+        dpi: Resolution of raster output
+    """
+    kind: str
+    data: Dict
+    path: str
+    categories: Optional[Sequence[str]] = None
+    category: Optional[str] = None
+    title: Optional[str] = None
+    size: Tuple[float, float] = DEFAULT_SIZE
+    dpi: int = DEFAULT_DPI
+
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering one chart."""
+    path: str
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def render_chart(job: ChartJob) -> str:
+    """Render one chart on this thread's template for its kind and size.
+
+    Returns:
+        The output path
+    Raises:
+        ValueError: If the chart kind is unknown.
+    """
+    if job.kind not in DRAWERS:
+        raise ValueError(f"Unknown chart kind {job.kind!r}; known: {sorted(DRAWERS)}")
+    templates = getattr(_local, "templates", None)
+    if templates is None:
+        templates = _local.templates = {}
+    template = templates.get((job.kind, tuple(job.size)))
+    if template is None:
+        template = templates[(job.kind, tuple(job.size))] = ChartTemplate(job.size)
+    ax = template.clear()
+    if job.kind == "contribution":
+        draw_contribution_analysis(ax, job.data, job.category or "", job.title)
+    else:
+        draw_impact_comparison(ax, job.data, job.categories, job.title)
+    path = Path(job.path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    template.save(path, job.dpi)
+    return str(path)
+
+
+def _render_chunk(jobs: List[ChartJob]) -> List[RenderResult]:
+    results = []
+    for job in jobs:
+        try:
+            results.append(RenderResult(render_chart(job)))
+        except Exception as exc:
+            results.append(RenderResult(job.path, f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def render_batch(jobs: Iterable[ChartJob], workers: Optional[int] = None,
+                 chunk_size: int = CHUNK_SIZE) -> List[RenderResult]:
+    """Render many charts across a process pool.
+
+    Jobs are sent in chunks, so each worker reuses its templates across a chunk and the
+    data is pickled once per chunk rather than per call.
+
+    Args:
+        jobs: Charts to render
+        workers: Processes; defaults to the CPU count, ``0`` renders in this process
+        chunk_size: Jobs per task sent to a worker
+    Returns:
+        One result per job, in input order; failures are reported, not raised
+    """
+    jobs = list(jobs)
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    if workers == 0 or len(chunks) <= 1:
+        return [r for chunk in chunks for r in _render_chunk(chunk)]
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1,
+                                             len(chunks))) as pool:
+        return [r for results in pool.map(_render_chunk, chunks) for r in results]
+
+
 class LCAVisualizer:
-    """Pre-built visualization templates for common LCA charts."""
-    
+    """Pre-built visualization templates for common LCA charts.
+
+    These draw on a new pyplot figure, for interactive use in the notebooks; use
+    :func:`render_chart` / :func:`render_batch` to write many charts to files.
+    """
+
     @staticmethod
-    def plot_impact_comparison(data: dict, 
-                             categories: list[str]) -> None:
+    def plot_impact_comparison(data: dict,
+                               categories: list[str]) -> None:
         """Generate standard impact category comparison chart."""
-        pass
-    
+        import matplotlib.pyplot as plt
+
+        _, ax = plt.subplots(figsize=DEFAULT_SIZE, layout="constrained")
+        draw_impact_comparison(ax, data, categories)
+
     @staticmethod
     def plot_contribution_analysis(data: dict,
-                                 category: str) -> None:
+                                   category: str) -> None:
         """Create contribution analysis visualization."""
-        pass
\ No newline at end of file
+        import matplotlib.pyplot as plt
+
+        _, ax = plt.subplots(figsize=DEFAULT_SIZE, layout="constrained")
+        draw_contribution_analysis(ax, data, category)
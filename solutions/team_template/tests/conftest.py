@@ -1,13 +1,43 @@
 """Shared pytest fixtures and configuration."""
 
+import numpy as np
+import pandas as pd
 import pytest
 from pathlib import Path
 
+from team_template.src.processing import ALLOCATION_TEMPLATE, BACKGROUND_TEMPLATE, LCAProcessor
+
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Get path to test data directory."""
     return Path(__file__).parent / "data"
 
+
+@pytest.fixture
+def processor():
+    return LCAProcessor()
+
+
+@pytest.fixture
+def allocation():
+    """Allocation template with every amount filled in."""
+    table = pd.read_csv(ALLOCATION_TEMPLATE)
+    amounts = {"Basalt": 2.2, "Dolomite": 0.6, "Slags": 1.0, "Resin binder": 0.2,
+               "Coke": 0.5, "Electricity": 1.8, "Compressed air": 0.3,
+               "Polyethylene film": 0.03, "Wooden pallet": 0.01, "Truck transport": 1.2}
+    table["Amount per m2"] = table["Amount per m2"].fillna(table["Input"].map(amounts))
+    return table
+
+
+@pytest.fixture
+def background():
+    """Background template with deterministic characterization factors."""
+    table = pd.read_csv(BACKGROUND_TEMPLATE)
+    flows = table.columns[2:]
+    factors = np.arange(1, len(table) * len(flows) + 1, dtype=float).reshape(len(table), -1)
+    table[flows] = factors / 100
+    return table
+
 # solutions/team_template/tests/helpers/mock_data.py
 """Mock data utilities for testing."""
 
@@ -3,6 +3,7 @@
 Provides common test data, mock objects, and helper functions to
 reduce code duplication in tests.
 """
+from .corpus import generate_corpus, write_corpus
 from .mock_data import MockEPD, SAMPLE_EPD
 from .test_utils import (
     load_test_epd,
@@ -15,5 +16,7 @@ __all__ = [
     'SAMPLE_EPD',
     'load_test_epd',
     'create_mock_extractor',
-    'create_mock_processor'
+    'create_mock_processor',
+    'generate_corpus',
+    'write_corpus'
 ]
\ No newline at end of file
@@ -0,0 +1,237 @@
+# helpers/corpus.py
+"""Synthetic EPD corpus for load tests and benchmarks.
+
+:func:`generate_corpus` scales :class:`MockEPD` to any number of EPDs that look like the
+real ones: a product from one of a few construction material families with plausible
+impact magnitudes, an EN 15804 style impact table with one column per life cycle module,
+indicator names in the spellings EPDs use ("GWP-total", "Climate change", "ODP"), units
+that need converting ("g CFC11 eq.", "kWh"), decimal commas, and "MND" / "ND" cells for
+undeclared modules. The corpus is deterministic for a seed.
+
+``expected_outputs`` holds the declared values keyed ``"<category>/<module>"`` with the
+canonical category of :data:`CATEGORY_SYNONYMS`, in the category's reference unit
+(:data:`REFERENCE_UNITS`), so both extraction and unit standardization can be checked.
+
+:func:`write_corpus` renders the EPDs as PDFs (a text page and a table page, drawn with
+matplotlib) that pdfplumber reads back to the same table.
+
+Example:
+    >>> epds = generate_corpus(1000, seed=0)
+    >>> paths = write_corpus(epds, "corpus/")
+    >>> TableExtractor().extract(epds[0].tables).impact_categories[0]
+"""
+
+import os
+import random
+import tempfile
+import textwrap
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .mock_data import MockEPD
+
+MODULES = ["A1-A3", "A4", "A5", "C1", "C2", "C3", "C4", "D"]
+
+# Share of the A1-A3 impact declared in each other module (D is a credit)
+MODULE_SHARES = {"A4": 0.04, "A5": 0.02, "C1": 0.005, "C2": 0.01, "C3": 0.03, "C4": 0.01,
+                 "D": -0.15}
+
+REFERENCE_UNITS = {
+    "global_warming_potential": "kg CO2 eq.",
+    "acidification_potential": "kg SO2 eq.",
+    "eutrophication_potential": "kg PO4 eq.",
+    "ozone_depletion_potential": "kg CFC11 eq.",
+    "photochemical_ozone_creation_potential": "kg C2H4 eq.",
+    "abiotic_depletion_elements": "kg Sb eq.",
+    "abiotic_depletion_fossil": "MJ",
+    "water_use": "m3",
+}
+
+# Row labels as EPDs spell them
+LABELS = {
+    "global_warming_potential": ["GWP-total", "Global warming potential", "Climate change",
+                                 "GWP"],
+    "acidification_potential": ["AP", "Acidification potential", "Acidification"],
+    "eutrophication_potential": ["EP", "Eutrophication potential"],
+    "ozone_depletion_potential": ["ODP", "Ozone depletion (ODP)",
+                                  "Depletion potential of the stratospheric ozone layer"],
+    "photochemical_ozone_creation_potential": ["POCP",
+                                               "Photochemical ozone creation potential"],
+    "abiotic_depletion_elements": ["ADPE", "ADP elements"],
+    "abiotic_depletion_fossil": ["ADPF", "ADP fossil"],
+    "water_use": ["Water use"],
+}
+
+# Other units a category is declared in, with their factor to the reference unit
+UNIT_VARIANTS = {
+    "global_warming_potential": [("t CO2 eq.", 1e3)],
+    "ozone_depletion_potential": [("g CFC11 eq.", 1e-3), ("mg CFC11 eq.", 1e-6)],
+    "abiotic_depletion_elements": [("g Sb eq.", 1e-3), ("mg Sb eq.", 1e-6)],
+    "abiotic_depletion_fossil": [("kWh", 3.6), ("GJ", 1e3)],
+    "water_use": [("l", 1e-3)],
+}
+
+# Material families: declared unit and A1-A3 impact per declared unit (reference units)
+FAMILIES: Dict[str, Tuple[str, Dict[str, float]]] = {
+    "Stone wool insulation": ("1 m3", {
+        "global_warming_potential": 150.0, "acidification_potential": 0.9,
+        "eutrophication_potential": 0.12, "ozone_depletion_potential": 4e-6,
+        "photochemical_ozone_creation_potential": 0.05, "abiotic_depletion_elements": 2e-4,
+        "abiotic_depletion_fossil": 1900.0, "water_use": 1.5}),
+    "Ready-mix concrete C30/37": ("1 m3", {
+        "global_warming_potential": 260.0, "acidification_potential": 0.6,
+        "eutrophication_potential": 0.09, "ozone_depletion_potential": 6e-6,
+        "photochemical_ozone_creation_potential": 0.03, "abiotic_depletion_elements": 4e-4,
+        "abiotic_depletion_fossil": 1300.0, "water_use": 0.9}),
+    "Hot-rolled steel section": ("1 t", {
+        "global_warming_potential": 1700.0, "acidification_potential": 5.2,
+        "eutrophication_potential": 0.8, "ozone_depletion_potential": 5e-5,
+        "photochemical_ozone_creation_potential": 0.7, "abiotic_depletion_elements": 3e-3,
+        "abiotic_depletion_fossil": 18000.0, "water_use": 6.0}),
+    "Cross-laminated timber": ("1 m3", {
+        "global_warming_potential": 110.0, "acidification_potential": 0.5,
+        "eutrophication_potential": 0.11, "ozone_depletion_potential": 1e-5,
+        "photochemical_ozone_creation_potential": 0.04, "abiotic_depletion_elements": 1e-4,
+        "abiotic_depletion_fossil": 1500.0, "water_use": 0.6}),
+    "Gypsum plasterboard": ("1 m2", {
+        "global_warming_potential": 2.3, "acidification_potential": 6e-3,
+        "eutrophication_potential": 1e-3, "ozone_depletion_potential": 1.5e-7,
+        "photochemical_ozone_creation_potential": 4e-4, "abiotic_depletion_elements": 2e-6,
+        "abiotic_depletion_fossil": 38.0, "water_use": 0.01}),
+    "Float glass": ("1 m2", {
+        "global_warming_potential": 31.0, "acidification_potential": 0.2,
+        "eutrophication_potential": 0.02, "ozone_depletion_potential": 1e-6,
+        "photochemical_ozone_creation_potential": 0.01, "abiotic_depletion_elements": 5e-5,
+        "abiotic_depletion_fossil": 420.0, "water_use": 0.15}),
+}
+
+MANUFACTURERS = ["Nordwerk", "Baltic Building Products", "Alpen Baustoffe", "Iberia Materiales",
+                 "Lakeside Industries", "Vistula Construction", "Rhine Mineral", "Atlas Forge"]
+PROGRAM_OPERATORS = ["IBU", "EPD Norge", "The International EPD System", "Kiwa-Ecobility"]
+
+BOILERPLATE = (
+    "This declaration covers the product stage and the end of life of the product in "
+    "accordance with EN 15804:2012+A2:2019. The life cycle assessment was carried out "
+    "with background data from a commercial database and the manufacturer's production "
+    "data for the reference year. Allocation between co-products follows the physical "
+    "properties of the products; recycled input enters the system burden free. Modules "
+    "that are not declared are marked MND. The results of the impact assessment are "
+    "relative expressions and do not predict impacts on category endpoints, the "
+    "exceeding of thresholds, safety margins or risks."
+)
+
+
+def _format(value: float, decimal_comma: bool) -> str:
+    if abs(value) >= 1e3:
+        text = f"{value:.0f}"
+    else:
+        text = f"{value:.3g}" if abs(value) >= 1e-3 else f"{value:.2E}"
+    return text.replace(".", ",") if decimal_comma else text
+
+
+def generate_epd(rng: random.Random, index: int = 0) -> MockEPD:
+    """One synthetic EPD drawn from ``rng``; see the module docstring."""
+    family = rng.choice(sorted(FAMILIES))
+    declared_unit, base = FAMILIES[family]
+    manufacturer = rng.choice(MANUFACTURERS)
+    decimal_comma = rng.random() < 0.3
+    modules = ["A1-A3"] + [m for m in MODULES[1:] if rng.random() < 0.7]
+    scale = rng.lognormvariate(0.0, 0.3)
+
+    columns: Dict[str, List[str]] = {"Indicator": [], "Unit": []}
+    columns.update({m: [] for m in MODULES})
+    expected: Dict[str, float] = {}
+    for category, reference in base.items():
+        unit, factor = REFERENCE_UNITS[category], 1.0
+        if category in UNIT_VARIANTS and rng.random() < 0.25:
+            unit, factor = rng.choice(UNIT_VARIANTS[category])
+        columns["Indicator"].append(rng.choice(LABELS[category]))
+        columns["Unit"].append(unit)
+        for module in MODULES:
+            if module not in modules:
+                columns[module].append(rng.choice(["MND", "ND"]))
+                continue
+            share = 1.0 if module == "A1-A3" else MODULE_SHARES[module]
+            cell = _format(reference * scale * share * rng.uniform(0.8, 1.2) / factor,
+                           decimal_comma)
+            columns[module].append(cell)
+            expected[f"{category}/{module}"] = float(cell.replace(",", ".")) * factor
+
+    product = f"{family} {rng.choice('ABCDEFGH')}{rng.randint(10, 99)}"
+    text = "\n\n".join([
+        "ENVIRONMENTAL PRODUCT DECLARATION",
+        f"as per ISO 14025 and EN 15804+A2\n\nProduct: {product}\n"
+        f"Manufacturer: {manufacturer}\nDeclared unit: {declared_unit}\n"
+        f"Program operator: {rng.choice(PROGRAM_OPERATORS)}\n"
+        f"Declaration number: EPD-{index:06d}\nValid until: {rng.randint(2026, 2031)}-12-31",
+        BOILERPLATE,
+        f"Declared modules: {', '.join(modules)}. Results per {declared_unit} of {product}.",
+    ])
+    return MockEPD(text=text, tables=[columns], expected_outputs=expected)
+
+
+def generate_corpus(n: int, seed: int = 0) -> List[MockEPD]:
+    """``n`` synthetic EPDs; the same ``n`` and ``seed`` give the same corpus."""
+    rng = random.Random(seed)
+    return [generate_epd(rng, i) for i in range(n)]
+
+
+def write_pdf(epd: MockEPD, path: Union[str, Path]) -> Path:
+    """Render an EPD as a landscape A4 PDF: its text, then its impact tables.
+
+    The file is written atomically, so an interrupted run leaves no partial PDF behind.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        _render_pdf(epd, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def _render_pdf(epd: MockEPD, path: str) -> None:
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    lines = [line for paragraph in epd.text.split("\n")
+             for line in (textwrap.wrap(paragraph, 120) or [""])]
+    with PdfPages(path) as pdf:
+        for start in range(0, len(lines), 45):
+            figure = Figure(figsize=(11.69, 8.27))
+            figure.text(0.05, 0.95, "\n".join(lines[start:start + 45]), va="top", fontsize=9)
+            pdf.savefig(figure)
+        for table in epd.tables:
+            header = list(table)
+            rows = [list(row) for row in zip(*(table[c] for c in header))]
+            figure = Figure(figsize=(11.69, 8.27))
+            ax = figure.add_axes((0.03, 0.1, 0.94, 0.8))
+            ax.set_axis_off()
+            cells = ax.table(cellText=rows, colLabels=header, loc="upper center")
+            cells.auto_set_font_size(False)
+            cells.set_fontsize(7)
+            cells.auto_set_column_width(range(len(header)))
+            pdf.savefig(figure)
+
+
+def write_corpus(epds: Sequence[MockEPD], directory: Union[str, Path]) -> List[Path]:
+    """Write each EPD to ``directory/epd-<index>.pdf``, skipping files that exist.
+
+    A corpus of a seed is a prefix of every larger corpus of that seed, so one
+    directory per seed can be reused across corpus sizes.
+
+    Returns:
+        The PDF paths, in corpus order
+    """
+    directory = Path(directory)
+    paths = []
+    for i, epd in enumerate(epds):
+        path = directory / f"epd-{i:05d}.pdf"
+        if not path.exists():
+            write_pdf(epd, path)
+        paths.append(path)
+    return paths
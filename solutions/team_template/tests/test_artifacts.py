@@ -0,0 +1,51 @@
+"""Tests for the parsed-PDF artifact store."""
+
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from team_template.src.artifacts import ParsedPDFStore
+from team_template.src.cache import ResponseCache
+from team_template.src.extraction import EPDExtractor
+
+SAMPLE_PDF = Path(__file__).resolve().parents[3] / "data" / "knauf_assignment.pdf"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ParsedPDFStore(tmp_path / "parsed")
+
+
+def test_pdf_is_parsed_once(store):
+    first = store.load(SAMPLE_PDF)
+    with patch("team_template.src.artifacts.parse_pdf") as parse:
+        second = ParsedPDFStore(store.root).load(SAMPLE_PDF)
+
+    parse.assert_not_called()
+    assert second.text == first.text
+    assert second.tables == first.tables
+    assert second.num_pages > 0 and "mineral wool" in second.text.lower()
+
+
+def test_entries_are_keyed_by_content(store, tmp_path):
+    copy = tmp_path / "renamed.pdf"
+    shutil.copy(SAMPLE_PDF, copy)
+    assert store.key_for(copy) == store.key_for(SAMPLE_PDF)
+
+
+def test_round_trip_preserves_empty_cells(store):
+    tables = [[[["Category", None], ["GWP", "12.3"]]], []]
+    parsed = store.put("ab" * 32, ["page one", ""], tables)
+    reloaded = store.get(parsed.key)
+    assert reloaded.page_texts == ["page one", ""]
+    assert reloaded.tables == [[["Category", None], ["GWP", "12.3"]]]
+
+
+def test_extractor_reads_from_store(store, tmp_path):
+    extractor = EPDExtractor(cache=ResponseCache(tmp_path / "cache.sqlite"), artifacts=store)
+    text = extractor._extract_text(str(SAMPLE_PDF))
+    with patch("team_template.src.artifacts.pdfplumber.open") as pdf_open:
+        assert extractor._extract_text(str(SAMPLE_PDF)) == text
+        extractor._extract_tables(str(SAMPLE_PDF))
+    pdf_open.assert_not_called()
@@ -0,0 +1,60 @@
+"""Tests for concurrent batch extraction."""
+
+import asyncio
+import json
+
+import pytest
+from team_template.src.batch import load_checkpoint
+from team_template.src.cache import ResponseCache
+from team_template.src.extraction import EPDExtractor
+from team_template.src.fake_provider import FakeProvider
+
+
+def fake_parser(path: str):
+    """Stand-in for PDF parsing so every document has distinct content."""
+    return f"EPD text for {path}", []
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    return EPDExtractor(cache=ResponseCache(tmp_path / "cache.sqlite", ttl=0))
+
+
+def collect(extractor, paths, **kwargs):
+    async def run():
+        from team_template.src.batch import extract_many
+        return [r async for r in extract_many(extractor, paths, parser=fake_parser,
+                                              workers=0, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_extracts_all_documents_against_mock_server(extractor, monkeypatch, tmp_path):
+    paths = [f"epd_{i}.pdf" for i in range(20)]
+    with FakeProvider(rate_limit_every=7) as server:
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        results = collect(extractor, paths, concurrency=4,
+                          checkpoint=tmp_path / "run.jsonl")
+
+    assert sorted(r.path for r in results) == sorted(paths)
+    assert all(r.ok for r in results), [r.error for r in results if not r.ok]
+    assert server.stats["rate_limited"] > 0, "The mock should have exercised the 429 path"
+    assert results[0].data["impact_categories"][0]["value"] == 12.3
+
+
+def test_resume_skips_finished_documents(extractor, tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+    checkpoint.write_text(
+        json.dumps({"path": "done.pdf", "data": {}, "error": None}) + "\n"
+        + json.dumps({"path": "failed.pdf", "data": None, "error": "boom"}) + "\n"
+        + '{"path": "trunc'
+    )
+    assert load_checkpoint(checkpoint) == {"done.pdf"}
+
+    async def fake_process(text, tables):
+        return {"text": text}
+
+    extractor._aprocess_content = fake_process
+    results = collect(extractor, ["done.pdf", "failed.pdf", "new.pdf"],
+                      checkpoint=checkpoint)
+    assert sorted(r.path for r in results) == ["failed.pdf", "new.pdf"]
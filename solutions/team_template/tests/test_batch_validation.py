@@ -0,0 +1,114 @@
+"""Tests for validating many EPDs per LLM request."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from team_template.src import llm
+from team_template.src.cache import ResponseCache
+from team_template.src.fake_provider import FakeProvider
+from team_template.src.validation import LCAValidator, ValidationResult, pack_records
+
+RECORDS = {f"epd-{i}": {"impact_categories": [{"name": "GWP", "value": i}]}
+           for i in range(10)}
+
+
+def records_in(prompt: str) -> dict:
+    """The JSON object of records embedded in a batched prompt."""
+    start = prompt.index("{", prompt.index("record ID:"))
+    return json.JSONDecoder().raw_decode(prompt[start:])[0]
+
+
+def verdicts_for(prompt: str, skip=()) -> str:
+    return json.dumps([
+        {"id": record_id, "is_valid": record["impact_categories"][0]["value"] % 2 == 0,
+         "issues": [], "confidence": 0.9}
+        for record_id, record in records_in(prompt).items() if record_id not in skip
+    ])
+
+
+@pytest.fixture
+def validator(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0)
+    yield LCAValidator(cache=cache)
+    cache.close()
+
+
+def test_pack_records_respects_budget_and_count():
+    sizes = {"a": 40, "b": 40, "c": 30, "d": 500, "e": 10, "f": 10, "g": 10}
+    assert pack_records(sizes, budget=100, max_records=2) == [
+        ["a", "b"], ["c"], ["d"], ["e", "f"], ["g"]
+    ]
+
+
+def test_batches_are_split_and_only_failures_retried(validator):
+    prompts = []
+
+    async def fake_llm(prompt, model, max_tokens):
+        prompts.append(prompt)
+        # The first answer drops one record and garbles another
+        if len(prompts) == 1:
+            answer = json.loads(verdicts_for(prompt, skip={"epd-3"}))
+            del answer[0]["is_valid"]
+            return json.dumps(answer)
+        return verdicts_for(prompt)
+
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm):
+        results = asyncio.run(validator.validate_extraction_batch(RECORDS))
+
+    assert list(results) == list(RECORDS)
+    assert results["epd-4"] == ValidationResult(True, [], 0.9)
+    assert results["epd-5"] == ValidationResult(False, [], 0.9)
+    assert len(prompts) == 2
+    assert set(records_in(prompts[1])) == {"epd-0", "epd-3"}
+
+    # A re-run is served from the cache
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm) as llm:
+        again = asyncio.run(validator.validate_extraction_batch(RECORDS))
+    assert again == results and llm.call_count == 0
+
+
+def test_token_budget_splits_requests(validator):
+    seen = []
+
+    async def fake_llm(prompt, model, max_tokens):
+        seen.append(len(records_in(prompt)))
+        return verdicts_for(prompt)
+
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm):
+        results = asyncio.run(validator.validate_extraction_batch(RECORDS, token_budget=250))
+
+    assert sum(seen) == len(RECORDS) and len(seen) > 1
+    assert all(r.confidence == 0.9 for r in results.values())
+
+
+def test_unparseable_records_fail_after_retries(validator):
+    async def fake_llm(prompt, model, max_tokens):
+        return "I cannot help with that."
+
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm) as llm:
+        results = asyncio.run(validator.validate_extraction_batch(RECORDS, max_retries=1))
+
+    assert llm.call_count == 2
+    assert all(r == ValidationResult(False, ["Invalid LLM response format"], 0.0)
+               for r in results.values())
+
+
+def test_provider_batch_api_against_local_stub(validator, monkeypatch):
+    def respond(body):
+        return verdicts_for(body["messages"][0]["content"])
+
+    with FakeProvider(respond=respond) as server:
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        llm._client.cache_clear()
+        try:
+            results = asyncio.run(validator.validate_extraction_batch(
+                RECORDS, token_budget=250, use_batch_api=True, poll_interval=0))
+        finally:
+            llm._client.cache_clear()
+
+    assert len(server.batches) == 1
+    assert server.stats["requests"] == 0, "No synchronous requests when using the batch API"
+    assert [r.is_valid for r in results.values()] == [i % 2 == 0 for i in range(10)]
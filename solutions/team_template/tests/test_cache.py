@@ -0,0 +1,97 @@
+"""Tests for the persistent LLM response cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from team_template.src.cache import ResponseCache, make_cache_key
+from team_template.src.extraction import EPDExtractor
+from team_template.src.validation import INVALID_RESPONSE, LCAValidator, ValidationResult
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache stored in a temporary directory with expiry disabled."""
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0)
+    yield cache
+    cache.close()
+
+
+def test_cache_key_depends_on_every_part():
+    """Moving text between prompt and content must change the key."""
+    key = make_cache_key("model", "prompt", "content")
+    assert key == make_cache_key("model", "prompt", "content")
+    assert key != make_cache_key("other-model", "prompt", "content")
+    assert key != make_cache_key("model", "promptc", "ontent")
+
+
+def test_round_trip_and_hit_counters(cache):
+    assert cache.get("m", "p", "c") is None
+    cache.put("m", "p", "c", "response")
+    assert cache.get("m", "p", "c") == "response"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_do_not_expire_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DURATION", "3600")
+    monkeypatch.delenv("LCA_CACHE_TTL", raising=False)
+    assert ResponseCache(tmp_path / "responses.sqlite").ttl == 0
+    monkeypatch.setenv("LCA_CACHE_TTL", "60")
+    assert ResponseCache(tmp_path / "responses.sqlite").ttl == 60
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=1e-9)
+    cache.put("m", "p", "c", "response")
+    assert cache.get("m", "p", "c") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_bytes=20, ttl=0)
+    cache.put("m", "first", "", "x" * 10)
+    cache.put("m", "second", "", "x" * 10)
+    cache.get("m", "first")
+    cache.put("m", "third", "", "x" * 10)
+
+    assert cache.get("m", "second") is None, "Oldest access should be evicted first"
+    assert cache.get("m", "first") is not None
+    assert cache.size_bytes() <= 20
+
+
+def test_extractor_reruns_make_no_api_calls(cache):
+    extractor = EPDExtractor(cache=cache)
+    with patch("team_template.src.extraction.complete",
+               return_value='{"impact_categories": [], "metadata": {}}') as llm:
+        first = extractor._process_content("Sample EPD content", [])
+        second = extractor._process_content("Sample EPD content", [])
+
+    assert first == second
+    assert llm.call_count == 1
+
+
+def test_validator_uses_shared_cache(cache):
+    validator = LCAValidator(cache=cache)
+
+    async def fake_llm(prompt, model):
+        return '```json\n{"is_valid": false, "issues": ["unit"], "confidence": 0.7}\n```'
+
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm) as llm:
+        results = [asyncio.run(validator.validate_extraction({"a": 1})) for _ in range(2)]
+
+    assert llm.call_count == 1
+    assert results[0] == results[1]
+    assert results[0].issues == ["unit"]
+
+
+@pytest.mark.parametrize("answer", ["[]", '{"is_valid": true, "confidence": "high"}'])
+def test_malformed_verdicts_are_evicted(cache, answer):
+    validator = LCAValidator(cache=cache)
+
+    async def fake_llm(prompt, model):
+        return answer
+
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm) as llm:
+        results = [asyncio.run(validator.validate_extraction({"a": 1})) for _ in range(2)]
+
+    assert llm.call_count == 2
+    assert results[0] == ValidationResult(False, [INVALID_RESPONSE], 0.0)
@@ -0,0 +1,94 @@
+"""Tests for token-aware chunking of long EPDs."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from team_template.src.cache import ResponseCache
+from team_template.src.chunking import DocumentChunker, merge_extractions, split_sections
+from team_template.src.extraction import EPDExtractor
+from team_template.src.llm import estimate_tokens
+
+BOILERPLATE = ("Knauf Insulation has a long history of producing insulation for homes and "
+               "buildings across many countries and markets. ") * 40
+
+DOCUMENT = "\n".join([
+    "1 COMPANY INFORMATION", BOILERPLATE,
+    "2 Product description",
+    "The declared unit is 1 m2 of stone wool slab with a thermal resistance of 1 m2K/W.",
+    "3 SYSTEM BOUNDARIES",
+    "The study is cradle to gate with options, covering modules A1-A3, A4, C1-C4 and D.",
+    "4 VERIFICATION", BOILERPLATE,
+    "5 LCA results",
+    "Global warming potential GWP-total 1.52 kg CO2 eq. for A1-A3",
+    "Acidification potential 0.012 mol H+ eq. for A1-A3",
+    "6 REFERENCES", BOILERPLATE,
+])
+TABLES = [[["Indicator", "Unit", "A1-A3", "D"],
+           ["GWP-total", "kg CO2 eq.", "1.52", "-0.1"],
+           ["ODP", "kg CFC11 eq.", "2.1E-8", "0"]]]
+
+
+@pytest.fixture
+def chunker():
+    return DocumentChunker(max_tokens=300, min_score=4.0)
+
+
+def test_sections_follow_headings():
+    titles = [title for title, _ in split_sections(DOCUMENT)]
+    assert titles == ["1 COMPANY INFORMATION", "2 Product description", "3 SYSTEM BOUNDARIES",
+                      "4 VERIFICATION", "5 LCA results", "6 REFERENCES"]
+
+
+def test_chunks_respect_budget_and_boilerplate_is_dropped(chunker):
+    chunks = chunker.chunk(DOCUMENT, TABLES)
+    assert all(c.tokens <= 300 for c in chunks)
+    assert all(estimate_tokens(c.text) <= 300 + len(c.text.splitlines()) for c in chunks)
+
+    selected = chunker.select(chunks)
+    sent = "\n".join(c.text for c in selected)
+    assert "declared unit" in sent and "cradle to gate" in sent and "GWP-total" in sent
+    assert any(c.tables == TABLES for c in selected)
+    assert "long history" not in sent
+    assert sum(c.tokens for c in selected) < sum(c.tokens for c in chunks) / 2
+
+
+def test_merge_prefers_confident_values_and_reports_conflicts():
+    merged = merge_extractions([
+        {"impact_categories": [{"name": "Global Warming Potential", "value": 1.5,
+                                "unit": "kg CO2 eq.", "confidence": "low"}],
+         "metadata": {"epd_reference": ""}},
+        {"impact_categories": [{"name": "global warming potential", "value": 1.52,
+                                "unit": "kg CO2 eq.", "confidence": "high"},
+                               {"name": "ODP", "value": 2.1e-8, "unit": "kg CFC11 eq."}],
+         "metadata": {"epd_reference": "S-P-05553"}},
+    ], {"total": 2, "sent": 2})
+
+    assert [c["value"] for c in merged["impact_categories"]] == [1.52, 2.1e-8]
+    assert merged["metadata"]["epd_reference"] == "S-P-05553"
+    assert merged["metadata"]["merge_conflicts"][0]["values"] == [1.5, 1.52]
+    assert merged["metadata"]["chunks"] == {"total": 2, "sent": 2}
+
+
+def test_extractor_sends_only_relevant_chunks(tmp_path, chunker):
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl=0)
+    extractor = EPDExtractor(cache=cache, chunker=chunker)
+    answer = json.dumps({"impact_categories": [
+        {"name": "GWP-total", "value": 1.52, "unit": "kg CO2 eq."}], "metadata": {}})
+
+    async def fake_llm(prompt, model, cached_prefix=""):
+        return answer
+
+    with patch("team_template.src.extraction.complete", return_value=answer) as sync_llm:
+        result = extractor._process_content(DOCUMENT, TABLES)
+    with patch("team_template.src.extraction.acomplete", side_effect=fake_llm) as async_llm:
+        again = asyncio.run(EPDExtractor(cache=ResponseCache(tmp_path / "other.sqlite"),
+                                         chunker=chunker)._aprocess_content(DOCUMENT, TABLES))
+
+    stats = result["metadata"]["chunks"]
+    assert sync_llm.call_count == async_llm.call_count == stats["sent"] < stats["total"]
+    assert "long history" not in "".join(call.args[0] for call in sync_llm.call_args_list)
+    assert result["impact_categories"] == again["impact_categories"]
+    assert len(result["impact_categories"]) == 1
+    cache.close()
@@ -0,0 +1,81 @@
+"""Tests for the synthetic EPD corpus and the benchmark suite's regression checks."""
+
+import json
+
+import pytest
+from team_template.benchmarks.suite import baseline_results, compare, find_baseline, verdicts
+from team_template.src.artifacts import parse_pdf
+from team_template.src.table_extraction import SynonymIndex, TableExtractor
+from team_template.src.units import UnitRegistry
+from team_template.tests.helpers import generate_corpus, write_corpus
+from team_template.tests.helpers.corpus import REFERENCE_UNITS
+
+
+def extracted_values(tables):
+    """Table extraction of ``tables`` as ``expected_outputs``: reference units, by key."""
+    index, units = SynonymIndex(), UnitRegistry()
+    values = {}
+    for entry in TableExtractor().extract(tables).impact_categories:
+        category = index.lookup(entry["name"])
+        values[f"{category}/{entry['module']}"] = entry["value"] * units.factor(
+            entry["unit"], REFERENCE_UNITS[category])
+    return values
+
+
+def test_corpus_is_deterministic_and_varied():
+    epds = generate_corpus(50, seed=3)
+
+    assert generate_corpus(20, seed=3) == epds[:20]
+    assert generate_corpus(20, seed=4) != epds[:20]
+    labels = {label for epd in epds for label in epd.tables[0]["Indicator"]}
+    units = {unit for epd in epds for unit in epd.tables[0]["Unit"]}
+    cells = [cell for epd in epds for column in list(epd.tables[0].values())[2:]
+             for cell in column]
+    assert {"GWP-total", "Climate change"} <= labels
+    assert {"kg CO2 eq.", "t CO2 eq.", "kWh"} & units == {"kg CO2 eq.", "t CO2 eq.", "kWh"}
+    assert "MND" in cells and any("," in cell for cell in cells)
+    for epd in epds:
+        assert extracted_values(epd.tables) == pytest.approx(epd.expected_outputs)
+
+
+def test_generated_pdfs_parse_back_to_the_tables(tmp_path):
+    epds = generate_corpus(2, seed=0)
+    paths = write_corpus(epds, tmp_path)
+
+    assert [p.name for p in paths] == ["epd-00000.pdf", "epd-00001.pdf"]
+    for epd, path in zip(epds, paths):
+        texts, tables = parse_pdf(path)
+        assert "Declaration number: EPD-" in texts[0]
+        assert extracted_values([t for page in tables for t in page]) == \
+            pytest.approx(epd.expected_outputs)
+    mtime = paths[0].stat().st_mtime_ns
+    write_corpus(epds, tmp_path)
+    assert paths[0].stat().st_mtime_ns == mtime
+
+
+def test_regressions_are_flagged_against_comparable_runs():
+    run = {"machine": {"node": "a"}, "params": {"corpus": 10}}
+    history = [
+        {**run, "commit": "old", "results": {"parse": {"min": 1.0}, "units": {"min": 1.0}}},
+        {**run, "params": {"corpus": 99}, "results": {"parse": {"min": 9.0}}},
+        {**run, "commit": "new", "results": {"parse": {"min": 1.2}, "units": {"min": 3.0}}},
+        {**run, "commit": "newer", "results": {"parse": {"min": 1.1}}},
+    ]
+
+    assert [r["commit"] for r in find_baseline(history, run)] == ["newer", "new", "old"]
+    assert [r["commit"] for r in find_baseline(history, run, commit="old")] == ["old"]
+    baseline = baseline_results(find_baseline(history, run))
+    assert baseline == {"parse": {"min": 1.1}, "units": {"min": 2.0}}
+
+    changes = compare({"parse": {"min": 1.5}, "units": {"min": 1.0}, "new": {"min": 1.0}},
+                      baseline, threshold=0.25)
+    assert changes == {"parse": (pytest.approx(1.5 / 1.1), "regression"),
+                       "units": (0.5, "improved")}
+
+
+def test_fake_provider_answers_per_record():
+    batched = verdicts({"messages": [{"content": '{"epd-00001": {}, "epd-00002": {}}'}]})
+    single = verdicts({"messages": [{"content": "GWP 12.3 kg CO2 eq."}]})
+
+    assert [v["id"] for v in json.loads(batched)] == ["epd-00001", "epd-00002"]
+    assert json.loads(single)["is_valid"] is True
@@ -0,0 +1,76 @@
+"""Tests for the pre-aggregated contribution cube."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from team_template.src.cube import REPORTED, ContributionCube
+
+TABLE = pd.DataFrame({"Melting": [6.0, 0.02], "Binder": [3.0, 0.05], "Transport": [1.0, 0.0]},
+                     index=["Global Warming Potential", "Acidification potential"])
+
+
+def test_queries_read_the_materialized_rollups():
+    cube = ContributionCube(capacity=1)
+    cube.add_contributions("slab", TABLE, module="A1-A3")
+    cube.add("board", [("GWP", "Melting", "A1-A3", 4.0), ("GWP", "Melting", "A4", 1.0),
+                       ("GWP", "Coating", "A1-A3", 5.0)])
+
+    assert cube.shape == (2, 2, 4, 2)
+    assert cube.top_contributors("slab", "GWP", n=2) == [("Melting", 6.0, 0.6),
+                                                         ("Binder", 3.0, 0.3)]
+    assert cube.total("board", "global warming potential") == 10.0
+    assert cube.rollup("board", "GWP", by="module") == {"A1-A3": 9.0, "A4": 1.0}
+    assert cube.drill_down("board", "GWP", "Melting") == {"A1-A3": 4.0, "A4": 1.0}
+    assert cube.slice("GWP").loc["board"].to_dict() == {
+        "Melting": 5.0, "Binder": 0.0, "Transport": 0.0, "Coating": 5.0}
+    assert cube.portfolio("GWP").index[0] == "Melting"
+    assert cube.portfolio("GWP")["Melting"] == 11.0
+    with pytest.raises(KeyError):
+        cube.total("missing", "GWP")
+
+
+def test_replacing_a_product_updates_its_slices_and_the_portfolio():
+    cube = ContributionCube()
+    cube.add_contributions("slab", TABLE)
+    cube.add("slab", [("GWP", "Transport", None, 2.0)])
+
+    assert cube.top_contributors("slab", "GWP") == [("Transport", 2.0, 1.0)]
+    assert cube.total("slab", "AP") == 0.0
+    assert cube.portfolio("GWP").to_dict() == {"Transport": 2.0, "Melting": 0.0,
+                                               "Binder": 0.0}
+
+
+def test_processed_results_and_matrix_models(processor, allocation, background, tmp_path):
+    model = processor.build_matrix_model(allocation, background)
+    cube = ContributionCube()
+    for i in range(100):
+        cube.add_contributions(f"product-{i}", model.contributions() * (1 + i / 100))
+    cube.add_processed("epd", {"impact_categories": [
+        {"name": "GWP", "value": 8.0, "module": "A1-A3"},
+        {"name": "GWP", "value": 2.0, "module": "A4"}]})
+
+    contributions = model.contributions()
+    category = contributions.index[0]
+    expected = contributions.loc[category].abs().sort_values(ascending=False)
+    top = cube.top_contributors("product-0", category, n=3)
+    assert [p for p, _, _ in top] == list(expected.index[:3])
+    assert cube.rollup("epd", "GWP", by="module") == {"A1-A3": 8.0, "A4": 2.0}
+    assert cube.rollup("epd", "GWP") == {REPORTED: 10.0}
+
+    cube.add_processed("declared", {"impact_categories": [
+        {"name": "GWP", "value": value, "module": module}
+        for module, value in [(None, 10.0), ("A1-A3", 10.0), ("A1", 3.0), ("D", -2.0)]] + [
+        {"name": "AP", "value": 0.5}, {"name": "AP", "value": 0.3, "module": "A1-A3"}]})
+    assert cube.total("declared", "GWP") == 10.0
+    assert cube.rollup("declared", "GWP", by="module") == {"A1-A3": 10.0, "D": -2.0}
+    assert cube.total("declared", "AP") == 0.5
+    assert cube.rollup("declared", "AP", by="module") == {"A1-A3": 0.3,
+                                                           "unspecified": pytest.approx(0.2)}
+
+    cube.save(tmp_path / "cube.npz")
+    loaded = ContributionCube.load(tmp_path / "cube.npz")
+    assert loaded.shape == cube.shape
+    np.testing.assert_allclose(loaded.slice(category).to_numpy(),
+                               cube.slice(category).to_numpy())
+    assert loaded.top_contributors("product-7", category) == cube.top_contributors(
+        "product-7", category)
@@ -0,0 +1,71 @@
+"""Tests for the flow embedding index and flow matching."""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from team_template.src.cache import ResponseCache
+from team_template.src.embedding_index import (BACKGROUND_DESCRIPTIONS, EmbeddingIndex,
+                                               FlowMatcher)
+from team_template.src.processing import LCAProcessor
+
+DATASETS = list(BACKGROUND_DESCRIPTIONS)
+
+
+def test_saved_index_is_memory_mapped_and_searchable(tmp_path):
+    EmbeddingIndex.build(DATASETS, BACKGROUND_DESCRIPTIONS).save(tmp_path / "flows")
+    index = EmbeddingIndex.load(tmp_path / "flows")
+
+    assert isinstance(index.vectors, np.memmap) and index.vectors.dtype == np.float32
+    indices, scores = index.search(["Slags", "Electricity", "Lorry transport"], k=2)
+    assert [index.names[i] for i in indices[:, 0]] == [
+        "Blast furnace slag", "Electricity medium voltage", "Truck transport"]
+    assert (scores[:, 0] >= scores[:, 1]).all()
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    return FlowMatcher(EmbeddingIndex.build(DATASETS, BACKGROUND_DESCRIPTIONS), flow_map={},
+                       cache=ResponseCache(tmp_path / "cache.sqlite", ttl=0))
+
+
+def test_only_ambiguous_flows_are_confirmed_by_llm(matcher):
+    answer = json.dumps({"matches": {"Coke": None}})
+
+    with patch("team_template.src.embedding_index.complete", return_value=answer) as llm:
+        matches = matcher.match(["Slags", "Lorry transport", "Coke"])
+        matcher.match(["Coke"])
+
+    assert llm.call_count == 1
+    assert json.loads(llm.call_args.args[0].split("## Raw names\n")[1]) == ["Coke"]
+    assert {f: (m.dataset, m.method) for f, m in matches.items()} == {
+        "Slags": ("Blast furnace slag", "embedding"),
+        "Lorry transport": ("Truck transport", "embedding"),
+        "Coke": (None, None),
+    }
+
+
+@pytest.mark.parametrize("answer", ["not json", '{"matches": ["Coke"]}', "[]"])
+def test_unusable_llm_answers_are_not_remembered(matcher, answer):
+    with patch("team_template.src.embedding_index.complete", return_value=answer) as llm:
+        first = matcher.match(["Coke"])["Coke"]
+        matcher.match(["Coke"])
+
+    assert (first.dataset, first.method) == (None, None)
+    assert llm.call_count == 2 and matcher.confirmed == {}
+
+
+def test_empty_index_leaves_flows_unmatched(tmp_path):
+    matcher = FlowMatcher(EmbeddingIndex.build([]), flow_map={},
+                          cache=ResponseCache(tmp_path / "cache.sqlite", ttl=0))
+    with patch("team_template.src.embedding_index.complete") as llm:
+        match = matcher.match(["Coke"])["Coke"]
+    assert (match.dataset, match.candidates) == (None, []) and not llm.called
+
+
+def test_processor_builds_flow_map_from_background_template():
+    processor = LCAProcessor()
+    flow_map = processor.match_flows(["Basalt", "Slags", "Electricity", "Coke"], confirm=False)
+    assert flow_map == {"Basalt": "Basalt production", "Slags": "Blast furnace slag",
+                        "Electricity": "Electricity medium voltage"}
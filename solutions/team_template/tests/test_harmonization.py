@@ -0,0 +1,86 @@
+"""Tests for the nomenclature harmonisation index."""
+
+import json
+from unittest.mock import patch
+
+import pandas as pd
+
+from team_template.src.harmonization import HarmonizationIndex
+from team_template.src.validation import DataQualityChecker
+from team_template.tests.helpers.mock_data import SAMPLE_EPD
+
+
+def test_stages_resolve_spelling_variants():
+    index = HarmonizationIndex.for_categories()
+    resolved = {name: (m.canonical, m.method) for name, m in
+                ((n, index.resolve(n)) for n in ["GWP", "Warming, global",
+                                                 "global_warming_potential",
+                                                 "Global warming potental", "Company name"])}
+    assert resolved == {
+        "GWP": ("global_warming_potential", "exact"),
+        "Warming, global": ("global_warming_potential", "token"),
+        "global_warming_potential": ("global_warming_potential", "exact"),
+        "Global warming potental": ("global_warming_potential", "ngram"),
+        "Company name": (None, None),
+    }
+
+    batch = index.resolve_many(["AP", None, "Acidification pot.", "AP"])
+    assert list(batch["canonical"].fillna("-")) == [
+        "acidification_potential", "-", "acidification_potential", "acidification_potential"]
+    assert list(batch["method"].fillna("-")) == ["exact", "-", "ngram", "exact"]
+
+    # Qualified indicators and the background template's categories
+    assert {name: index.lookup(name) for name in [
+        "Land use", "Primary Energy", "Particulate Matter", "Water consumption",
+        "Ozone layer depletion", "Global Warming Potential fossil",
+        "Abiotic depletion potential - non-fossil resources", "Global warming pot. fossil"]} == {
+        "Land use": "land_use",
+        "Primary Energy": "primary_energy_total",
+        "Particulate Matter": "particulate_matter",
+        "Water consumption": "water_use",
+        "Ozone layer depletion": "ozone_depletion_potential",
+        "Global Warming Potential fossil": "gwp_fossil",
+        "Abiotic depletion potential - non-fossil resources": "abiotic_depletion_elements",
+        "Global warming pot. fossil": "gwp_fossil",
+    }
+    assert index.lookup("Global warming potential, renewable") is None
+
+    flows = HarmonizationIndex.for_flows(["Basalt production", "Electricity medium voltage"])
+    assert flows.lookup("Electricity") == "Electricity medium voltage"
+    assert flows.lookup("basalt, production") == "Basalt production"
+
+
+def test_quality_checker_matches_variants_to_rules():
+    data = {"impact_categories": [
+        {"name": name, "value": value, "unit": unit} for name, value, unit in
+        zip(SAMPLE_EPD.tables[0]["impact_category"], SAMPLE_EPD.tables[0]["value"],
+            SAMPLE_EPD.tables[0]["unit"])] + [
+        {"name": "Eutrophication", "value": 0.01, "unit": "kg PO4 eq."}]}
+
+    assert not DataQualityChecker().check_quality(data).is_valid
+    checker = DataQualityChecker(harmonizer=HarmonizationIndex.for_categories())
+    assert checker.check_quality(data).is_valid
+    rows = pd.DataFrame([{"epd_id": 1, **c} for c in data["impact_categories"]])
+    assert checker.check_quality_bulk(rows)[1].is_valid
+
+
+def test_llm_answers_are_cached_into_the_index(tmp_path):
+    index = HarmonizationIndex.for_categories()
+    answer = json.dumps({"matches": {"Ozone hole": "ozone_depletion_potential",
+                                     "Company name": None}})
+    names = ["Ozone hole", "Company name", "GWP", "Ozone hole"]
+
+    with patch("team_template.src.harmonization.complete", return_value=answer) as llm:
+        first = index.harmonize(names)
+        again = index.harmonize(names)
+
+    assert llm.call_count == 1
+    assert "Ozone hole" in llm.call_args.args[0]
+    assert "GWP" not in json.loads(llm.call_args.args[0])
+    assert list(first["method"].fillna("-")) == ["llm", "-", "exact", "llm"]
+    assert list(again["method"].fillna("-")) == ["exact", "-", "exact", "exact"]
+
+    index.save(tmp_path / "index.json")
+    reloaded = HarmonizationIndex.load(tmp_path / "index.json")
+    assert reloaded.lookup("Ozone hole") == "ozone_depletion_potential"
+    assert reloaded.learned == {"Ozone hole": "ozone_depletion_potential"}
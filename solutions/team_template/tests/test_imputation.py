@@ -0,0 +1,115 @@
+"""Tests for missing-data inference."""
+
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from team_template.src.cache import ResponseCache
+from team_template.src.imputation import ImputationEngine, mass_balance
+from team_template.src.processing import ALLOCATION_TEMPLATE, LCAProcessor
+from team_template.src.validation import DataQualityChecker, flatten_impact_categories
+
+REFERENCES = pd.DataFrame(
+    [("rw1", "Basalt", 2.0), ("rw1", "Electricity", 3.0), ("rw1", "Coke", 0.40),
+     ("rw2", "Basalt", 2.3), ("rw2", "Electricity", 3.4), ("rw2", "Coke", 0.50),
+     ("glass", "Basalt", 9.0), ("glass", "Electricity", 12.0), ("glass", "Coke", 3.0)],
+    columns=["product", "Input", "Amount per m2"])
+
+
+@pytest.fixture
+def inventory():
+    return pd.read_csv(ALLOCATION_TEMPLATE)
+
+
+def test_mass_balance_splits_raw_materials(inventory):
+    amounts, filled = mass_balance(inventory)
+    raw = inventory["Process"] == "Raw Materials Input"
+    assert amounts[raw].tolist() == pytest.approx([2.2, 0.6, 1.0, 0.2])
+    assert filled.sum() == 4
+
+    inventory.loc[0, "Amount per m2"] = 1.1  # known basalt fixes the total at 2 kg
+    amounts, _ = mass_balance(inventory)
+    assert amounts[raw].tolist() == pytest.approx([1.1, 0.3, 0.5, 0.1])
+
+
+def test_analogs_then_batched_llm_fill_the_rest(tmp_path, inventory):
+    engine = ImputationEngine(reference_inventories=REFERENCES, k=2,
+                              cache=ResponseCache(tmp_path / "cache.sqlite", ttl=0))
+
+    def estimate(prompt, model, cached_prefix=""):
+        rows = json.loads(prompt)
+        return json.dumps({"estimates": [{"id": i, "value": 0.1, "uncertainty": 0.5}
+                                         for i in rows if rows[i]["input"] != "Wooden pallet"]})
+
+    with patch("team_template.src.imputation.complete", side_effect=estimate) as llm:
+        filled, report = LCAProcessor().impute_missing(inventory, engine)
+
+    by_input = filled.set_index("Input")
+    assert by_input.loc["Coke", "Amount per m2"] == pytest.approx(0.45)
+    assert by_input.loc["Coke", "Imputation"] == "analog"
+    assert by_input.loc["Compressed air", "Imputation"] == "llm"
+    assert by_input.loc["Basalt", "Imputation uncertainty"] == 0.05
+    assert llm.call_count == 1
+    assert "Coke" not in llm.call_args.args[0]
+    assert report.summary() == {"mass_balance": 4, "analog": 2, "llm": 3,
+                                "unresolved": 1, "llm_calls": 1}
+    assert report.unresolved == ["Wooden pallet"]
+
+
+def test_imputed_impacts_are_flagged_for_validators():
+    epds = {f"ref{i}": {"impact_categories": [
+        {"name": "Global Warming Potential", "value": gwp, "unit": "kg CO2 eq."},
+        {"name": "Acidification Potential", "value": ap, "unit": "kg SO2 eq."},
+        {"name": "Eutrophication Potential", "value": ep, "unit": "kg PO4 eq."}]}
+        for i, (gwp, ap, ep) in enumerate([(1.5, 0.010, 0.002), (1.6, 0.012, 0.003),
+                                           (40.0, 0.5, 0.2)])}
+    target = {"new": {"impact_categories": [
+        {"name": "Global Warming Potential", "value": 1.55, "unit": "kg CO2 eq."},
+        {"name": "Acidification Potential", "value": None, "unit": "kg SO2 eq."}]}}
+
+    engine = ImputationEngine(reference_epds=epds, k=2, use_llm=False)
+    filled, report = engine.impute_impacts(target)
+    categories = {c["name"]: c for c in filled["new"]["impact_categories"]}
+    assert categories["Acidification Potential"]["value"] == pytest.approx(0.011)
+    assert categories["Acidification Potential"]["imputed"]["method"] == "analog"
+    assert "imputed" in categories["eutrophication_potential"]
+    assert target["new"]["impact_categories"][1]["value"] is None
+    assert report.summary()["analog"] == 2
+
+    checker = DataQualityChecker()
+    single = checker.check_quality(filled["new"])
+    bulk = checker.check_quality_bulk(flatten_impact_categories(filled))["new"]
+    assert single.is_valid and single.confidence == bulk.confidence == 0.8
+
+
+def test_impacts_are_imputed_per_module_and_harmonized_category(tmp_path):
+    epds = {f"ref{i}": {"impact_categories": [
+        {"name": "GWP-total", "value": a13, "unit": "kg CO2 eq.", "module": "A1-A3"},
+        {"name": "GWP-total", "value": d, "unit": "kg CO2 eq.", "module": "D"}]}
+        for i, (a13, d) in enumerate([(1.5, -0.2), (1.7, -0.3)])}
+    target = {"new": {"impact_categories": [
+        {"name": "GWP", "value": None, "unit": "kg CO2 eq.", "module": "A1 - A3"},
+        {"name": "GWP", "value": -0.2, "unit": "kg CO2 eq.", "module": "D"}]}}
+    engine = ImputationEngine(reference_epds=epds, k=2, use_llm=False)
+    filled, report = LCAProcessor().impute_impacts(
+        target, engine, categories=[("Global Warming Potential", "kg CO2 eq.")])
+
+    categories = filled["new"]["impact_categories"]
+    assert len(categories) == 2  # "GWP" is reported, so no empty row is appended
+    assert categories[0]["value"] == pytest.approx(1.6)
+    assert categories[0]["imputed"]["method"] == "analog"
+    assert report.unresolved == []
+
+    def estimate(prompt, model, cached_prefix=""):
+        assert '"module": "D"' in cached_prefix  # the known value, with its module
+        rows = json.loads(prompt)
+        assert [r["module"] for r in rows.values()] == ["A1 - A3"]
+        return json.dumps({"estimates": [{"id": i, "value": 1.4, "uncertainty": 0.3}
+                                         for i in rows]})
+
+    llm_engine = ImputationEngine(cache=ResponseCache(tmp_path / "cache.sqlite", ttl=0))
+    with patch("team_template.src.imputation.complete", side_effect=estimate) as llm:
+        filled, _ = llm_engine.impute_impacts(target, categories=[("GWP", "kg CO2 eq.")])
+    assert llm.call_count == 1
+    assert filled["new"]["impact_categories"][0]["imputed"]["method"] == "llm"
@@ -0,0 +1,63 @@
+"""Tests for incremental recalculation of matrix LCA results."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from team_template.src.processing import ALLOCATION_TEMPLATE, BACKGROUND_TEMPLATE
+
+
+@pytest.fixture
+def model(processor):
+    allocation = pd.read_csv(ALLOCATION_TEMPLATE)
+    allocation["Amount per m2"] = allocation["Amount per m2"].fillna(1.0)
+    background = pd.read_csv(BACKGROUND_TEMPLATE)
+    flows = background.columns[2:]
+    background[flows] = np.arange(1, len(background) * len(flows) + 1,
+                                  dtype=float).reshape(len(background), -1) / 100
+    return processor.build_matrix_model(allocation, background)
+
+
+def fresh_contributions(model):
+    model._lu = None
+    return model.contributions().to_numpy()
+
+
+def test_amount_edit_matches_full_recalculation(processor, model):
+    graph = processor.build_impact_graph(model)
+    changed = graph.set_amount("Transport", "Truck transport", 0.45)
+
+    assert set(changed) == set(model.categories)
+    np.testing.assert_allclose(graph.contributions, fresh_contributions(model))
+    assert graph.impacts == pytest.approx(model.to_dict())
+    # Only the Transport column moved
+    assert graph.dependents_of_amount("Transport", "Truck transport") == [
+        (category, "Transport") for category in model.categories
+    ]
+
+
+def test_factor_edit_touches_one_category(processor, model):
+    graph = processor.build_impact_graph(model)
+    before = graph.impacts
+    category = model.categories[0]
+
+    changed = graph.set_factor(category, "Electricity medium voltage", 2.5)
+
+    assert list(changed) == [category]
+    np.testing.assert_allclose(graph.contributions, fresh_contributions(model))
+    assert {c: v for c, v in graph.impacts.items() if c != category} == \
+        {c: v for c, v in before.items() if c != category}
+    assert graph.dependents_of_factor(category, "Electricity medium voltage") == [
+        (category, "Spinning Unit")
+    ]
+
+
+def test_new_non_zero_and_technosphere_edits(processor, model):
+    graph = processor.build_impact_graph(model)
+    graph.set_amount("Packaging", "Electricity", 0.7)  # template name, new entry
+    np.testing.assert_allclose(graph.contributions, fresh_contributions(model))
+
+    graph.set_output("Transport", 2.0)
+    np.testing.assert_allclose(graph.contributions, fresh_contributions(model))
+
+    with pytest.raises(KeyError, match="Coke"):
+        graph.set_amount("Blast Furnace", "Coke", 0.4)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import pytest
+
+from team_template.src.fake_provider import FakeProvider
+from team_template.src.llm import acomplete
+from team_template.src.llm_client import (LLMClient, ProviderLimits, TokenBucket, get_client,
+                                          model_for)
+
+HAIKU = "claude-3-5-haiku-latest"
+
+
+def fast_limits(**kwargs):
+    return {"anthropic": ProviderLimits(requests_per_minute=0, input_tokens_per_minute=0,
+                                        **kwargs)}
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+
+def test_token_bucket_spaces_requests_after_the_burst():
+    async def run():
+        bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 per second
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.25 <= elapsed < 1.0  # two free, three at 0.1 s each
+
+
+def test_token_bucket_goes_into_debt_for_large_requests():
+    async def run():
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 per second
+        assert await bucket.acquire(3) < 0.05  # a full bucket lets it through...
+        return await bucket.acquire(1)
+
+    assert asyncio.run(run()) >= 0.25  # ...and the next one pays for it: (2 + 1) / 10 s
+
+
+class StepClock:
+    """Stands in for ``time`` in the fake provider: every reading advances the clock by
+    ``step``, so which requests its rate limit rejects does not depend on scheduling."""
+
+    def __init__(self, step):
+        self.now, self.step = 0.0, step
+
+    def monotonic(self):
+        self.now += self.step
+        return self.now
+
+    @staticmethod
+    def sleep(seconds):
+        time.sleep(seconds)
+
+
+def test_identical_in_flight_prompts_are_sent_once():
+    async def run(client):
+        return await asyncio.gather(*(client.complete("same", HAIKU) for _ in range(5)),
+                                    client.complete("other", HAIKU))
+
+    with FakeProvider(latency=0.2) as server:
+        client = LLMClient(limits=fast_limits(), base_urls={"anthropic": server.url})
+        answers = asyncio.run(run(client))
+
+    assert len(set(answers)) == 1
+    assert server.stats["requests"] == 2
+    assert client.stats["deduplicated"] == 4
+
+
+def test_rate_limited_and_overloaded_requests_are_retried(monkeypatch):
+    monkeypatch.setattr("team_template.src.llm_client.BASE_BACKOFF_SECONDS", 0.01)
+    # Half a request's allowance per request: after the burst every other one is a 429
+    monkeypatch.setattr("team_template.src.fake_provider.time", StepClock(0.5 / 20))
+
+    async def run(client):
+        return await asyncio.gather(*(client.complete(f"doc {i}", HAIKU) for i in range(6)))
+
+    with FakeProvider(requests_per_minute=1200, burst=2, fail_every=3) as server:
+        client = LLMClient(limits=fast_limits(), max_retries=20,
+                           base_urls={"anthropic": server.url})
+        answers = asyncio.run(run(client))
+
+    assert len(answers) == 6
+    assert server.stats["rate_limited"] > 0 and server.stats["failed"] > 0
+    assert client.stats["retries"] == server.stats["rate_limited"] + server.stats["failed"]
+
+
+def test_connections_are_pooled_and_reused():
+    async def run(client):
+        await asyncio.gather(*(client.complete(f"doc {i}", HAIKU) for i in range(20)))
+        await asyncio.gather(*(client.complete(f"again {i}", HAIKU) for i in range(20)))
+        await client.aclose()
+
+    with FakeProvider(latency=0.05) as server:
+        client = LLMClient(limits=fast_limits(max_connections=4, max_keepalive_connections=4),
+                           base_urls={"anthropic": server.url})
+        asyncio.run(run(client))
+
+    assert server.stats["accepted"] == 40
+    assert server.stats["connections"] <= 4
+    assert server.stats["peak_in_flight"] <= 4
+
+
+def test_acomplete_shares_one_client_per_event_loop(monkeypatch):
+    async def run():
+        first = await acomplete("hello", HAIKU)
+        assert get_client() is get_client()
+        return first, get_client().stats["requests"]
+
+    with FakeProvider() as server:
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+        text, requests = asyncio.run(run())
+
+    assert "Global Warming Potential" in text
+    assert requests == 1
+
+
+def test_model_routes():
+    assert "haiku" in model_for("quick_check")
+    assert "sonnet" in model_for("extraction")
+    with pytest.raises(KeyError):
+        model_for("poetry")
@@ -0,0 +1,92 @@
+"""Tests for local model backends and their batching."""
+
+import asyncio
+import sys
+
+import pytest
+from team_template.src.cache import ResponseCache
+from team_template.src.llm import acomplete, complete, provider_for
+from team_template.src.local_model import (LlamaCppBackend, LocalBackend, get_local_model,
+                                           register_local_model)
+from team_template.src.validation import LCAValidator
+from team_template.tests.test_batch_validation import RECORDS, verdicts_for
+
+
+class ScriptedBackend(LocalBackend):
+    """Answers each prompt with ``answer(prompt)`` and records the batch sizes."""
+
+    def __init__(self, answer=lambda prompt: f"echo: {prompt}", max_batch_size=8):
+        super().__init__()
+        self.answer = answer
+        self.max_batch_size = max_batch_size
+        self.batches = []
+
+    def generate(self, prompts, max_tokens):
+        self.batches.append(len(prompts))
+        return [self.answer(p) for p in prompts]
+
+
+def test_backends_must_implement_generate():
+    class Incomplete(LocalBackend):
+        pass
+
+    with pytest.raises(TypeError, match="generate"):
+        Incomplete()
+
+
+def test_local_models_are_routed_by_name():
+    backend = ScriptedBackend()
+    model = register_local_model("echo", backend)
+
+    assert model == "local:echo"
+    assert provider_for(model) == "local"
+    assert get_local_model(model) is backend
+    assert complete("hello", model, cached_prefix="Say it back.") == "echo: Say it back.\n\nhello"
+    with pytest.raises(KeyError):
+        get_local_model("local:missing")
+
+
+def test_concurrent_requests_share_batches():
+    backend = ScriptedBackend(max_batch_size=8)
+    model = register_local_model("batched", backend)
+
+    async def run():
+        return await asyncio.gather(*(acomplete(f"record {i}", model) for i in range(20)))
+
+    answers = asyncio.run(run())
+
+    assert answers == [f"echo: record {i}" for i in range(20)]
+    assert sum(backend.batches) == 20
+    assert len(backend.batches) == 3 and max(backend.batches) == 8
+
+
+def test_backend_errors_reach_every_request_of_the_batch():
+    def fail(prompt):
+        raise RuntimeError("model crashed")
+
+    model = register_local_model("broken", ScriptedBackend(answer=fail))
+
+    async def run():
+        return await asyncio.gather(*(acomplete(f"record {i}", model) for i in range(3)),
+                                    return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+
+
+def test_validator_runs_offline_on_a_local_model(tmp_path):
+    backend = ScriptedBackend(answer=verdicts_for)
+    model = register_local_model("validator", backend)
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0)
+    validator = LCAValidator(model_name=model, cache=cache)
+
+    results = asyncio.run(validator.validate_extraction_batch(RECORDS, max_records=2))
+    cache.close()
+
+    assert [r.is_valid for r in results.values()] == [i % 2 == 0 for i in range(10)]
+    assert len(backend.batches) < 5  # five packed requests, batched together
+
+
+def test_llama_cpp_backend_needs_the_optional_package(monkeypatch):
+    monkeypatch.setitem(sys.modules, "llama_cpp", None)
+    with pytest.raises(ImportError, match="llama-cpp-python"):
+        LlamaCppBackend("model.gguf")
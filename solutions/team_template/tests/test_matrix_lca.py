@@ -0,0 +1,61 @@
+"""Tests for the sparse matrix LCA model."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from team_template.src.matrix_lca import FLOW_TO_BACKGROUND
+
+
+def test_matrix_impacts_match_dict_calculation(processor, allocation, background):
+    model = processor.build_matrix_model(allocation, background)
+
+    inventory = {
+        FLOW_TO_BACKGROUND[name]: amount
+        for name, amount in zip(allocation["Input"], allocation["Amount per m2"])
+        if name in FLOW_TO_BACKGROUND
+    }
+    factors = {flow: dict(zip(background["Impact Category"], background[flow]))
+               for flow in model.flows}
+    expected = processor.calculate_impacts(inventory, factors)
+
+    assert model.to_dict() == pytest.approx(expected)
+    assert model.unmatched_flows == [("Blast Furnace", "Coke")]
+    assert model.missing_amounts == []
+
+
+def test_scenarios_are_solved_together(processor, allocation, background):
+    model = processor.build_matrix_model(allocation, background)
+    demand = model.reference_demand()
+    scenarios = np.column_stack([demand, 2 * demand, demand * np.arange(1, 7)])
+
+    batch = model.impacts(scenarios)
+    assert batch.shape == (len(model.categories), 3)
+    for i in range(3):
+        np.testing.assert_allclose(batch[:, i], model.impacts(scenarios[:, i]))
+    np.testing.assert_allclose(batch[:, 1], 2 * batch[:, 0])
+
+
+def test_inventory_batch_characterization(processor, allocation, background):
+    model = processor.build_matrix_model(allocation, background)
+    inventories = np.random.default_rng(0).random((50, len(model.flows)))
+    impacts = model.impacts_for_inventories(inventories)
+    factors = background[model.flows].to_numpy()
+    np.testing.assert_allclose(impacts, inventories @ factors.T)
+
+
+def test_linked_processes_are_scaled_through_technosphere(processor, background):
+    allocation = pd.DataFrame({
+        "Process": ["Blast Furnace", "Blast Furnace", "Spinning Unit", "Spinning Unit",
+                    "Spinning Unit"],
+        "Input": ["Basalt", None, "Melted slab", "Electricity", None],
+        "Output": [None, "Melted slab", None, None, "Spun slab"],
+        "Unit": ["kg", "kg", "kg", "kWh", "m2"],
+        "Amount per m2": [5.0, 4.0, 2.0, 1.5, 1.0],
+    })
+    model = processor.build_matrix_model(allocation, background)
+    scaling = model.scaling()
+    # One m2 of spun slab needs 2 kg of melt, i.e. half a furnace run of 4 kg
+    np.testing.assert_allclose(scaling, [0.5, 1.0])
+    contributions = model.contributions()
+    assert list(contributions.columns) == ["Blast Furnace", "Spinning Unit"]
+    np.testing.assert_allclose(contributions.sum(axis=1), model.impacts())
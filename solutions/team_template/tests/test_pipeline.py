@@ -0,0 +1,134 @@
+"""Tests for the staged pipeline runner."""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+from team_template.src.cache import ResponseCache
+from team_template.src.extraction import EPDExtractor
+from team_template.src.pipeline import CheckpointStore, Pipeline, Stage, default_stages
+from team_template.src.processing import LCAProcessor
+from team_template.src.validation import LCAValidator
+
+
+def counting_stages(calls):
+    async def extract(source):
+        calls.append(("extract", source))
+        await asyncio.sleep(0.05)
+        if source == "broken":
+            raise ValueError("unreadable")
+        return {"text": source.upper()}
+
+    def process(extract):
+        calls.append(("process", extract["text"]))
+        return {"length": len(extract["text"])}
+
+    return [Stage("extract", extract, concurrency=4),
+            Stage("process", process, ("extract",), fingerprint="v1")]
+
+
+def test_unchanged_inputs_are_skipped(tmp_path):
+    calls = []
+    checkpoints = CheckpointStore(tmp_path)
+    first = Pipeline(counting_stages(calls), checkpoints).run({"a": "abc", "b": "de"})
+    assert first["a"].outputs["process"] == {"length": 3}
+    assert first["a"].status == {"extract": "ran", "process": "ran"}
+
+    calls.clear()
+    again = Pipeline(counting_stages(calls), checkpoints).run({"a": "abc", "b": "xyz"})
+    assert again["a"].status == {"extract": "cached", "process": "cached"}
+    assert calls == [("extract", "xyz"), ("process", "XYZ")]
+
+    calls.clear()
+    stages = counting_stages(calls)
+    stages[1].fingerprint = "v2"
+    pipeline = Pipeline(stages, checkpoints)
+    pipeline.run({"a": "abc"})
+    assert calls == [("process", "ABC")]
+    assert pipeline.stats == {"extract": {"cached": 1}, "process": {"ran": 1}}
+
+
+def test_documents_flow_concurrently_and_fail_alone(tmp_path):
+    calls = []
+    pipeline = Pipeline(counting_stages(calls), CheckpointStore(tmp_path))
+    start = time.perf_counter()
+    results = pipeline.run({f"doc{i}": f"text {i}" for i in range(4)} | {"bad": "broken"})
+    assert time.perf_counter() - start < 0.2  # 5 x 50 ms extractions overlap
+
+    assert not results["bad"].ok and results["bad"].status == {"extract": "failed",
+                                                                "process": "skipped"}
+    assert "unreadable" in results["bad"].errors["extract"]
+    assert all(results[f"doc{i}"].ok for i in range(4))
+    with pytest.raises(ValueError):
+        Pipeline([Stage("process", lambda extract: extract, ("extract",))])
+
+
+class TextExtractor(EPDExtractor):
+    def _extract_text(self, pdf_path):
+        return "Global warming potential 1520 g CO2 eq."
+
+    def _extract_tables(self, pdf_path):
+        return []
+
+
+def test_default_stages_wire_the_components(tmp_path):
+    extraction = json.dumps({"impact_categories": [
+        {"name": "GWP-total", "value": 1520, "unit": "g CO2 eq."}], "metadata": {}})
+    verdict = json.dumps({"is_valid": True, "issues": [], "confidence": 0.9})
+
+    async def extract_llm(prompt, model, cached_prefix=""):
+        return extraction
+
+    async def validate_llm(prompt, model, max_tokens=0):
+        return verdict
+
+    stages = default_stages(TextExtractor(cache=ResponseCache(tmp_path / "a.sqlite", ttl=0)),
+                            validator=LCAValidator(cache=ResponseCache(tmp_path / "b.sqlite")))
+    pipeline = Pipeline(stages, CheckpointStore(tmp_path / "checkpoints"))
+    with patch("team_template.src.extraction.acomplete", side_effect=extract_llm), \
+            patch("team_template.src.validation.acomplete", side_effect=validate_llm):
+        result = pipeline.run({"epd": "epd.pdf"})["epd"]
+        again = pipeline.run({"epd": "epd.pdf"})["epd"]
+
+    assert result.ok, result.errors
+    gwp = result.outputs["process"]["impact_categories"][0]
+    assert (gwp["name"], gwp["value"], gwp["unit"]) == ("Global Warming", 1.52, "kg CO2-Eq")
+    assert result.outputs["validate"]["is_valid"]
+    assert set(again.status.values()) == {"cached"}
+
+
+def test_process_maps_only_template_categories():
+    processor = LCAProcessor()
+    result = processor.process_extraction({"impact_categories": [
+        {"name": name, "value": value, "unit": unit} for name, value, unit in [
+            ("PERT", 10, "MJ"), ("PENRT", 90, "MJ"), ("Primary energy", 0.1, "GJ"),
+            ("GWP-fossil", 1.4, "kg CO2 eq."), ("GWP-total", 1520, "g CO2 eq."),
+            ("Global warming potental", 1.5, "kg CO2 eq."), ("ADP elements", 2, "mg Sb eq.")]]})
+
+    mapped = {c["original"]["name"]: (c["name"], c["value"])
+              for c in result["impact_categories"] if "original" in c}
+    assert mapped == {"Primary energy": ("Primary Energy", 100.0),
+                      "GWP-total": ("Global Warming", 1.52),
+                      "ADP elements": ("Resource Depletion", pytest.approx(2e-6))}
+    assert result["metadata"]["unstandardized"] == [
+        "PERT", "PENRT", "GWP-fossil", "Global warming potental"]
+
+
+def test_process_does_not_hide_conversion_bugs():
+    processor = LCAProcessor()
+    with patch.object(processor, "standardize_units", side_effect=TypeError("bug")):
+        with pytest.raises(TypeError, match="bug"):
+            processor.process_extraction({"impact_categories": [
+                {"name": "GWP-total", "value": 1.5, "unit": "kg CO2 eq."}]})
+
+
+def test_stage_fingerprints_cover_settings(tmp_path):
+    plain = {s.name: s.fingerprint for s in default_stages(figures_dir=None)}
+    figures = {s.name: s.fingerprint for s in default_stages(figures_dir=tmp_path)}
+    assert plain["visualize"] != figures["visualize"]
+    assert plain["process"] == figures["process"]
+
+    with patch("team_template.src.processing.TEMPLATE_CATEGORIES", {}):
+        assert default_stages()[1].fingerprint != plain["process"]
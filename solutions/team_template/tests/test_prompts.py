@@ -0,0 +1,104 @@
+"""Tests for the prompt template registry."""
+
+import os
+import re
+
+import pytest
+from team_template.src.extraction import EPDExtractor, load_prompt
+from team_template.src.llm import _messages
+from team_template.src.prompts import PromptRegistry, PromptTemplate, get_registry
+
+TEMPLATE = """Check this EPD:
+
+{data}
+
+Respond in JSON:
+{
+  "is_valid": boolean
+}"""
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "validation").mkdir()
+    (tmp_path / "validation" / "check.md").write_text(TEMPLATE)
+    (tmp_path / "validation" / "nested").mkdir()
+    (tmp_path / "validation" / "nested" / "deep.md").write_text("deep")
+    return PromptRegistry(tmp_path, check_interval=0)
+
+
+def test_templates_are_compiled(registry):
+    template = registry.get("validation/check.md")
+    assert template.placeholders == ("data",)
+    assert template.static_prefix == "Check this EPD:\n\n"
+    assert template.tokens > 0
+    assert registry.render("validation/check.md", data="[1]").startswith(
+        "Check this EPD:\n\n[1]\n\nRespond in JSON:\n{\n  \"is_valid\"")
+    assert list(registry.group("validation")) == ["check"]
+    with pytest.raises(KeyError):
+        template.render()
+
+
+def test_changed_files_are_reloaded(registry, tmp_path):
+    first = registry.get("validation/check.md")
+    assert registry.get("validation/check.md") is first
+
+    path = tmp_path / "validation" / "check.md"
+    path.write_text("Updated {data}")
+    os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+    assert registry.render("validation/check.md", data="x") == "Updated x"
+
+
+def test_lookups_between_checks_do_not_stat(tmp_path, monkeypatch):
+    (tmp_path / "check.md").write_text("Check {data}")
+    registry = PromptRegistry(tmp_path, check_interval=60)
+    first = registry.get("check.md")
+
+    def stat(path):
+        raise AssertionError(f"stat({path})")
+    monkeypatch.setattr("team_template.src.prompts.os.stat", stat)
+    assert registry.get("check.md") is first
+
+
+def test_split_puts_static_instructions_first():
+    template = PromptTemplate.compile("check.md", TEMPLATE)
+    static, dynamic = template.split(data='{"a": 1}')
+    assert static == "Check this EPD:"
+    assert dynamic == '{"a": 1}\n\nRespond in JSON:\n{\n  \"is_valid\": boolean\n}'
+    assert static == template.split(data="other")[0]
+    assert template.split(("data",), data="x") == (template.render(data="x"), "")
+
+    blocks = _messages(dynamic, "claude-3-5-sonnet-latest", cached_prefix=static)
+    assert blocks[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert _messages(dynamic, "gpt-4o", cached_prefix=static)[0]["content"].startswith(static)
+
+
+def test_extractors_share_the_process_registry():
+    template = get_registry().get("extraction/base_prompt.md")
+    assert load_prompt("extraction/base_prompt.md") is template.text
+    assert EPDExtractor().extraction_prompt is template.text
+
+
+@pytest.mark.parametrize("name", sorted(get_registry().load_all()))
+def test_split_keeps_every_registered_template_in_order(name):
+    template = get_registry().get(name)
+    values = {p: f"<{p} value>" for p in template.placeholders}
+    for cached in ((), template.placeholders[:1]):
+        static, dynamic = template.split(cached, **values)
+        assert " ".join(f"{static}\n\n{dynamic}".split()) == " ".join(
+            template.render(**values).split())
+        for p in cached:
+            assert values[p] in static
+
+
+def test_split_leaves_headings_with_their_values():
+    registry = get_registry()
+    static, dynamic = registry.get("harmonization/match_names.md").split(
+        ("candidates",), candidates="- Global Warming", names='["GWP"]')
+    assert re.search(r"## Canonical names\n- Global Warming\n", static)
+    assert static.endswith("## Raw names") and dynamic == '["GWP"]'
+
+    static, dynamic = registry.get("imputation/estimate_missing.md").split(
+        ("context",), context='{"known": 1}', rows='{"r1": {}}')
+    assert static.endswith('## Known values\n{"known": 1}\n\n## Rows to estimate')
+    assert dynamic == '{"r1": {}}'
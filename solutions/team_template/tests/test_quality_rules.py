@@ -0,0 +1,75 @@
+"""Tests for the rule-based DataQualityChecker, single and bulk."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from team_template.src.validation import (DataQualityChecker, QualityRule,
+                                          flatten_impact_categories)
+
+COMPLETE = {"impact_categories": [
+    {"name": "Global Warming Potential", "value": 12.3, "unit": "kg CO2 eq."},
+    {"name": "Acidification Potential", "value": 0.08, "unit": "kg SO2 eq."},
+    {"name": "Eutrophication Potential", "value": 0.01, "unit": "kg PO4 eq."},
+    {"name": "Ozone Depletion", "value": 1e-7, "unit": "kg CFC11 eq."},
+]}
+
+
+@pytest.fixture
+def checker():
+    return DataQualityChecker()
+
+
+def test_single_epd(checker):
+    assert checker.check_quality(COMPLETE).is_valid
+
+    result = checker.check_quality({"impact_categories": [
+        {"name": "global_warming_potential", "value": 12.3, "unit": "g CO2 eq."},
+        {"name": "Acidification Potential", "value": -1.0, "unit": "kg SO2 eq."},
+    ]})
+    assert not result.is_valid and result.confidence == 0.5
+    assert result.issues == [
+        "Missing required category: eutrophication_potential",
+        "Non-standard unit for global_warming_potential: g CO2 eq.",
+        "Implausible value for Acidification Potential: -1.0",
+    ]
+
+
+def test_bulk_matches_single(checker):
+    epds = {
+        "complete": COMPLETE,
+        "empty": {"impact_categories": []},
+        "no value": {"impact_categories": [
+            {"name": "Global Warming Potential", "unit": "kg CO2 eq."}]},
+        "bad unit": {"impact_categories": [
+            dict(c, unit=None) if i == 1 else c
+            for i, c in enumerate(COMPLETE["impact_categories"])]},
+    }
+    table = flatten_impact_categories(epds)
+
+    bulk = checker.check_quality_bulk(table)
+    arrow = checker.check_quality_bulk(pa.Table.from_pandas(table), ids=list(epds))
+
+    assert list(arrow) == list(epds)
+    for epd_id, data in epds.items():
+        if epd_id != "empty":
+            assert bulk[epd_id] == checker.check_quality(data)
+        assert arrow[epd_id] == checker.check_quality(data)
+    assert "Missing or non-numeric value for Global Warming Potential" in \
+        bulk["no value"].issues
+
+
+def test_custom_rules_at_scale():
+    rules = [QualityRule("global_warming_potential", "kg CO2 eq.", True, 0.0, 1000.0),
+             QualityRule("water_use", "m3", required=False)]
+    checker = DataQualityChecker(rules)
+    n = 20_000
+    values = np.random.default_rng(0).uniform(-100, 2000, n)
+    table = pd.DataFrame({"epd_id": np.arange(n), "name": "Global Warming Potential",
+                          "unit": "kg CO2 eq.", "value": values})
+
+    results = checker.check_quality_bulk(table)
+
+    assert checker.required_categories == ["global_warming_potential"]
+    valid = np.array([results[i].is_valid for i in range(n)])
+    np.testing.assert_array_equal(valid, (values >= 0) & (values <= 1000))
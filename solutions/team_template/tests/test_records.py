@@ -0,0 +1,71 @@
+"""Tests for the EPD record model and its Parquet store."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from team_template.src.records import EPDRecord, RecordStore
+
+RESULT = {
+    "impact_categories": [
+        {"name": "Global Warming", "value": 1.52, "unit": "kg CO2-Eq", "module": "A1-A3",
+         "confidence": "high",
+         "original": {"name": "GWP-total", "value": 1520.0, "unit": "g CO2 eq."}},
+        {"name": "Global Warming", "value": -0.1, "unit": "kg CO2-Eq", "module": "D"},
+        {"name": "Acidification Potential", "value": 0.011, "unit": "kg SO2 eq.",
+         "imputed": {"method": "knn", "uncertainty": 0.25}},
+    ],
+    "metadata": {"epd_reference": "S-P-05553", "declared_unit": "1 m2", "year": 2023},
+}
+
+
+def test_records_round_trip_extraction_results():
+    record = EPDRecord.from_extraction("knauf", RESULT, source="knauf.pdf")
+    assert not hasattr(record, "__dict__") and not hasattr(record.impacts[0], "__dict__")
+    assert record.modules == ["A1-A3", "D"]
+    assert (record.impacts[0].original_name, record.impacts[0].original_value) == (
+        "GWP-total", 1520.0)
+    assert (record.impacts[2].imputed, record.impacts[2].imputed_uncertainty) == ("knn", 0.25)
+    assert record.to_extraction()["impact_categories"] == RESULT["impact_categories"]
+    again = EPDRecord.from_extraction("knauf", record.to_extraction(), source="knauf.pdf")
+    assert again == record
+
+
+def test_store_reads_latest_run_with_pruning(tmp_path):
+    store = RecordStore(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        store.latest()
+    first = store.write([EPDRecord.from_extraction("old", RESULT)])
+    second = store.write([EPDRecord.from_extraction("knauf", RESULT, source="knauf.pdf"),
+                          EPDRecord.from_extraction("empty", {})])
+    store.write([EPDRecord.from_extraction("processed", RESULT)], stage="processing")
+
+    assert store.runs("extraction") == [first, second] and store.latest() == second
+    assert store.manifest()["runs"][1]["modules"] == ["A1-A3", "D", "unspecified"]
+    assert (tmp_path / "impacts" / f"run={second}" / "module=D").is_dir()
+
+    rows = store.read_impacts(columns=["epd_id", "value"], modules=["A1-A3"])
+    assert list(rows.columns) == ["epd_id", "value"]
+    assert rows.to_dict("records") == [{"epd_id": "knauf", "value": 1.52}]
+    gwp = store.read_impacts(categories=["Global Warming"])
+    assert sorted(gwp["module"]) == ["A1-A3", "D"]
+
+    records = {r.epd_id: r for r in store.read_records()}
+    assert records["knauf"] == EPDRecord.from_extraction("knauf", RESULT, source="knauf.pdf")
+    assert records["empty"].impacts == []
+
+
+def test_runs_without_impacts_read_as_empty(tmp_path):
+    store = RecordStore(tmp_path)
+    run = store.write([EPDRecord.from_extraction("empty", {})])
+    rows = store.read_impacts(run, columns=["epd_id", "value"])
+    assert rows.empty and list(rows.columns) == ["epd_id", "value"]
+    assert store.read_records(run)[0].impacts == []
+
+
+def test_concurrent_writers_keep_every_run(tmp_path):
+    store = RecordStore(tmp_path)
+    with ThreadPoolExecutor(8) as pool:
+        runs = list(pool.map(
+            lambda i: RecordStore(tmp_path).write([EPDRecord.from_extraction(f"epd-{i}", RESULT)]),
+            range(16)))
+    assert sorted(store.runs()) == sorted(runs)
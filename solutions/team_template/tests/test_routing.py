@@ -0,0 +1,99 @@
+"""Tests for tiered rule-based/LLM validation routing."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from team_template.src import telemetry
+from team_template.src.cache import ResponseCache
+from team_template.src.routing import CHEAP_MODEL, STRONG_MODEL, ValidationRouter
+from team_template.src.validation import acompare_approaches, compare_approaches
+
+COMPLETE = [
+    {"name": "Global Warming Potential", "value": 12.3, "unit": "kg CO2 eq."},
+    {"name": "Acidification Potential", "value": 0.08, "unit": "kg SO2 eq."},
+    {"name": "Eutrophication Potential", "value": 0.01, "unit": "kg PO4 eq."},
+]
+
+
+def record(kind, reference):
+    categories = COMPLETE if kind == "complete" else COMPLETE[:1]
+    return {"impact_categories": categories,
+            "metadata": {"kind": kind, "epd_reference": reference}}
+
+
+RECORDS = {
+    "a": record("complete", "a"), "b": record("complete", "b"),
+    "c": record("clear", "c"), "d": record("ambiguous", "d"), "e": record("ambiguous", "e"),
+}
+LABELS = {"a": True, "b": True, "c": False, "d": True, "e": False}
+
+
+async def fake_llm(prompt, model):
+    telemetry.record_llm(model, 200, 30)  # as the LLM client does per response
+    kind = "ambiguous" if '"ambiguous"' in prompt else "clear"
+    if model == CHEAP_MODEL:
+        verdict = {"is_valid": False, "issues": ["incomplete"],
+                   "confidence": 0.9 if kind == "clear" else 0.4}
+    else:
+        verdict = {"is_valid": False, "issues": ["incomplete"], "confidence": 0.95}
+    return json.dumps(verdict)
+
+
+@pytest.fixture
+def router(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0)
+    yield ValidationRouter(cache=cache)
+    cache.close()
+
+
+def test_only_uncertain_records_reach_the_llms(router):
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm) as llm:
+        report = asyncio.run(router.route(RECORDS, LABELS))
+
+    assert report.decided_by == {"a": "rules", "b": "rules", "c": "cheap",
+                                 "d": "strong", "e": "strong"}
+    assert [call.args[1] for call in llm.call_args_list].count(STRONG_MODEL) == 2
+    assert report.llm_calls == 5 and llm.call_count == 5
+
+    summary = report.summary()
+    rules, cheap, strong = (summary["tiers"][t] for t in ("rules", "cheap", "strong"))
+    assert (rules["seen"], rules["accepted"], rules["escalated"]) == (5, 2, 3)
+    assert (cheap["seen"], cheap["accepted"], cheap["escalated"]) == (3, 1, 2)
+    assert rules["calls"] == 0 and rules["estimated_cost_usd"] == 0
+    assert cheap["estimated_cost_usd"] > 0 and strong["estimated_cost_usd"] > 0
+    assert cheap["agreement_with_next"] == 1.0  # both call the ambiguous records invalid
+    assert cheap["accuracy"] == pytest.approx(2 / 3)
+
+
+def test_compare_approaches_scores_both_on_the_same_labels(router):
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm):
+        comparison = compare_approaches(RECORDS, LABELS, router=router)
+
+    assert comparison["routed"]["llm_calls"] == 5
+    assert comparison["baseline"]["llm_calls"] == len(RECORDS)  # nothing served from cache
+    assert comparison["baseline"]["model"] == STRONG_MODEL
+    assert comparison["routed"]["accuracy"] is not None
+    assert comparison["baseline"]["accuracy"] is not None
+
+    routed, baseline = (comparison[k]["measured"] for k in ("routed", "baseline"))
+    assert routed["spans"]["validation.rules_bulk"]["count"] == 1
+    assert routed["spans"]["validation.llm"]["count"] == 5
+    assert "validation.rules_bulk" not in baseline["spans"]
+    assert baseline["spans"]["validation.llm"]["count"] == len(RECORDS)
+    assert baseline["cache_hit_rates"] == {"responses": 0.0}
+
+
+def test_baseline_runs_cold_inside_an_event_loop(router):
+    async def run():  # as in a notebook, where asyncio.run() is not allowed
+        await router.route(RECORDS, LABELS)  # warm the router's cache
+        return await acompare_approaches(RECORDS, LABELS, router=router)
+
+    with patch("team_template.src.validation.acomplete", side_effect=fake_llm) as llm:
+        comparison = asyncio.run(run())
+
+    assert comparison["routed"]["measured"]["cache_hit_rates"]["responses"] == 1.0
+    assert comparison["routed"]["llm_calls"] == 0
+    assert comparison["baseline"]["llm_calls"] == len(RECORDS)
+    assert llm.call_count == 5 + len(RECORDS)
@@ -0,0 +1,75 @@
+"""Tests for streaming ingestion of inventory and background CSVs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from team_template.src.streaming import StreamReport, iter_inventory_chunks, stream_inventory
+
+
+@pytest.fixture
+def files(tmp_path):
+    """A 5000-row inventory over 40 datasets and a 12-category background of 200."""
+    rng = np.random.default_rng(0)
+    datasets = [f"Dataset {i}" for i in range(200)]
+    used = datasets[:40]
+    inventory = pd.DataFrame({
+        "Process": rng.choice(["Melting", "Curing", "Packaging"], 5000),
+        "Input": rng.choice(used, 5000),
+        "Output": "",
+        "Unit": "kg",
+        "Amount per m2": rng.random(5000).round(4),
+    })
+    background = pd.DataFrame(rng.random((12, len(datasets))), columns=datasets)
+    background.insert(0, "Impact Category", [f"Category {i}" for i in range(12)])
+    background.insert(1, "Unit", "kg CO2-Eq")
+    inventory.to_csv(tmp_path / "inventory.csv", index=False)
+    background.to_csv(tmp_path / "background.csv", index=False)
+    return tmp_path, inventory, background
+
+
+def test_streaming_matches_in_memory_calculation(processor, files):
+    root, inventory, background = files
+    amounts = inventory.groupby("Input")["Amount per m2"].sum().to_dict()
+    factors = {flow: dict(zip(background["Impact Category"], background[flow]))
+               for flow in amounts}
+    expected = processor.calculate_impacts(amounts, factors)
+
+    impacts, report = processor.calculate_impacts_streaming(
+        root / "inventory.csv", root / "background.csv", chunksize=256)
+
+    assert impacts == pytest.approx(expected)
+    assert (report.rows, report.rejected, report.issues) == (5000 + 12, 0, [])
+
+
+def test_chunks_are_bounded(files):
+    root, _, _ = files
+    chunks = list(iter_inventory_chunks(root / "inventory.csv", StreamReport(), chunksize=300))
+    assert max(len(c) for c in chunks) <= 300
+    assert sum(len(c) for c in chunks) == 5000
+
+
+def test_invalid_rows_are_reported_and_units_harmonized(tmp_path):
+    path = tmp_path / "inventory.csv"
+    path.write_text(
+        "Process,Input,Output,Unit,Amount per m2\n"
+        "Melting,Basalt,,kg,2.0\n"
+        "Melting,Basalt,,g,500\n"
+        "Melting,,Melt,kg,4.0\n"
+        "Melting,Dolomite,,kg,\n"
+        "Melting,Dolomite,,kg,-1\n"
+        "Melting,Electricity,,furlongs,3\n"
+        "Melting,Electricity,,kWh,abc\n"
+        "Melting,Basalt,,kWh,1.0\n"
+    )
+    totals, units, report = stream_inventory(path, chunksize=2)
+
+    assert totals == {"Basalt production": pytest.approx(2.5)}
+    assert units == {"Basalt production": "kg"}
+    assert report.rows == 7 and report.rejected == 5
+    assert [(i.line, i.message) for i in report.issues] == [
+        (5, "missing or non-numeric amount"),
+        (6, "negative amount"),
+        (7, "unknown unit"),
+        (8, "missing or non-numeric amount"),
+        (9, "unit 'kWh' cannot be converted to 'kg'"),
+    ]
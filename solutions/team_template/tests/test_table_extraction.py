@@ -0,0 +1,104 @@
+"""Tests for the deterministic table-first extraction path."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from team_template.src.cache import ResponseCache
+from team_template.src.chunking import DocumentChunker
+from team_template.src.extraction import EPDExtractor
+from team_template.src.table_extraction import (SynonymIndex, TableExtractor, parse_module,
+                                                parse_number)
+from team_template.tests.helpers.mock_data import SAMPLE_EPD
+
+WIDE = [["Indicator", "Unit", "A1 - A3", "C4", "Module D"],
+        ["GWP-total", "kg CO2 eq.", "1.52", "MND", "-0,1"],
+        ["Ozone depletion (ODP)", "kg CFC11 eq.", "2.1E-08", "0", "ND"]]
+
+
+def test_labels_and_headers_are_normalized():
+    index = SynonymIndex()
+    assert index.lookup("GWP-total") == "global_warming_potential"
+    assert index.lookup("GWP-fossil [kg CO2 eq.]") == "gwp_fossil"
+    assert index.lookup("Global warming potential - total") == "global_warming_potential"
+    assert index.lookup("Company address") is None
+    assert [parse_module(c) for c in ("A1-A3", "a1–a3", "Module D", "C4", "Unit", "D1")] == \
+        ["A1-A3", "A1-A3", "D", "C4", None, None]
+    assert [parse_number(c) for c in ("1.52", "2,1E-08", "1 234,5", "−0.1", "n/a")] == \
+        [1.52, 2.1e-8, 1234.5, -0.1, None]
+
+
+def test_wide_and_column_tables_are_read_without_llm():
+    result = TableExtractor().extract([WIDE])
+    assert result.complete and result.hit_rate == 1.0
+    assert [(c["name"], c["module"], c["value"]) for c in result.impact_categories] == [
+        ("Global Warming Potential", "A1-A3", 1.52),
+        ("Global Warming Potential", "D", -0.1),
+        ("Ozone Depletion Potential", "A1-A3", 2.1e-8),
+        ("Ozone Depletion Potential", "C4", 0.0),
+    ]
+
+    values = {c["name"]: (c["value"], c["unit"])
+              for c in TableExtractor().extract(SAMPLE_EPD.tables).impact_categories}
+    assert values == {"Global Warming Potential": (12.3, "kg CO2 eq."),
+                      "Acidification Potential": (0.08, "kg SO2 eq.")}
+
+
+def test_unrecognized_tables_are_left_for_the_llm():
+    other = [["Parameter name", "Unit", "Stage 1"], ["Use of secondary material", "kg", "3.1"]]
+    result = TableExtractor().extract([WIDE, other])
+
+    assert len(result.impact_categories) == 4
+    assert not result.complete and result.unresolved_cells == 1
+    assert result.unresolved_tables == [other]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_extractor_sends_only_unresolved_rows(tmp_path, use_async):
+    tables = [WIDE + [["Toxicity, cancer effects", "CTUh", "3.4E-9", "", ""]]]
+    extractor = EPDExtractor(cache=ResponseCache(tmp_path / "cache.sqlite", ttl=0),
+                             table_extractor=TableExtractor())
+    answer = json.dumps({"impact_categories": [
+        {"name": "Human toxicity, cancer", "value": 3.4e-9, "unit": "CTUh",
+         "module": "A1-A3", "confidence": "medium"},
+        # Re-read from the resolved table in the page text under another spelling
+        {"name": "Global warming potential - total", "value": 1.5, "unit": "kg CO2e",
+         "module": "A1–A3", "confidence": "medium"}], "metadata": {}})
+
+    async def fake_llm(prompt, model, cached_prefix=""):
+        return answer
+
+    with patch("team_template.src.extraction.complete", return_value=answer) as sync_llm, \
+            patch("team_template.src.extraction.acomplete", side_effect=fake_llm) as async_llm:
+        if use_async:
+            result = asyncio.run(extractor._aprocess_content("Stone wool slab", tables))
+        else:
+            result = extractor._process_content("Stone wool slab", tables)
+        complete_hit = extractor._process_content("Stone wool slab", [WIDE])
+
+    llm = async_llm if use_async else sync_llm
+    assert llm.call_count == 1
+    sent = llm.call_args.args[0]
+    assert "Toxicity" in sent and "GWP-total" not in sent and "Stone wool" in sent
+    assert len(result["impact_categories"]) == 5
+    assert result["metadata"]["table_fast_path"]["hit_rate"] == pytest.approx(4 / 5)
+    assert not complete_hit["metadata"]["table_fast_path"]["llm_fallback"]
+    assert extractor.table_stats.to_dict()["skipped_llm"] == 1
+    assert extractor.table_stats.hit_rate == pytest.approx(8 / 9)
+
+
+def test_partial_fallback_is_chunked(tmp_path):
+    text = "# Product\nStone wool slab\n\n# Results\nToxicity, cancer effects 3.4E-9 CTUh"
+    tables = [WIDE + [["Toxicity, cancer effects", "CTUh", "3.4E-9", "", ""]]]
+    chunker = DocumentChunker(max_tokens=300, min_score=0.0)
+    extractor = EPDExtractor(cache=ResponseCache(tmp_path / "cache.sqlite", ttl=0),
+                             chunker=chunker, table_extractor=TableExtractor())
+    answer = json.dumps({"impact_categories": [], "metadata": {}})
+    with patch("team_template.src.extraction.complete", return_value=answer), \
+            patch.object(chunker, "chunk", wraps=chunker.chunk) as chunk:
+        result = extractor._process_content(text, tables)
+    assert chunk.call_args.args[0] == text
+    assert [len(t) for t in chunk.call_args.args[1]] == [2]  # header and the toxicity row
+    assert result["metadata"]["chunks"]["sent"] >= 1
+    assert result["metadata"]["table_fast_path"]["llm_fallback"]
@@ -0,0 +1,83 @@
+"""Tests for spans, LLM usage accounting and telemetry export."""
+
+import asyncio
+import json
+
+import pytest
+from team_template.src.cache import ResponseCache
+from team_template.src.fake_provider import FakeProvider
+from team_template.src.llm_client import LLMClient, ProviderLimits
+from team_template.src.telemetry import (count, enabled, get_telemetry, llm_cost, recording,
+                                         span, traced)
+from team_template.src.validation import DataQualityChecker
+
+HAIKU = "claude-3-5-haiku-latest"
+
+
+def test_llm_requests_record_usage_cost_retries_and_parents(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr("team_template.src.llm_client.BASE_BACKOFF_SECONDS", 0.01)
+    limits = {"anthropic": ProviderLimits(requests_per_minute=0, input_tokens_per_minute=0)}
+
+    @traced("job")
+    async def job(client):
+        return await asyncio.gather(*(client.complete(f"doc {i}", HAIKU) for i in range(4)))
+
+    with FakeProvider(fail_every=3) as server, recording() as telemetry:
+        asyncio.run(job(LLMClient(limits=limits, base_urls={"anthropic": server.url})))
+
+    usage = telemetry.summary()["llm"][HAIKU]
+    assert usage["calls"] == 4 and usage["input_tokens"] > 0 and usage["output_tokens"] > 0
+    assert usage["cost_usd"] == pytest.approx(
+        llm_cost(HAIKU, usage["input_tokens"], usage["output_tokens"]), abs=1e-6)
+    assert telemetry.counter("llm_retries") == server.stats["failed"] == 1
+    spans = {s.id: s for s in telemetry.spans}
+    requests = [s for s in spans.values() if s.name == "llm.request"]
+    assert len(requests) == 4 and {spans[s.parent].name for s in requests} == {"job"}
+    assert sorted(s.attrs["attempts"] for s in requests) == [1, 1, 1, 2]
+
+
+def test_disabled_by_default_and_nested_recordings_forward(tmp_path):
+    assert not enabled() and get_telemetry() is None
+    assert span("a") is span("b")  # the shared no-op
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0)
+    cache.get("model", "prompt")
+
+    with recording() as outer:
+        with recording() as inner:
+            cache.get("model", "prompt")
+            cache.put("model", "prompt", "", "answer")
+            cache.get("model", "prompt")
+        DataQualityChecker().check_quality({"impact_categories": []})
+    cache.close()
+
+    assert get_telemetry() is None
+    assert inner.cache_hit_rates() == outer.cache_hit_rates() == {"responses": 0.5}
+    assert "validation.rules" in outer.summary()["spans"]
+    assert "validation.rules" not in inner.summary()["spans"]
+
+
+def test_jsonl_and_prometheus_export(tmp_path):
+    with recording() as telemetry:
+        with span("stage", document="a.pdf") as s:
+            s.set(pages=3)
+        with pytest.raises(ValueError), span("stage"):
+            raise ValueError("bad table")
+        telemetry.record_llm(HAIKU, 1000, 100, cache_read_tokens=500)
+        count("llm_retries", provider="anthropic")
+
+    telemetry.write_jsonl(tmp_path / "telemetry.jsonl")
+    telemetry.write_prometheus(tmp_path / "metrics.prom")
+    events = [json.loads(line) for line in
+              (tmp_path / "telemetry.jsonl").read_text().splitlines()]
+    metrics = (tmp_path / "metrics.prom").read_text().splitlines()
+
+    assert [e["type"] for e in events] == ["span", "span", "llm", "counter"]
+    assert (events[0]["document"], events[0]["pages"]) == ("a.pdf", 3)
+    assert events[1]["error"] == "ValueError"
+    assert events[2]["cost"] == pytest.approx((0.8 * (1000 + 50) + 4.0 * 100) / 1e6)
+    assert 'lca_span_seconds_count{span="stage"} 2' in metrics
+    assert 'lca_span_errors_total{span="stage"} 1' in metrics
+    assert f'lca_llm_tokens_total{{kind="cache_read",model="{HAIKU}"}} 500' in metrics
+    assert 'lca_llm_retries_total{provider="anthropic"} 1' in metrics
+    assert "stage" in telemetry.report() and HAIKU in telemetry.report()
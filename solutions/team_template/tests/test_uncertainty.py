@@ -0,0 +1,62 @@
+"""Tests for Monte Carlo uncertainty propagation."""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from team_template.src.processing import ALLOCATION_TEMPLATE, BACKGROUND_TEMPLATE, LCAProcessor
+from team_template.src.uncertainty import (Lognormal, MonteCarloLCA, Triangular,
+                                           pedigree_lognormal)
+
+
+@pytest.fixture
+def model():
+    """Rock-wool model with every amount and factor set to a simple value."""
+    allocation = pd.read_csv(ALLOCATION_TEMPLATE)
+    allocation["Amount per m2"] = allocation["Amount per m2"].fillna(1.0)
+    background = pd.read_csv(BACKGROUND_TEMPLATE)
+    background[background.columns[2:]] = 0.5
+    return LCAProcessor().build_matrix_model(allocation, background)
+
+
+def test_pedigree_scores_widen_the_distribution():
+    assert pedigree_lognormal((1, 1, 1, 1, 1)).gsd == pytest.approx(1.05)
+    assert pedigree_lognormal((5, 5, 5, 5, 5)).gsd > pedigree_lognormal((2, 2, 2, 2, 2)).gsd
+    with pytest.raises(ValueError):
+        pedigree_lognormal((1, 2))
+
+
+def test_results_are_reproducible_and_independent_of_workers(model):
+    engine = MonteCarloLCA(model, {"Electricity medium voltage": Lognormal(1.5),
+                                   "Truck transport": Triangular(0.5, 2.0)})
+    serial = engine.run(iterations=2_000, chunk_size=500, seed=7)
+    parallel = engine.run(iterations=2_000, chunk_size=500, seed=7, workers=2)
+    np.testing.assert_array_equal(serial.samples, parallel.samples)
+    assert serial.samples.shape == (2_000, len(model.categories))
+
+
+def test_samples_follow_the_distributions(model):
+    engine = MonteCarloLCA(model, {"Electricity medium voltage": Lognormal(2.0)})
+    inventories = engine.sample(20_000, np.random.default_rng(0))
+    electricity = inventories[:, model.flows.index("Electricity medium voltage")]
+    assert np.median(electricity) == pytest.approx(1.0, rel=0.05)
+    assert np.log(electricity).std() == pytest.approx(np.log(2.0), rel=0.05)
+    untouched = inventories[:, model.flows.index("Basalt production")]
+    assert (untouched == 1.0).all()
+
+
+def test_unknown_flows_are_rejected(model):
+    with pytest.raises(ValueError, match="unknown flows"):
+        MonteCarloLCA(model, {"Coke": Lognormal(1.2)})
+
+
+def test_100k_iterations_run_in_seconds(model):
+    distributions = {flow: pedigree_lognormal((2, 2, 2, 2, 2)) for flow in model.flows}
+    start = time.perf_counter()
+    summary = LCAProcessor().propagate_uncertainty(model, distributions,
+                                                   iterations=100_000, seed=1)
+    assert time.perf_counter() - start < 5
+    gwp = summary["Global Warming"]
+    assert gwp["p2.5"] < gwp["p50"] < gwp["p97.5"]
+    assert gwp["unit"] == "kg CO2-Eq"
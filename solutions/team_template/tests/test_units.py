@@ -0,0 +1,62 @@
+"""Tests for the unit registry and vectorized unit standardization."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from team_template.src.processing import LCAProcessor
+from team_template.src.units import UnitRegistry
+
+
+@pytest.fixture
+def registry():
+    return UnitRegistry()
+
+
+@pytest.mark.parametrize("value, from_unit, to_unit, expected", [
+    (1000, "g CO2 eq.", "kg CO2 eq.", 1.0),
+    (0.001, "kg SO2 eq.", "g SO2 eq.", 1.0),
+    (1, "kg CO2-Eq", "kg CO2 eq.", 1.0),
+    (1, "kg CO2e", "kg CO2 eq.", 1.0),
+    (1, "kWh", "MJ", 3.6),
+    (1, "kg CO2 eq./kWh", "g CO2 eq./MJ", 1000 / 3.6),
+    (2500, "µg Sb-Eq", "mg Sb eq.", 2.5),
+    (1, "t", "kg", 1000),
+])
+def test_scalar_conversions(registry, value, from_unit, to_unit, expected):
+    assert registry.convert(value, from_unit, to_unit) == pytest.approx(expected)
+
+
+def test_spelling_variants_share_a_kind(registry):
+    assert registry.kind("kg CO2-Eq") == registry.kind("kg CO2 eq.") == registry.kind("t CO2e")
+    assert registry.kind("kg CO2 eq.") != registry.kind("kg SO2 eq.")
+
+
+def test_incompatible_units_raise(registry):
+    with pytest.raises(ValueError, match="Cannot convert"):
+        registry.convert(1.0, "kg CO2 eq.", "kg SO2 eq.")
+    with pytest.raises(ValueError, match="Unknown unit"):
+        registry.convert(1.0, "furlong", "m")
+
+
+def test_column_conversion_parses_each_unit_once(registry):
+    units = pd.Series(["g CO2 eq.", "kg CO2-Eq", "t CO2 eq."] * 1000)
+    values = pd.Series(np.ones(len(units)))
+    converted = registry.convert(values, units, "kg CO2 eq.")
+
+    assert isinstance(converted, pd.Series)
+    assert converted.iloc[:3].tolist() == pytest.approx([0.001, 1.0, 1000.0])
+    assert len(registry._names) == 4
+
+
+def test_factor_matrix_marks_incompatible_pairs(registry):
+    matrix = registry.factor_matrix(["kg", "g", "MJ"])
+    assert matrix.loc["kg", "g"] == 1000
+    assert np.isnan(matrix.loc["kg", "MJ"])
+
+
+def test_processor_standardizes_arrays():
+    processor = LCAProcessor()
+    result = processor.standardize_units(np.array([1.0, 2.0]), np.array(["kWh", "MJ"]), "MJ")
+    assert result.tolist() == pytest.approx([3.6, 2.0])
+    assert "Global Warming" in processor.impact_categories
+    assert processor.unit_conversions["kg CO2 eq."]["g CO2 eq."] == 1000
@@ -0,0 +1,50 @@
+"""Tests for chart drawing and headless batch rendering."""
+
+from team_template.src.visualization import (ChartJob, contribution_values, impact_values,
+                                             render_batch, render_chart)
+
+EPD = {"impact_categories": [
+    {"name": "Global Warming Potential", "value": 10.0, "unit": "kg CO2 eq.",
+     "module": "A1-A3"},
+    {"name": "Global Warming Potential", "value": 2.5, "unit": "kg CO2 eq.", "module": "A4"},
+    {"name": "Acidification potential", "value": 0.04, "unit": "mol H+ eq."},
+    {"name": "ODP", "value": 1e-7, "unit": "kg CFC-11 eq."},
+]}
+
+
+def test_values_match_category_spellings_and_sum_modules():
+    assert impact_values(EPD, ["GWP", "AP", "EP"]) == [
+        ("GWP", 12.5, "kg CO2 eq."), ("AP", 0.04, "mol H+ eq.")]
+    assert contribution_values(EPD, "GWP") == {"A1-A3": 10.0, "A4": 2.5}
+    overlapping = {"impact_categories": [
+        {"name": "GWP", "value": value, "unit": "kg CO2 eq.", "module": module}
+        for module, value in [("A1-A3", 10.0), ("A1", 3.0), ("C4", 0.5), ("D", -4.0)]]}
+    assert impact_values(overlapping) == [("GWP", 10.5, "kg CO2 eq.")]
+    processes = {"contributions": {"Global warming": {"Basalt": 3.0, "Electricity": 1.0}}}
+    assert contribution_values(processes, "GWP") == {"Basalt": 3.0, "Electricity": 1.0}
+
+
+def test_render_chart_writes_raster_and_vector_without_pyplot(tmp_path):
+    import matplotlib.pyplot as plt
+
+    png = render_chart(ChartJob("impact_comparison", EPD, str(tmp_path / "a" / "c.png")))
+    svg = render_chart(ChartJob("contribution", EPD, str(tmp_path / "c.svg"), category="GWP"))
+
+    with open(png, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    with open(svg, encoding="utf-8") as f:
+        assert "<svg" in f.read()
+    assert plt.get_fignums() == []
+
+
+def test_render_batch_keeps_order_and_reports_failures(tmp_path):
+    jobs = [ChartJob("impact_comparison", EPD, str(tmp_path / f"{i}.png"), dpi=50)
+            for i in range(5)]
+    jobs.insert(2, ChartJob("pie", EPD, str(tmp_path / "pie.png")))
+
+    results = render_batch(jobs, workers=2, chunk_size=2)
+
+    assert [r.path for r in results] == [j.path for j in jobs]
+    assert [r.ok for r in results] == [True, True, False, True, True, True]
+    assert "Unknown chart kind" in results[2].error
+    assert all((tmp_path / f"{i}.png").exists() for i in range(5))